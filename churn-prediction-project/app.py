@@ -1,9 +1,13 @@
 import streamlit as st
+# pandas tetap di sini: tabel input tampil di render pertama (st.write DataFrame juga meng-import pandas)
 import pandas as pd
-import numpy as np
-import joblib
 import os
-import pickle
+from contextlib import nullcontext
+
+from scoring import DEFAULT_THRESHOLD, apply_threshold, predict_churn
+from telco_features import CATEGORY_VALUES, NUMERIC_RANGES
+# Modul fitur (batch_scoring, explain, what_if, drift_monitor, model_artifact, ...) di-import
+# di fragment / cached loader yang memakainya, bukan saat script mulai
 
 # Set page config
 st.set_page_config(
@@ -16,127 +20,212 @@ st.set_page_config(
 st.title("📱 Prediksi Churn Pelanggan Telco")
 st.write("Aplikasi untuk memprediksi apakah pelanggan akan berhenti berlangganan")
 
-# ==================== LOAD MODEL DENGAN MULTI-PATH ====================
+# ==================== LOAD MODEL (BACKGROUND) ====================
 @st.cache_resource
-def load_model_and_preprocessor():
+def get_model_registry():
     """
-    Coba load model dari berbagai lokasi yang mungkin
+    Satu registry untuk semua session. Model di-load di background thread
+    (halaman tidak menunggu) dan di-hot-swap jika file model berganti.
     """
-    # Daftar semua lokasi yang mungkin untuk model
-    model_paths = [
-        'best_churn_model.pkl',                    # Root folder
-        'notebooks/best_churn_model.pkl',          # Notebooks folder
-        './best_churn_model.pkl',                  # Current directory
-        '../best_churn_model.pkl',                 # Parent directory
-        'churn-prediction-project/best_churn_model.pkl',  # Project folder structure
-    ]
-    
-    # Daftar lokasi untuk preprocessor
-    preprocessor_paths = [
-        'preprocessor.pkl',
-        'notebooks/preprocessor.pkl',
-        './preprocessor.pkl',
-        'feature_names.pkl',
-        'notebooks/feature_names.pkl'
-    ]
-    
-    model = None
-    preprocessor = None
-    model_location = ""
-    preprocessor_location = ""
-    
-    # Cari model
-    for path in model_paths:
-        if os.path.exists(path):
-            try:
-                model = joblib.load(path) if path.endswith('.pkl') else None
-                model_location = path
-                st.sidebar.info(f"Model ditemukan di: {path}")
-                break
-            except Exception as e:
-                st.sidebar.warning(f"Gagal load dari {path}: {str(e)[:50]}...")
+    from model_registry import ModelRegistry
+    return ModelRegistry().start()
+
+@st.cache_resource
+def get_prediction_cache():
+    """
+    Satu cache prediksi untuk semua session
+    """
+    from prediction_cache import PredictionCache
+    return PredictionCache()
+
+@st.cache_resource
+def get_instrumentation():
+    """
+    Histogram latency per tahap, dibagi semua session (diisi hanya saat instrumentasi aktif).
+    instrumentation.py (dan sklearn) baru di-import di sini, bukan saat halaman pertama tampil.
+    """
+    from instrumentation import PipelineInstrumentation
+    return PipelineInstrumentation()
+
+@st.cache_resource
+def get_drift_monitor():
+    """
+    Monitor drift bersama untuk semua session, atau None jika drift_baseline.json tidak ada
+    """
+    from drift_monitor import DriftMonitor, find_baseline_path, load_baseline
+    path = find_baseline_path()
+    return DriftMonitor(load_baseline(path)) if path else None
+
+@st.cache_resource(max_entries=2)
+def get_explainer(checksum, _model):
+    """
+    Tabel jalur pohon untuk penjelasan prediksi, dibuat sekali per versi model (checksum).
+    None jika model bukan forest.
+    """
+    from explain import ForestExplainer
+    try:
+        return ForestExplainer(_model)
+    except ValueError:
+        return None
+
+@st.cache_resource(max_entries=2)
+def get_sweep_model(checksum, location, _model):
+    """
+    Model untuk what-if: compiled scorer lambat untuk puluhan ribu baris,
+    jadi untuk artifact dipakai pipeline sklearn di dalamnya (semua core).
+    Jika pipeline tidak ada / versi sklearn beda, tetap pakai compiled scorer.
+    """
+    from fast_scorer import CompiledPipeline
+    from model_artifact import load_pipeline
+    if not (isinstance(_model, CompiledPipeline) and os.path.isdir(location)):
+        return _model
+    try:
+        pipeline = load_pipeline(location)
+    except Exception:
+        return _model
+    classifier = pipeline.steps[-1][1]
+    if 'n_jobs' in classifier.get_params():
+        classifier.set_params(n_jobs=-1)
+    return pipeline
+
+@st.cache_data(ttl=30)
+def list_files(path):
+    """
+    Isi direktori untuk info debug (di-cache, tidak dibaca ulang tiap rerun)
+    """
+    return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+@st.cache_data
+def working_directory():
+    return os.getcwd()
+
+def fragment(func):
+    """
+    st.fragment (Streamlit >= 1.37): widget di dalamnya hanya me-rerun fungsi itu,
+    bukan seluruh script. Di versi lama fungsi dijalankan biasa.
+    """
+    decorator = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    return decorator(func) if decorator else func
+
+def active_instrumentation():
+    """
+    Instrumentasi jika diaktifkan di sidebar, selain itu None (model tidak di-wrap, tanpa overhead)
+    """
+    return get_instrumentation() if st.session_state.get('instrumentation_enabled') else None
+
+def timed_stage(name, rows):
+    instrumentation = active_instrumentation()
+    if instrumentation is None:
+        return nullcontext()
+    from instrumentation import timed
+    return timed(instrumentation, name, rows)
+
+def unpack_snapshot(snapshot):
+    """
+    Model, preprocessor dan lokasinya dari satu snapshot registry
+    """
+    if snapshot is None:
+        return None, None, "", ""
+    # Cache otomatis dikosongkan jika file model berganti
+    prediction_cache.bind_model(snapshot.checksum)
+    model = snapshot.model
+    instrumentation = active_instrumentation()
+    if instrumentation is not None:
+        from instrumentation import instrument
+        model = instrument(model, instrumentation)
+    return model, snapshot.preprocessor, snapshot.location, snapshot.preprocessor_location
+
+def ready_snapshot():
+    """
+    Snapshot terbaru; jika load pertama belum selesai, tunggu (tombol ditekan sebelum model siap)
+    """
+    snapshot = model_registry.current()
+    if snapshot is None and not model_registry.is_ready():
+        with st.spinner("⏳ Menunggu model selesai dimuat..."):
+            snapshot = model_registry.wait()
+    return snapshot
+
+def show_model_not_found():
+    st.error("""
+    ❌ **Model tidak ditemukan!** 
     
-    # Cari preprocessor/feature names
-    for path in preprocessor_paths:
-        if os.path.exists(path):
-            try:
-                if path.endswith('feature_names.pkl'):
-                    with open(path, 'rb') as f:
-                        preprocessor = pickle.load(f)
-                else:
-                    preprocessor = joblib.load(path)
-                preprocessor_location = path
-                st.sidebar.info(f"Preprocessor ditemukan di: {path}")
-                break
-            except Exception as e:
-                st.sidebar.warning(f"Gagal load preprocessor dari {path}: {str(e)[:50]}...")
+    **Lokasi yang dicari:**
+    1. `best_churn_model.pkl` (root folder)
+    2. `notebooks/best_churn_model.pkl`
+    3. `./best_churn_model.pkl`
     
-    # Jika tidak ditemukan
-    if not model:
-        st.error("""
-        ❌ **Model tidak ditemukan!** 
-        
-        **Lokasi yang dicari:**
-        1. `best_churn_model.pkl` (root folder)
-        2. `notebooks/best_churn_model.pkl`
-        3. `./best_churn_model.pkl`
-        
-        **Solusi:**
-        1. Pastikan file model ada di salah satu lokasi di atas
-        2. Jika di GitHub, pastikan file `.pkl` tidak di-exclude oleh `.gitignore`
-        3. Upload file ke folder yang sama dengan `app.py`
-        """)
-        
-        # Debug info
-        with st.expander("🔍 Debug Information"):
-            st.write("**File yang ada di direktori:**")
-            try:
-                files = os.listdir('.')
-                st.write(files[:20])  # Tampilkan 20 file pertama
-            except:
-                st.write("Tidak bisa membaca direktori")
-                
-            st.write("**File di notebooks/:**")
-            try:
-                notebook_files = os.listdir('notebooks') if os.path.exists('notebooks') else []
-                st.write(notebook_files[:20])
-            except:
-                st.write("Folder notebooks tidak ada atau tidak bisa diakses")
+    **Solusi:**
+    1. Pastikan file model ada di salah satu lokasi di atas
+    2. Jika di GitHub, pastikan file `.pkl` tidak di-exclude oleh `.gitignore`
+    3. Upload file ke folder yang sama dengan `app.py`
+    """)
     
-    return model, preprocessor, model_location, preprocessor_location
+    # Debug info
+    with st.expander("🔍 Debug Information"):
+        st.write("**File yang ada di direktori:**")
+        try:
+            st.write(list_files('.')[:20])  # Tampilkan 20 file pertama
+        except:
+            st.write("Tidak bisa membaca direktori")
+            
+        st.write("**File di notebooks/:**")
+        try:
+            st.write(list_files('notebooks')[:20])
+        except:
+            st.write("Folder notebooks tidak ada atau tidak bisa diakses")
+
+# Snapshot diambil sekali per rerun: hot swap tidak mengganti model di tengah prediksi
+model_registry = get_model_registry()
+prediction_cache = get_prediction_cache()
+drift_monitor = get_drift_monitor()
+snapshot = model_registry.current()
+model, preprocessor, model_loc, preproc_loc = unpack_snapshot(snapshot)
 
-# Load model dan preprocessor
-model, preprocessor, model_loc, preproc_loc = load_model_and_preprocessor()
+for message in list(model_registry.messages):
+    st.sidebar.warning(message)
+if model_registry.last_error:
+    st.sidebar.warning(model_registry.last_error)
 
 if model:
-    st.sidebar.success(f"✅ Model siap digunakan ({model_loc})")
+    st.sidebar.success(f"✅ Model siap digunakan ({model_loc}, versi {snapshot.version})")
     # Tampilkan info model
     if hasattr(model, 'named_steps'):
         st.sidebar.info(f"Model type: Pipeline ({len(model.named_steps)} steps)")
     else:
         st.sidebar.info(f"Model type: {type(model).__name__}")
+elif not model_registry.is_ready():
+    st.sidebar.info("⏳ Model sedang dimuat di background...")
+else:
+    show_model_not_found()
 
 if preprocessor:
     st.sidebar.success(f"✅ Preprocessor siap ({preproc_loc})")
 
 # ==================== INPUT FORM ====================
-st.sidebar.header("Input Data")
-
-# Simple form
-gender = st.sidebar.selectbox("Gender", ["Male", "Female"])
-senior_citizen = st.sidebar.selectbox("Senior Citizen", [0, 1])
-partner = st.sidebar.selectbox("Partner", ["Yes", "No"])
-dependents = st.sidebar.selectbox("Dependents", ["Yes", "No"])
-tenure = st.sidebar.slider("Tenure (bulan)", 0, 72, 24)
-phone_service = st.sidebar.selectbox("Phone Service", ["Yes", "No"])
-internet_service = st.sidebar.selectbox("Internet Service", ["DSL", "Fiber optic", "No"])
-contract = st.sidebar.selectbox("Contract", ["Month-to-month", "One year", "Two year"])
-paperless_billing = st.sidebar.selectbox("Paperless Billing", ["Yes", "No"])
-payment_method = st.sidebar.selectbox("Payment Method", [
-    "Electronic check", "Mailed check", "Bank transfer (automatic)", "Credit card (automatic)"
-])
-monthly_charges = st.sidebar.slider("Monthly Charges ($)", 18.0, 120.0, 70.0)
-total_charges = st.sidebar.slider("Total Charges ($)", 0.0, 9000.0, tenure * monthly_charges)
+# Form: mengubah input tidak memicu rerun; script baru jalan saat "Prediksi Churn" ditekan
+with st.sidebar.form("input_form"):
+    st.header("Input Data")
+    gender = st.selectbox("Gender", CATEGORY_VALUES['gender'])
+    senior_citizen = st.selectbox("Senior Citizen", [0, 1])
+    partner = st.selectbox("Partner", CATEGORY_VALUES['Partner'])
+    dependents = st.selectbox("Dependents", CATEGORY_VALUES['Dependents'])
+    tenure = st.slider("Tenure (bulan)", *NUMERIC_RANGES['tenure'], 24)
+    phone_service = st.selectbox("Phone Service", CATEGORY_VALUES['PhoneService'])
+    internet_service = st.selectbox("Internet Service", CATEGORY_VALUES['InternetService'])
+    contract = st.selectbox("Contract", CATEGORY_VALUES['Contract'])
+    paperless_billing = st.selectbox("Paperless Billing", CATEGORY_VALUES['PaperlessBilling'])
+    payment_method = st.selectbox("Payment Method", CATEGORY_VALUES['PaymentMethod'])
+    monthly_charges = st.slider("Monthly Charges ($)", *NUMERIC_RANGES['MonthlyCharges'], 70.0)
+    # Di dalam form default slider tidak bisa mengikuti tenure secara live, jadi pilih eksplisit
+    derive_total = st.checkbox("Total Charges = tenure × Monthly Charges", value=True)
+    manual_total_charges = st.slider("Total Charges ($)", *NUMERIC_RANGES['TotalCharges'], 24 * 70.0,
+                                     help="Dipakai jika checkbox di atas tidak dicentang")
+
+    # Threshold klasifikasi: turunkan untuk menaikkan recall, naikkan untuk precision
+    threshold = st.slider("Threshold Churn", 0.05, 0.95, DEFAULT_THRESHOLD, 0.05)
+    submitted = st.form_submit_button("Prediksi Churn")
+
+total_charges = tenure * monthly_charges if derive_total else manual_total_charges
 
 # Default values for other features
 multiple_lines = "No phone service" if phone_service == "No" else "No"
@@ -177,33 +266,44 @@ st.subheader("Data Input")
 st.write(input_df)
 
 # ==================== PREDICTION ====================
-if st.button("Prediksi Churn"):
+if submitted:
+    if not model:
+        snapshot = ready_snapshot()
+        model, preprocessor, model_loc, preproc_loc = unpack_snapshot(snapshot)
     if model:
         try:
             # ===== PERUBAHAN UTAMA DI SINI =====
             # Jika model adalah Pipeline, JANGAN transform data manual
             # Pipeline akan handle preprocessing otomatis
             
-            # Cek jika model adalah Pipeline
-            is_pipeline = hasattr(model, 'named_steps')
+            from fast_scorer import CompiledPipeline
+            from schema import FeatureSchema
+
+            # Cek jika model adalah Pipeline (compiled artifact juga menerima data mentah)
+            is_pipeline = hasattr(model, 'named_steps') or isinstance(model, CompiledPipeline)
             
             if is_pipeline:
                 st.info("🔧 Model adalah Pipeline - preprocessing dilakukan otomatis")
                 
-                # Pastikan semua kolom yang dibutuhkan ada
-                if hasattr(model, 'feature_names_in_'):
-                    required_cols = list(model.feature_names_in_)
-                    missing_cols = [col for col in required_cols if col not in input_df.columns]
-                    
-                    if missing_cols:
-                        st.warning(f"Kolom yang hilang: {missing_cols[:5]}")
-                        # Tambahkan kolom yang hilang dengan nilai default
-                        for col in missing_cols:
-                            input_df[col] = 0 if 'charge' in col.lower() or 'tenure' in col.lower() else 'Unknown'
+                # Validasi kolom, kategori, dan rentang angka sekaligus (schema dari model)
+                schema = FeatureSchema.from_model(model)
+                if schema is not None:
+                    with timed_stage('schema', len(input_df)):
+                        validation = schema.validate(input_df)
+                    if not validation.valid.all():
+                        raise ValueError(f"Input tidak valid pada kolom: {validation.reasons().iloc[0]}")
+                    input_df = validation.data
                 
-                # Predict langsung dengan raw data
-                prediction = model.predict(input_df)[0]
-                probabilities = model.predict_proba(input_df)[0]
+                # Predict langsung dengan raw data, profil yang sama diambil dari cache
+                if hasattr(model, 'feature_names_in_'):
+                    from prediction_cache import cached_churn_probabilities
+                    churn_proba = cached_churn_probabilities(
+                        prediction_cache, model, input_df, list(model.feature_names_in_),
+                        lambda m, X: predict_churn(m, X)[0], snapshot.checksum
+                    )
+                    labels = apply_threshold(churn_proba, threshold)
+                else:
+                    churn_proba, labels = predict_churn(model, input_df, threshold)
                 
             else:
                 # Model bukan Pipeline, coba pakai preprocessor jika ada
@@ -216,8 +316,12 @@ if st.button("Prediksi Churn"):
                 else:
                     input_transformed = input_df
                 
-                prediction = model.predict(input_transformed)[0]
-                probabilities = model.predict_proba(input_transformed)[0]
+                churn_proba, labels = predict_churn(model, input_transformed, threshold)
+            
+            prediction = labels[0]
+            probabilities = [1 - churn_proba[0], churn_proba[0]]
+            if drift_monitor is not None:
+                drift_monitor.update(input_df, churn_proba)
             # ===== END PERUBAHAN =====
             
             # Display results
@@ -247,9 +351,30 @@ if st.button("Prediksi Churn"):
             
             st.bar_chart(prob_df.set_index('Status'))
             
+            # Faktor yang paling memengaruhi prediksi pelanggan ini
+            contributions = None
+            explainer = get_explainer(snapshot.checksum, snapshot.model) if is_pipeline else None
+            if explainer is not None:
+                from explain import top_factors
+                _, contributions = explainer.explain(input_df)
+                st.subheader("Faktor Risiko")
+                st.caption(f"Kontribusi tiap fitur terhadap probabilitas churn "
+                           f"(rata-rata churn: {explainer.bias*100:.1f}%)")
+                st.bar_chart(contributions.iloc[0].sort_values(ascending=False).rename('Kontribusi'))
+                for label, reasons in [("Menaikkan risiko", top_factors(contributions, input_df)),
+                                       ("Menurunkan risiko", top_factors(contributions, input_df, increasing=False))]:
+                    text = [r for r in reasons.iloc[0] if r]
+                    if text:
+                        st.write(f"**{label}:** " + ", ".join(text))
+            
             # Recommendations
             st.subheader("Rekomendasi")
-            if prediction == 1:
+            from explain import retention_actions
+            actions = retention_actions(contributions.iloc[0]) if contributions is not None else []
+            if prediction == 1 and actions:
+                st.warning("**Tindakan yang disarankan:**\n" +
+                           "\n".join(f"{i}. {action}" for i, action in enumerate(actions, 1)))
+            elif prediction == 1:
                 st.warning("""
                 **Tindakan yang disarankan:**
                 1. Hubungi pelanggan untuk feedback
@@ -303,9 +428,8 @@ if st.button("Prediksi Churn"):
                         'TotalCharges': [840.0]
                     })
                     
-                    sample_pred = model.predict(sample_data)
-                    sample_proba = model.predict_proba(sample_data)
-                    st.success(f"✅ Sample test berhasil! Prediction: {sample_pred[0]}, Probability: {sample_proba[0][1]:.2%}")
+                    sample_proba, sample_pred = predict_churn(model, sample_data, threshold)
+                    st.success(f"✅ Sample test berhasil! Prediction: {sample_pred[0]}, Probability: {sample_proba[0]:.2%}")
                     
                     # Bandingkan kolom
                     st.write("**Perbandingan kolom:**")
@@ -333,29 +457,220 @@ if st.button("Prediksi Churn"):
     else:
         st.error("Model belum dimuat. Pastikan file model ada.")
 
+# ==================== WHAT-IF ====================
+@fragment
+def what_if_section(input_data, threshold):
+    """
+    Form what-if; submit hanya me-rerun bagian ini (profil & threshold dari submit terakhir sidebar)
+    """
+    import numpy as np
+    from what_if import (COST_COLUMN, DEFAULT_SWEEPS, PROBABILITY_COLUMN, changes_of, cheapest_change,
+                         response_curve, run_sweep)
+
+    st.markdown("---")
+    st.subheader("🔮 Analisis What-If")
+    st.write("Ubah beberapa fitur sekaligus dari profil di sidebar; semua kombinasi diskor dalam satu batch")
+
+    # Form: menggeser rentang tidak memicu rerun sampai tombol ditekan
+    with st.form("what_if_form"):
+        sweep_columns = st.multiselect("Fitur yang diubah", list(DEFAULT_SWEEPS), default=['tenure', 'Contract'])
+        col1, col2 = st.columns(2)
+        with col1:
+            tenure_range = st.slider("Rentang tenure (bulan)", *NUMERIC_RANGES['tenure'], NUMERIC_RANGES['tenure'])
+            tenure_step = st.number_input("Langkah tenure", min_value=1, max_value=24, value=1)
+        with col2:
+            charges_range = st.slider("Rentang Monthly Charges ($)", *NUMERIC_RANGES['MonthlyCharges'],
+                                      NUMERIC_RANGES['MonthlyCharges'])
+            charges_step = st.number_input("Langkah Monthly Charges ($)", min_value=0.5, max_value=20.0, value=1.0)
+        run_what_if = st.form_submit_button("Jalankan What-If")
+
+    if run_what_if and sweep_columns:
+        snapshot = ready_snapshot()
+        if snapshot:
+            sweeps = {col: DEFAULT_SWEEPS[col] for col in sweep_columns}
+            if 'tenure' in sweeps:
+                sweeps['tenure'] = np.arange(tenure_range[0], tenure_range[1] + 1, tenure_step)
+            if 'MonthlyCharges' in sweeps:
+                sweeps['MonthlyCharges'] = np.arange(charges_range[0], charges_range[1] + charges_step / 2, charges_step)
+            try:
+                sweep_model = get_sweep_model(snapshot.checksum, snapshot.location, snapshot.model)
+                with st.spinner("Menghitung semua varian..."):
+                    result = run_sweep(sweep_model, input_data, sweeps)
+                st.caption(f"{len(result):,} varian diskor dalam satu kali predict_proba")
+
+                numeric = [col for col in sweep_columns if col in NUMERIC_RANGES]
+                categorical = [col for col in sweep_columns if col not in NUMERIC_RANGES]
+                if len(numeric) == 2:
+                    import altair as alt
+
+                    heatmap = response_curve(result, numeric[0], numeric[1])
+                    st.altair_chart(alt.Chart(heatmap).mark_rect().encode(
+                        x=f'{numeric[0]}:O', y=alt.Y(f'{numeric[1]}:O', sort='descending'),
+                        color=alt.Color(f'{PROBABILITY_COLUMN}:Q', scale=alt.Scale(scheme='redyellowgreen', reverse=True)),
+                        tooltip=[numeric[0], numeric[1], PROBABILITY_COLUMN],
+                    ))
+                elif numeric:
+                    color = categorical[0] if categorical else None
+                    st.line_chart(response_curve(result, numeric[0], color), x=numeric[0], y=PROBABILITY_COLUMN,
+                                  color=color)
+                else:
+                    st.bar_chart(response_curve(result, categorical[0]).set_index(categorical[0]))
+                if len(sweep_columns) > 2 or (len(numeric) == 2 and categorical):
+                    st.caption("Probabilitas dirata-rata atas fitur lain yang di-sweep")
+
+                best = cheapest_change(result, input_data, threshold)
+                if best is None:
+                    st.warning(f"⚠️ Tidak ada perubahan di grid ini yang menurunkan probabilitas churn "
+                               f"di bawah {threshold:.0%} (tenure dianggap tidak bisa diubah)")
+                elif not changes_of(best, input_data):
+                    st.success(f"✅ Profil saat ini sudah di bawah threshold ({best[PROBABILITY_COLUMN]:.1%})")
+                else:
+                    changes = ", ".join(f"{col}: {old} → {new}" for col, (old, new) in changes_of(best, input_data).items())
+                    st.success(f"✅ Perubahan termurah: {changes} → probabilitas churn "
+                               f"{best[PROBABILITY_COLUMN]:.1%} (biaya {best[COST_COLUMN]:.1f})")
+            except Exception as e:
+                st.error(f"Error saat what-if: {str(e)}")
+        else:
+            st.error("Model belum dimuat. Pastikan file model ada.")
+
+what_if_section(input_data, threshold)
+
+# ==================== BATCH SCORING (CSV) ====================
+@fragment
+def batch_section(threshold):
+    """
+    Upload & scoring batch; interaksi di sini tidak me-rerun prediksi di atas
+    """
+    import tempfile
+
+    import batch_scoring
+    from schema import ERROR_COLUMN
+
+    st.markdown("---")
+    st.subheader("📂 Batch Scoring (CSV / Parquet)")
+    st.write("Upload file CSV (format seperti `notebooks/example_customer.csv`) atau Parquet dari `data_loader.py` untuk memprediksi banyak pelanggan sekaligus")
+
+    uploaded_file = st.file_uploader("Upload CSV/Parquet pelanggan", type=["csv", "parquet"])
+    chunk_size = st.number_input("Ukuran chunk (baris)", min_value=1_000, max_value=500_000,
+                                 value=batch_scoring.DEFAULT_CHUNK_SIZE, step=1_000)
+
+    if uploaded_file is not None and st.button("Prediksi Batch"):
+        model = unpack_snapshot(ready_snapshot())[0]
+        if model:
+            status = st.empty()
+
+            def show_progress(rows_done, elapsed):
+                rate = rows_done / elapsed if elapsed > 0 else 0.0
+                status.write(f"⏳ {rows_done:,} baris diproses ({rate:,.0f} baris/detik)")
+
+            # Hasil ditulis ke file sementara per chunk, jadi memori tetap kecil
+            output_file = tempfile.NamedTemporaryFile('w+', suffix='.csv', newline='', delete=False)
+            try:
+                with output_file:
+                    stats = batch_scoring.score_csv(model, uploaded_file, output_file,
+                                                    chunksize=int(chunk_size),
+                                                    progress_callback=show_progress,
+                                                    threshold=threshold, monitor=drift_monitor)
+
+                status.success(f"✅ {stats['rows']:,} baris selesai diprediksi dalam {stats['seconds']:.2f} detik")
+                if stats['invalid_rows']:
+                    st.warning(f"⚠️ {stats['invalid_rows']:,} baris tidak valid tidak diprediksi "
+                               f"(alasan di kolom `{ERROR_COLUMN}` pada file hasil)")
+                st.metric("Throughput", f"{stats['rows_per_second']:,.0f} baris/detik")
+
+                with open(output_file.name, 'rb') as f:
+                    st.download_button("⬇️ Download hasil prediksi", f.read(),
+                                       file_name="scored_customers.csv", mime="text/csv")
+            except Exception as e:
+                st.error(f"Error saat batch scoring: {str(e)}")
+            finally:
+                # File sementara selalu dihapus, juga saat scoring gagal
+                os.remove(output_file.name)
+        else:
+            st.error("Model belum dimuat. Pastikan file model ada.")
+
+batch_section(threshold)
+
+# ==================== DRIFT MONITOR ====================
+@fragment
+def drift_section():
+    with st.expander("📈 Drift Monitor"):
+        if drift_monitor is None:
+            st.write("Baseline drift tidak ditemukan. Buat dengan:")
+            st.code("python drift_monitor.py baseline --output notebooks/drift_baseline.json")
+        elif drift_monitor.rows == 0:
+            st.write("Belum ada data yang diprediksi sejak app dijalankan")
+        else:
+            from drift_monitor import report_frame
+            drift_report = report_frame(drift_monitor.report())
+            st.write(f"**{drift_monitor.rows:,} baris** dibandingkan dengan data training "
+                     f"({drift_monitor.baseline['rows']:,} baris)")
+            drifted = drift_report.index[drift_report['status'] == 'drift'].tolist()
+            if drifted:
+                st.warning(f"⚠️ Drift (PSI > 0.25): {', '.join(drifted)}")
+            st.dataframe(drift_report[['psi', 'ks', 'status']])
+            if st.button("Reset Drift"):
+                drift_monitor.reset()
+
+with st.sidebar:
+    drift_section()
+
 # ==================== DEBUG SECTION ====================
-with st.sidebar.expander("🔧 Debug & Info"):
-    st.write("**Model Location:**", model_loc if model_loc else "Not found")
-    st.write("**Preprocessor Location:**", preproc_loc if preproc_loc else "Not found")
-    st.write("**Current Directory:**", os.getcwd())
+@fragment
+def debug_section(snapshot):
+    model, _, model_loc, preproc_loc = unpack_snapshot(snapshot)
+    with st.expander("🔧 Debug & Info"):
+        st.write("**Model Location:**", model_loc if model_loc else "Not found")
+        st.write("**Preprocessor Location:**", preproc_loc if preproc_loc else "Not found")
+        st.write("**Current Directory:**", working_directory())
     
-    if model:
-        st.write("**Model Info:**")
-        st.write(f"- Type: {type(model).__name__}")
-        if hasattr(model, 'named_steps'):
-            st.write(f"- Steps: {list(model.named_steps.keys())}")
-        if hasattr(model, 'feature_names_in_'):
-            st.write(f"- Features expected: {len(model.feature_names_in_)}")
+        if model:
+            st.write("**Model Info:**")
+            st.write(f"- Type: {type(model).__name__}")
+            if hasattr(model, 'named_steps'):
+                st.write(f"- Steps: {list(model.named_steps.keys())}")
+            if hasattr(model, 'feature_names_in_'):
+                st.write(f"- Features expected: {len(model.feature_names_in_)}")
+        if snapshot:
+            st.write(f"- Versi registry: {snapshot.version} (load {snapshot.load_seconds:.2f} detik)")
+            st.write(f"- Checksum: {snapshot.checksum[:12]}")
     
-    if st.button("Check Files"):
-        st.write("**Files in current dir:**")
-        try:
-            files = os.listdir('.')
-            for f in files:
-                if f.endswith('.pkl') or f.endswith('.py'):
-                    st.write(f"- {f}")
-        except:
-            st.write("Cannot list files")
+        cache_stats = prediction_cache.stats()
+        st.write("**Prediction Cache:**")
+        st.write(f"- Hit: {cache_stats['hits']} | Miss: {cache_stats['misses']} "
+                 f"({cache_stats['hit_rate']:.0%} hit rate)")
+        st.write(f"- Entri: {cache_stats['size']}/{cache_stats['max_size']} | Evicted: {cache_stats['evictions']}")
+    
+        st.write("**Latency per Tahap:**")
+        st.checkbox("Aktifkan instrumentasi pipeline", key='instrumentation_enabled',
+                    help="Ukur waktu tiap tahap (imputer, scaler, onehot, classifier) di prediksi berikutnya")
+        # Tanpa instrumentasi aktif, instrumentation.py (sklearn) tidak perlu di-import
+        instrumentation = active_instrumentation()
+        stage_summary = instrumentation.summary() if instrumentation is not None else None
+        if stage_summary:
+            st.dataframe(pd.DataFrame.from_dict(stage_summary, orient='index')[
+                ['count', 'rows', 'mean_ms', 'p50_ms_le', 'p95_ms_le']
+            ])
+            st.download_button("⬇️ Prometheus", instrumentation.to_prometheus(),
+                               file_name="churn_inference_metrics.txt", mime="text/plain")
+            st.download_button("⬇️ JSON", instrumentation.to_json(),
+                               file_name="churn_inference_metrics.json", mime="application/json")
+            if st.button("Reset Statistik"):
+                instrumentation.reset()
+        elif instrumentation is not None:
+            st.write("- Belum ada prediksi yang diukur")
+    
+        if st.button("Check Files"):
+            st.write("**Files in current dir:**")
+            try:
+                for f in list_files('.'):
+                    if f.endswith('.pkl') or f.endswith('.py'):
+                        st.write(f"- {f}")
+            except:
+                st.write("Cannot list files")
+
+with st.sidebar:
+    debug_section(model_registry.current())
 
 # ==================== FOOTER ====================
 st.markdown("---")
@@ -0,0 +1,465 @@
+"""
+Batch scoring untuk file CSV atau Parquet berisi banyak pelanggan.
+
+File dibaca per chunk dengan ukuran tetap (Parquet: hanya kolom yang dibutuhkan), setiap chunk diprediksi sekali
+(vectorized) oleh pipeline `best_churn_model.pkl`, lalu hasilnya langsung
+ditulis ke CSV output. Memori yang dipakai hanya sebesar satu chunk,
+berapapun ukuran file input.
+
+Untuk scoring malam hari seluruh pelanggan, CLI di bawah membagi file input
+menjadi shard (CSV: rentang byte per baris utuh, Parquet: row group) dan
+menskor shard paralel di process pool. Setiap worker me-load model sekali.
+Hasil per shard ditulis ke `<output>.parts/part-NNNNN.csv` (atomik lewat
+rename) bersama `checkpoint.json`; jika proses terhenti, jalankan perintah
+yang sama lagi dan hanya shard yang belum selesai yang diskor. Setelah semua
+shard selesai, part digabung berurutan ke `<output>` (atau dibiarkan
+terpartisi dengan --partitioned).
+
+Jika ada baseline drift (lihat drift_monitor.py), setiap shard juga menulis
+hitungan drift-nya (`part-NNNNN.drift.json`); laporan gabungan ditulis ke
+`<output>.drift.json`.
+
+    python batch_scoring.py pelanggan.csv scored.csv --model notebooks/best_churn_model.pkl --workers 8
+
+CSV di-split per byte, jadi field tidak boleh berisi newline (dataset Telco aman).
+"""
+import argparse
+import io
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from data_loader import available_columns, clean_frame, is_parquet, iter_batches
+from drift_monitor import DriftMonitor, find_baseline_path, load_baseline
+from model_artifact import is_artifact, load_artifact, load_pipeline, model_checksum
+from schema import ERROR_COLUMN, FeatureSchema
+from scoring import DEFAULT_THRESHOLD, predict_churn
+
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_SHARD_MB = 32
+CHECKPOINT_FILE = 'checkpoint.json'
+
+PROBABILITY_COLUMN = 'churn_probability'
+PREDICTION_COLUMN = 'churn_prediction'
+
+# Kolom non-fitur yang ikut ditulis ke output jika ada di input
+PASSTHROUGH_COLUMNS = ['customerID']
+
+
+def get_feature_columns(model):
+    """
+    Ambil urutan kolom fitur yang dipakai saat training
+    """
+    if hasattr(model, 'feature_names_in_'):
+        return list(model.feature_names_in_)
+    return None
+
+
+def prepare_features(chunk, feature_columns=None):
+    """
+    Siapkan satu chunk agar sesuai format input pipeline
+    """
+    features = chunk if feature_columns is None else chunk[feature_columns]
+    if 'TotalCharges' in features.columns:
+        # Sama seperti di notebook: nilai kosong (' ') jadi NaN, nanti di-impute
+        features = features.copy()
+        features['TotalCharges'] = pd.to_numeric(features['TotalCharges'], errors='coerce')
+    return features
+
+
+def iter_scored_chunks(model, source, chunksize=DEFAULT_CHUNK_SIZE, threshold=DEFAULT_THRESHOLD,
+                       monitor=None):
+    """
+    Baca `source` per chunk dan yield chunk yang sudah diberi skor
+    """
+    feature_columns = get_feature_columns(model)
+    schema = FeatureSchema.from_model(model)
+
+    # Parquet: baca hanya customerID + kolom fitur (column projection)
+    columns = None
+    if is_parquet(source) and feature_columns is not None:
+        names = available_columns(source)
+        missing_cols = [col for col in feature_columns if col not in names]
+        if missing_cols:
+            raise ValueError(f"Kolom hilang di file input: {missing_cols}")
+        columns = [col for col in PASSTHROUGH_COLUMNS if col in names] + feature_columns
+
+    for chunk in iter_batches(source, columns=columns, batch_size=chunksize):
+        if feature_columns is not None:
+            missing_cols = [col for col in feature_columns if col not in chunk.columns]
+            if missing_cols:
+                raise ValueError(f"Kolom hilang di file input: {missing_cols}")
+
+        yield score_frame(model, chunk, feature_columns, threshold, schema, monitor)
+
+
+def score_frame(model, chunk, feature_columns=None, threshold=DEFAULT_THRESHOLD, schema=None, monitor=None):
+    """
+    Tambahkan kolom probabilitas dan prediksi churn ke satu chunk.
+
+    Dengan `schema` (lihat schema.py), baris yang tidak valid dikarantina: tidak
+    diprediksi (probabilitas & prediksi kosong) dan alasannya ditulis di kolom
+    `validation_error`, sementara baris lain tetap diskor.
+
+    Dengan `monitor` (DriftMonitor), fitur dan probabilitas baris yang diskor ikut dihitung.
+    """
+    if schema is None:
+        features = prepare_features(chunk, feature_columns)
+
+        # Satu kali predict_proba per chunk, label diambil dari probabilitas
+        probabilities, labels = predict_churn(model, features, threshold)
+        if monitor is not None:
+            monitor.update(features, probabilities)
+        chunk[PROBABILITY_COLUMN] = probabilities
+        chunk[PREDICTION_COLUMN] = labels
+        return chunk
+
+    validation = schema.validate(chunk)
+    probabilities = np.full(len(chunk), np.nan)
+    labels = pd.array(np.zeros(len(chunk), dtype=np.int8), dtype='Int8')
+    labels[~validation.valid] = pd.NA
+    if validation.valid.any():
+        probabilities[validation.valid], labels[validation.valid] = predict_churn(
+            model, validation.data[validation.valid], threshold)
+        if monitor is not None:
+            monitor.update(validation.data[validation.valid], probabilities[validation.valid])
+    chunk[PROBABILITY_COLUMN] = probabilities
+    chunk[PREDICTION_COLUMN] = labels
+    chunk[ERROR_COLUMN] = validation.reasons()
+    return chunk
+
+
+def score_csv(model, source, destination, chunksize=DEFAULT_CHUNK_SIZE, progress_callback=None,
+              threshold=DEFAULT_THRESHOLD, monitor=None):
+    """
+    Skor seluruh isi `source` dan tulis hasilnya ke `destination` secara streaming.
+
+    `destination` boleh berupa path atau file object teks yang sudah dibuka.
+
+    `progress_callback(rows_done, elapsed_seconds)` dipanggil setiap selesai satu chunk.
+    Return dict berisi jumlah baris, baris yang dikarantina, durasi, dan throughput (rows/s).
+    """
+    if isinstance(destination, str):
+        with open(destination, 'w', newline='') as f:
+            return score_csv(model, source, f, chunksize, progress_callback, threshold, monitor)
+
+    rows_done = 0
+    start = time.perf_counter()
+
+    invalid_rows = 0
+    for i, chunk in enumerate(iter_scored_chunks(model, source, chunksize, threshold, monitor)):
+        chunk.to_csv(destination, index=False, header=(i == 0))
+        rows_done += len(chunk)
+        invalid_rows += int(chunk[PROBABILITY_COLUMN].isna().sum())
+        if progress_callback is not None:
+            progress_callback(rows_done, time.perf_counter() - start)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows_done,
+        'invalid_rows': invalid_rows,
+        'seconds': elapsed,
+        'rows_per_second': rows_done / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+# ==================== SHARDING ====================
+def plan_csv_shards(path, shard_bytes):
+    """
+    Bagi CSV menjadi rentang byte [start, end) yang selalu berakhir di akhir baris
+    """
+    size = os.path.getsize(path)
+    shards = []
+    with open(path, 'rb') as f:
+        f.readline()  # header
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + shard_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            shards.append({'index': len(shards), 'start': start, 'end': end})
+            start = end
+    if not shards:
+        # Input tanpa baris data: satu shard kosong agar output tetap punya header
+        shards.append({'index': 0, 'start': start, 'end': start})
+    return shards
+
+
+def plan_parquet_shards(path):
+    """
+    Satu shard per row group (file tanpa row group: satu shard kosong, lihat plan_csv_shards)
+    """
+    import pyarrow.parquet as pq
+
+    n_row_groups = pq.ParquetFile(path).num_row_groups
+    if n_row_groups == 0:
+        return [{'index': 0, 'row_group': None}]
+    return [{'index': i, 'row_group': i} for i in range(n_row_groups)]
+
+
+def read_shard(source, shard, columns=None):
+    if 'row_group' in shard:
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(source)
+        if shard['row_group'] is None:
+            table = parquet_file.schema_arrow.empty_table()
+            return (table.select(columns) if columns else table).to_pandas()
+        return parquet_file.read_row_group(shard['row_group'], columns=columns).to_pandas()
+
+    with open(source, 'rb') as f:
+        header = f.readline()
+        f.seek(shard['start'])
+        body = f.read(shard['end'] - shard['start'])
+    # Pembersihan yang sama dengan iter_batches (data_loader.py)
+    return clean_frame(pd.read_csv(io.BytesIO(header + body)))
+
+
+def load_model_for_batch(path, compiled=False):
+    """
+    Load model untuk worker batch (n_jobs=1: paralelisme dari jumlah worker).
+
+    Artifact: pipeline sklearn di dalamnya (throughput batch besar lebih tinggi),
+    atau compiled scorer ter-mmap dengan `compiled=True` (memori dibagi antar worker).
+    """
+    if is_artifact(path):
+        if compiled:
+            return load_artifact(path, mmap_mode='r')
+        model = load_pipeline(path)
+    else:
+        model = joblib.load(path)
+    estimator = model.steps[-1][1] if hasattr(model, 'steps') else model
+    if 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=1)
+    return model
+
+
+# ==================== WORKER PROCESS ====================
+_MODEL = None
+_SCHEMA = None
+_DRIFT_BASELINE = None
+
+
+def _init_worker(model_path, compiled, drift_baseline_path=None):
+    global _MODEL, _SCHEMA, _DRIFT_BASELINE
+    _MODEL = load_model_for_batch(model_path, compiled)
+    _SCHEMA = FeatureSchema.from_model(_MODEL)
+    _DRIFT_BASELINE = load_baseline(drift_baseline_path) if drift_baseline_path else None
+
+
+def _part_path(parts_dir, index):
+    return os.path.join(parts_dir, f'part-{index:05d}.csv')
+
+
+def _drift_path(parts_dir, index):
+    return os.path.join(parts_dir, f'part-{index:05d}.drift.json')
+
+
+def _score_shard(source, shard, parts_dir, threshold):
+    """
+    Skor satu shard dan tulis part-nya secara atomik. Return jumlah baris.
+    """
+    feature_columns = get_feature_columns(_MODEL)
+    columns = None
+    if 'row_group' in shard and feature_columns is not None:
+        names = available_columns(source)
+        columns = [col for col in PASSTHROUGH_COLUMNS if col in names] + feature_columns
+    chunk = read_shard(source, shard, columns)
+    if feature_columns is not None:
+        missing_cols = [col for col in feature_columns if col not in chunk.columns]
+        if missing_cols:
+            raise ValueError(f"Kolom hilang di file input: {missing_cols}")
+
+    monitor = DriftMonitor(_DRIFT_BASELINE) if _DRIFT_BASELINE is not None else None
+    scored = score_frame(_MODEL, chunk, feature_columns, threshold, _SCHEMA, monitor)
+    if monitor is not None:
+        # Ditulis sebelum part: part yang ada selalu punya hitungan drift
+        drift_path = _drift_path(parts_dir, shard['index'])
+        with open(drift_path + '.tmp', 'w') as f:
+            json.dump(monitor.state(), f)
+        os.replace(drift_path + '.tmp', drift_path)
+    part_path = _part_path(parts_dir, shard['index'])
+    scored.to_csv(part_path + '.tmp', index=False)
+    os.replace(part_path + '.tmp', part_path)
+    return len(scored), int(scored[PROBABILITY_COLUMN].isna().sum())
+
+
+# ==================== CHECKPOINT & MERGE ====================
+def _source_signature(source):
+    stat = os.stat(source)
+    return {'path': os.path.abspath(source), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_or_create_checkpoint(source, parts_dir, model_path, threshold, shard_bytes):
+    """
+    Pakai checkpoint lama jika input, model, dan threshold sama; jika tidak, buat rencana shard baru
+    """
+    plan = {
+        'source': _source_signature(source),
+        'model_checksum': model_checksum(model_path),
+        'threshold': threshold,
+    }
+    checkpoint_path = os.path.join(parts_dir, CHECKPOINT_FILE)
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if all(checkpoint[key] == value for key, value in plan.items()):
+            return checkpoint
+        raise ValueError(f"Checkpoint di {parts_dir} dibuat untuk input/model/threshold lain; "
+                         f"hapus folder itu atau pakai --restart")
+
+    os.makedirs(parts_dir, exist_ok=True)
+    shards = plan_parquet_shards(source) if is_parquet(source) else plan_csv_shards(source, shard_bytes)
+    checkpoint = {**plan, 'shards': shards}
+    with open(checkpoint_path, 'w') as f:
+        json.dump(checkpoint, f, indent=4)
+    return checkpoint
+
+
+def merge_parts(parts_dir, n_shards, destination):
+    """
+    Gabungkan part berurutan ke satu CSV (header hanya dari part pertama)
+    """
+    with open(destination, 'wb') as out:
+        for index in range(n_shards):
+            with open(_part_path(parts_dir, index), 'rb') as part:
+                header = part.readline()
+                if index == 0:
+                    out.write(header)
+                shutil.copyfileobj(part, out)
+
+
+def merge_drift(parts_dir, n_shards, baseline):
+    """
+    Gabungkan hitungan drift semua shard jadi satu laporan.
+
+    Shard tanpa file drift (mis. checkpoint dibuat tanpa baseline lalu dilanjutkan
+    dengan baseline) dihitung ulang dari part-nya: baris yang diskor saja, sama
+    seperti worker.
+    """
+    monitor = DriftMonitor(baseline)
+    for index in range(n_shards):
+        path = _drift_path(parts_dir, index)
+        if os.path.exists(path):
+            with open(path) as f:
+                monitor.merge(json.load(f))
+            continue
+        # round_trip: probabilitas persis sama dengan saat diskor (bisa tepat di batas bin)
+        part = clean_frame(pd.read_csv(_part_path(parts_dir, index), float_precision='round_trip'))
+        scored = part[part[PROBABILITY_COLUMN].notna()]
+        monitor.update(scored, scored[PROBABILITY_COLUMN])
+    return monitor.report()
+
+
+def score_sharded(source, destination, model_path, n_workers=None, shard_mb=DEFAULT_SHARD_MB,
+                  threshold=DEFAULT_THRESHOLD, partitioned=False, compiled=False, progress_callback=None,
+                  drift_baseline_path=None):
+    """
+    Skor `source` paralel per shard dengan checkpoint yang bisa dilanjutkan.
+
+    `progress_callback(shards_done, n_shards, rows_done, elapsed_seconds)` dipanggil per shard.
+    Dengan `drift_baseline_path`, laporan drift seluruh input ditulis ke `<destination>.drift.json`.
+    Return dict: rows (baris yang diskor di run ini), invalid_rows, shards, skipped, seconds,
+    rows_per_second, drift (laporan atau None).
+    """
+    parts_dir = destination + '.parts'
+    checkpoint = load_or_create_checkpoint(source, parts_dir, model_path, threshold,
+                                           int(shard_mb * 1024 * 1024))
+    shards = checkpoint['shards']
+    pending = [shard for shard in shards if not os.path.exists(_part_path(parts_dir, shard['index']))]
+
+    rows_done = 0
+    invalid_rows = 0
+    start = time.perf_counter()
+    if pending:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(model_path, compiled, drift_baseline_path)) as pool:
+            futures = [pool.submit(_score_shard, source, shard, parts_dir, threshold) for shard in pending]
+            for shards_done, future in enumerate(as_completed(futures), 1):
+                rows, invalid = future.result()
+                rows_done += rows
+                invalid_rows += invalid
+                if progress_callback is not None:
+                    progress_callback(len(shards) - len(pending) + shards_done, len(shards),
+                                      rows_done, time.perf_counter() - start)
+    elapsed = time.perf_counter() - start
+
+    drift = None
+    if drift_baseline_path:
+        drift = merge_drift(parts_dir, len(shards), load_baseline(drift_baseline_path))
+        with open(destination + '.drift.json', 'w') as f:
+            json.dump(drift, f, indent=4)
+    if not partitioned:
+        merge_parts(parts_dir, len(shards), destination)
+        shutil.rmtree(parts_dir)
+    return {
+        'rows': rows_done,
+        'invalid_rows': invalid_rows,
+        'shards': len(shards),
+        'skipped': len(shards) - len(pending),
+        'seconds': elapsed,
+        'rows_per_second': rows_done / elapsed if elapsed > 0 else 0.0,
+        'drift': drift,
+    }
+
+
+def _default_model_path():
+    from model_registry import model_search_paths
+
+    for path in model_search_paths():
+        if os.path.exists(path):
+            return path
+    return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Batch scoring paralel (CSV/Parquet 19 kolom)")
+    parser.add_argument('input', help="CSV atau Parquet pelanggan")
+    parser.add_argument('output', help="CSV hasil (part sementara di <output>.parts/)")
+    parser.add_argument('--model', default=None, help="best_churn_model.pkl atau folder artifact")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: semua core)")
+    parser.add_argument('--shard-mb', type=float, default=DEFAULT_SHARD_MB, help="Ukuran shard CSV (MB)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--partitioned', action='store_true', help="Jangan gabung part, output = folder part")
+    parser.add_argument('--compiled', action='store_true',
+                        help="Artifact: pakai compiled scorer ter-mmap (memori kecil, batch besar lebih lambat)")
+    parser.add_argument('--restart', action='store_true', help="Abaikan checkpoint lama")
+    parser.add_argument('--drift-baseline', default=None,
+                        help="Baseline drift (default: notebooks/drift_baseline.json jika ada)")
+    parser.add_argument('--no-drift', action='store_true', help="Jangan hitung drift")
+    args = parser.parse_args()
+
+    model_path = args.model or _default_model_path()
+    if model_path is None or not os.path.exists(model_path):
+        raise SystemExit("❌ Model tidak ditemukan, gunakan --model")
+    if args.restart:
+        shutil.rmtree(args.output + '.parts', ignore_errors=True)
+
+    def show_progress(shards_done, n_shards, rows_done, elapsed):
+        rate = rows_done / elapsed if elapsed > 0 else 0.0
+        print(f"   shard {shards_done}/{n_shards} | {rows_done:,} baris ({rate:,.0f} baris/detik)")
+
+    print(f"Scoring {args.input} dengan {model_path} ({args.workers or os.cpu_count()} worker)...")
+    drift_baseline_path = None if args.no_drift else (args.drift_baseline or find_baseline_path())
+    stats = score_sharded(args.input, args.output, model_path, args.workers, args.shard_mb,
+                          args.threshold, args.partitioned, args.compiled, show_progress,
+                          drift_baseline_path)
+    if stats['invalid_rows']:
+        print(f"   ⚠️ {stats['invalid_rows']:,} baris tidak valid dikarantina (lihat kolom {ERROR_COLUMN})")
+    if stats['skipped']:
+        print(f"   {stats['skipped']} shard sudah selesai di run sebelumnya (checkpoint)")
+    target = args.output + '.parts' if args.partitioned else args.output
+    print(f"✓ {stats['rows']:,} baris diskor dalam {stats['seconds']:.1f} detik "
+          f"({stats['rows_per_second']:,.0f} baris/detik) -> {target}")
+    if stats['drift'] is not None:
+        drifted = [col for col, result in stats['drift']['features'].items() if result['status'] == 'drift']
+        score = stats['drift']['score']
+        if score is not None and score['status'] == 'drift':
+            drifted.append(PROBABILITY_COLUMN)
+        print(f"   {'⚠️ Drift: ' + ', '.join(drifted) if drifted else '✓ Tidak ada drift signifikan'} "
+              f"(laporan di {args.output}.drift.json)")
@@ -0,0 +1,120 @@
+"""
+Load test rerun app Streamlit: rerun per session dan CPU server per session.
+
+Satu "session" = user membuka halaman, mengubah SESSION_INPUTS di sidebar satu
+per satu, lalu menekan "Prediksi Churn". Driver headless (`streamlit.testing`
+AppTest) meniru browser: perubahan widget di luar form langsung memicu rerun,
+widget di dalam form baru terkirim saat tombol submit ditekan. Semua session
+jalan di satu proses (cache `st.cache_resource` hangat, seperti server yang
+sudah melayani user lain), jadi CPU proses = CPU server untuk session itu.
+
+- reruns/session : jumlah script run per session
+- CPU/session    : waktu CPU proses (time.process_time) per session
+- reruns/detik   : throughput rerun satu core
+
+Bandingkan sebelum/sesudah dengan --app berulang, mis. versi app.py sebelumnya:
+    git show <commit>:churn-prediction-project/app.py > /tmp/app_before.py
+    python benchmarks/bench_app_reruns.py --model notebooks/best_churn_model.pkl \\
+        --app /tmp/app_before.py --app app.py --sessions 20
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, PROJECT_DIR)
+
+# (label widget di sidebar, nilai baru) — label sama di semua versi app.py
+SESSION_INPUTS = [
+    ('Gender', 'Male'),
+    ('Partner', 'Yes'),
+    ('Tenure (bulan)', 12),
+    ('Internet Service', 'Fiber optic'),
+    ('Contract', 'One year'),
+    ('Payment Method', 'Credit card (automatic)'),
+    ('Monthly Charges ($)', 95.0),
+    ('Threshold Churn', 0.4),
+]
+PREDICT_LABEL = "Prediksi Churn"
+
+
+def _find_widget(at, label):
+    for widget in list(at.selectbox) + list(at.slider):
+        if widget.label == label:
+            return widget
+    raise KeyError(f"Widget {label!r} tidak ditemukan")
+
+
+def _session(app_path):
+    """
+    Satu session user, return jumlah rerun (AppTest.run)
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.run()
+    reruns = 1
+    for label, value in SESSION_INPUTS:
+        widget = _find_widget(at, label).set_value(value)
+        # Di dalam form: browser menahan nilai sampai submit, tidak ada rerun
+        if not widget.proto.form_id:
+            at.run()
+            reruns += 1
+    next(button for button in at.button if button.label == PREDICT_LABEL).click().run()
+    reruns += 1
+    if not any(sub.value == "Hasil Prediksi" for sub in at.subheader):
+        raise RuntimeError("Hasil prediksi tidak tampil (model tidak ditemukan?)")
+    return reruns
+
+
+def _run(app_path, sessions, results):
+    os.chdir(PROJECT_DIR)
+    try:
+        _session(app_path)  # pemanasan: load model & cache resource
+        reruns = 0
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        for _ in range(sessions):
+            reruns += _session(app_path)
+        results.put((reruns, time.perf_counter() - wall_start, time.process_time() - cpu_start, None))
+    except Exception as e:
+        results.put((0, 0.0, 0.0, str(e)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test rerun app Streamlit (headless)")
+    parser.add_argument('--app', action='append', default=None,
+                        help="Path app (boleh berulang untuk perbandingan), default: app.py")
+    parser.add_argument('--model', default=None,
+                        help="Path model (di-set ke CHURN_MODEL_PATH), default: pencarian app")
+    parser.add_argument('--sessions', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.model:
+        os.environ['CHURN_MODEL_PATH'] = os.path.abspath(args.model)
+
+    ctx = mp.get_context('spawn')
+    rows = []
+    for app in args.app or [os.path.join(PROJECT_DIR, 'app.py')]:
+        results = ctx.Queue()
+        process = ctx.Process(target=_run, args=(os.path.abspath(app), args.sessions, results))
+        process.start()
+        reruns, wall, cpu, error = results.get()
+        process.join()
+        if error:
+            print(f"❌ {app}: {error}")
+            sys.exit(1)
+        rows.append((app, reruns / args.sessions, cpu / args.sessions * 1000, cpu / reruns * 1000, reruns / wall))
+        print(f"✓ {app}: {args.sessions} session, {reruns} rerun dalam {wall:.1f} detik")
+
+    print(f"\n{'app':<40} {'reruns/session':>15} {'CPU ms/session':>15} {'CPU ms/rerun':>13} {'reruns/detik':>13}")
+    for app, reruns_per_session, cpu_session, cpu_rerun, rate in rows:
+        print(f"{os.path.basename(app):<40} {reruns_per_session:>15.1f} {cpu_session:>15.0f} "
+              f"{cpu_rerun:>13.0f} {rate:>13.1f}")
+    if len(rows) > 1:
+        print(f"\nCPU per session: {rows[0][2] / rows[-1][2]:.1f}x lebih hemat ({os.path.basename(rows[-1][0])})")
+
+
+if __name__ == '__main__':
+    main()
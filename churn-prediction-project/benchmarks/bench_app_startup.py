@@ -0,0 +1,71 @@
+"""
+Benchmark startup app Streamlit: time-to-first-render dan time-to-first-prediction.
+
+Setiap pengukuran dijalankan di proses baru (cache `st.cache_resource` kosong,
+seperti server yang baru start) memakai `streamlit.testing` AppTest.
+
+- first render     : durasi script run pertama (halaman tampil)
+- first prediction : dari awal sampai hasil tombol "Prediksi Churn" tampil
+
+    python benchmarks/bench_app_startup.py --model notebooks/best_churn_model.pkl
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, PROJECT_DIR)
+
+
+def _run(app_path, results):
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(PROJECT_DIR)
+    start = time.perf_counter()
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.run()
+    first_render = time.perf_counter() - start
+
+    next(button for button in at.button if button.label == "Prediksi Churn").click().run()
+    first_prediction = time.perf_counter() - start
+    shown = any(sub.value == "Hasil Prediksi" for sub in at.subheader)
+    results.put((first_render, first_prediction, shown))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup app Streamlit")
+    parser.add_argument('--app', default=os.path.join(PROJECT_DIR, 'app.py'))
+    parser.add_argument('--model', default=None,
+                        help="Path model (di-set ke CHURN_MODEL_PATH), default: pencarian app")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.model:
+        os.environ['CHURN_MODEL_PATH'] = os.path.abspath(args.model)
+
+    app_path = os.path.abspath(args.app)
+    ctx = mp.get_context('spawn')
+    renders, predictions = [], []
+    for i in range(args.repeat):
+        results = ctx.Queue()
+        process = ctx.Process(target=_run, args=(app_path, results))
+        process.start()
+        first_render, first_prediction, shown = results.get()
+        process.join()
+        if not shown:
+            print("❌ Hasil prediksi tidak tampil (model tidak ditemukan?)")
+            sys.exit(1)
+        renders.append(first_render)
+        predictions.append(first_prediction)
+        print(f"   run {i + 1}: first render {first_render:.2f} s | first prediction {first_prediction:.2f} s")
+
+    print(f"\nTime-to-first-render     : median {np.median(renders):.2f} detik")
+    print(f"Time-to-first-prediction : median {np.median(predictions):.2f} detik")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Kurva scaling batch scoring paralel (batch_scoring.score_sharded) terhadap jumlah worker.
+
+Data CSV dan model referensi dibuat sintetis jika tidak diberikan. Baseline
+adalah score_csv satu proses (cara app.py).
+
+    python benchmarks/bench_batch_scaling.py --rows 1000000 --workers 1,2,4,8
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from batch_scoring import load_model_for_batch, score_csv, score_sharded  # noqa: E402
+from bench_data_loading import write_synthetic_csv  # noqa: E402
+from bench_inference import train_reference_model  # noqa: E402
+
+
+def default_worker_counts():
+    counts, n = [], 1
+    while n < (os.cpu_count() or 1):
+        counts.append(n)
+        n *= 2
+    return counts + [os.cpu_count() or 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scaling batch scoring multi-core")
+    parser.add_argument('--csv', default=None, help="CSV 19 kolom (default: data sintetis)")
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--model', default=None, help="best_churn_model.pkl atau folder artifact")
+    parser.add_argument('--workers', default=None, help="Contoh: 1,2,4,8 (default: pangkat 2 s/d jumlah core)")
+    parser.add_argument('--shard-mb', type=float, default=8)
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(',')] if args.workers else default_worker_counts()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(tmp, 'customers.csv')
+            print(f"Membuat CSV sintetis {args.rows:,} baris...")
+            write_synthetic_csv(csv_path, args.rows)
+        model_path = args.model
+        if model_path is None:
+            model_path = os.path.join(tmp, 'reference_model.pkl')
+            print("Melatih model referensi dari data sintetis...")
+            train_reference_model(model_path)
+
+        output = os.path.join(tmp, 'scored.csv')
+        baseline = score_csv(load_model_for_batch(model_path), csv_path, output)
+        print(f"\nCPU: {os.cpu_count()} core | baseline score_csv 1 proses: "
+              f"{baseline['rows_per_second']:,.0f} baris/detik\n")
+        print(f"{'worker':>6} | {'detik':>7} | {'baris/detik':>12} | {'speedup':>7} | {'efisiensi':>9}")
+        print("-" * 54)
+
+        single = None
+        for n_workers in worker_counts:
+            stats = score_sharded(csv_path, output, model_path, n_workers=n_workers, shard_mb=args.shard_mb)
+            shutil.rmtree(output + '.parts', ignore_errors=True)
+            single = single or stats['rows_per_second']
+            speedup = stats['rows_per_second'] / single
+            print(f"{n_workers:>6} | {stats['seconds']:>7.2f} | {stats['rows_per_second']:>12,.0f} | "
+                  f"{speedup:>6.2f}x | {speedup / n_workers:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
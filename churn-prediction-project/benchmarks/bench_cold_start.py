@@ -0,0 +1,105 @@
+"""
+Benchmark cold start dan memori per worker untuk tiga cara load model:
+
+- pickle      : joblib.load('best_churn_model.pkl') (cara lama di app.py)
+- joblib-mmap : pipeline.joblib dari artifact, joblib.load(mmap_mode='r')
+- artifact    : compiled scorer dari artifact, array di-mmap read-only
+
+Setiap format dijalankan dengan N proses worker sekaligus. Dilaporkan waktu
+import + load + prediksi pertama, RSS, dan PSS (bagian memori yang dibagi rata
+antar proses; hanya tersedia di Linux) per worker.
+
+    python model_artifact.py export best_churn_model.pkl model_artifact/
+    python benchmarks/bench_cold_start.py --model best_churn_model.pkl --artifact model_artifact/ --workers 4
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, PROJECT_DIR)
+
+EXAMPLE_CSV = os.path.join(PROJECT_DIR, 'notebooks', 'example_customer.csv')
+
+
+def memory_usage_mb():
+    """
+    (RSS, PSS) proses ini dalam MB. PSS None jika /proc tidak tersedia.
+    """
+    rss = pss = None
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Rss:'):
+                    rss = int(line.split()[1]) / 1024
+                elif line.startswith('Pss:'):
+                    pss = int(line.split()[1]) / 1024
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return rss, pss
+
+
+def _load(kind, model_path, artifact_path):
+    if kind == 'pickle':
+        import joblib
+        return joblib.load(model_path)
+    if kind == 'joblib-mmap':
+        from model_artifact import load_pipeline
+        return load_pipeline(artifact_path, mmap_mode='r')
+    from model_artifact import load_artifact
+    return load_artifact(artifact_path, mmap_mode='r')
+
+
+def worker(kind, model_path, artifact_path, loaded, measured, results):
+    start = time.perf_counter()
+    import pandas as pd
+    from scoring import predict_churn
+
+    model = _load(kind, model_path, artifact_path)
+    predict_churn(model, pd.read_csv(EXAMPLE_CSV))
+    cold_start = time.perf_counter() - start
+
+    # Ukur memori setelah SEMUA worker selesai load, supaya PSS mencerminkan sharing
+    loaded.wait()
+    rss, pss = memory_usage_mb()
+    measured.wait()
+    results.put((cold_start, rss, pss))
+
+
+def run(kind, n_workers, model_path, artifact_path):
+    ctx = mp.get_context('spawn')
+    loaded, measured = ctx.Barrier(n_workers), ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(kind, model_path, artifact_path, loaded, measured, results))
+                 for _ in range(n_workers)]
+    for p in processes:
+        p.start()
+    rows = [results.get() for _ in processes]
+    for p in processes:
+        p.join()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start & memori per worker")
+    parser.add_argument('--model', default='best_churn_model.pkl')
+    parser.add_argument('--artifact', default='model_artifact')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'format':>12} | {'cold start (s)':>14} | {'RSS/worker (MB)':>15} | {'PSS/worker (MB)':>15}")
+    print("-" * 66)
+    for kind in ['pickle', 'joblib-mmap', 'artifact']:
+        rows = run(kind, args.workers, args.model, args.artifact)
+        cold = sum(r[0] for r in rows) / len(rows)
+        rss = sum(r[1] for r in rows) / len(rows)
+        pss = [r[2] for r in rows if r[2] is not None]
+        pss_text = f"{sum(pss) / len(pss):>15.1f}" if pss else f"{'n/a':>15}"
+        print(f"{kind:>12} | {cold:>14.3f} | {rss:>15.1f} | {pss_text}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark loading data: CSV (cara notebook) vs Parquet bertipe (data_loader.py).
+
+Setiap cara dijalankan di proses baru supaya peak RSS tidak saling
+mempengaruhi. Jika --csv tidak diberikan, dibuat CSV sintetis dengan format
+dataset Telco (termasuk TotalCharges kosong untuk tenure 0).
+
+    python benchmarks/bench_data_loading.py --rows 1000000
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, PROJECT_DIR)
+
+from data_loader import LABEL_COLUMN, convert_csv_to_parquet  # noqa: E402
+from telco_features import FEATURE_COLUMNS  # noqa: E402
+
+
+def write_synthetic_csv(path, n_rows, seed=42):
+    from telco_features import generate_customers
+
+    X, y = generate_customers(n_rows, seed=seed, with_labels=True)
+    X.insert(0, 'customerID', [f'{i:07d}-SYNT' for i in range(n_rows)])
+    X['TotalCharges'] = X['TotalCharges'].astype(str).where(X['tenure'] > 0, ' ')
+    X[LABEL_COLUMN] = y.map({1: 'Yes', 0: 'No'})
+    X.to_csv(path, index=False)
+
+
+def _peak_rss_mb():
+    # VmHWM direset saat exec; ru_maxrss ikut membawa peak proses induk
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float('nan')
+
+
+def _run(method, csv_path, parquet_path, results):
+    import pandas as pd
+
+    import data_loader
+
+    start = time.perf_counter()
+    if method == 'csv (notebook)':
+        df = pd.read_csv(csv_path)
+        df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
+        frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    elif method == 'parquet':
+        df = data_loader.load_dataset(parquet_path)
+        frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    elif method == 'parquet (19 fitur + label)':
+        df = data_loader.load_dataset(parquet_path, columns=FEATURE_COLUMNS + [LABEL_COLUMN])
+        frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    else:
+        frame_mb = 0.0
+        for batch in data_loader.iter_batches(parquet_path, columns=FEATURE_COLUMNS):
+            frame_mb = max(frame_mb, batch.memory_usage(deep=True).sum() / 1e6)
+    results.put((time.perf_counter() - start, frame_mb, _peak_rss_mb()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading CSV vs Parquet")
+    parser.add_argument('--csv', default=None, help="CSV Telco (default: buat data sintetis)")
+    parser.add_argument('--rows', type=int, default=500_000, help="Jumlah baris data sintetis")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(tmp, 'telco_synthetic.csv')
+            print(f"Membuat CSV sintetis {args.rows:,} baris...")
+            write_synthetic_csv(csv_path, args.rows)
+        parquet_path = os.path.join(tmp, 'telco.parquet')
+
+        start = time.perf_counter()
+        convert_csv_to_parquet(csv_path, parquet_path)
+        print(f"Konversi sekali ke Parquet: {time.perf_counter() - start:.2f} detik "
+              f"(CSV {os.path.getsize(csv_path) / 1e6:.1f} MB -> Parquet {os.path.getsize(parquet_path) / 1e6:.1f} MB)\n")
+
+        ctx = mp.get_context('spawn')
+        print(f"{'cara load':>28} | {'waktu (s)':>9} | {'DataFrame (MB)':>14} | {'peak RSS (MB)':>13}")
+        print("-" * 74)
+        for method in ['csv (notebook)', 'parquet', 'parquet (19 fitur + label)', 'parquet streaming (batch)']:
+            results = ctx.Queue()
+            process = ctx.Process(target=_run, args=(method, csv_path, parquet_path, results))
+            process.start()
+            seconds, frame_mb, peak = results.get()
+            process.join()
+            print(f"{method:>28} | {seconds:>9.3f} | {frame_mb:>14.1f} | {peak:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark encoding one-hot: dense (notebook 03/04) vs sparse sampai ke classifier.
+
+Setiap varian dijalankan di proses baru (peak RSS terpisah). Yang diukur:
+waktu training, ukuran matriks hasil preprocessing, peak RSS, throughput
+batch scoring, dan apakah probabilitas kedua varian identik.
+
+    python benchmarks/bench_encoding.py --rows 50000
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, PROJECT_DIR)
+
+VARIANTS = ['dense', 'sparse']
+PARAMS = {'n_estimators': 200, 'max_depth': 20, 'min_samples_split': 2, 'min_samples_leaf': 2}
+
+
+def _peak_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float('nan')
+
+
+def _matrix_mb(matrix):
+    if hasattr(matrix, 'indptr'):
+        return (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 1e6
+    return matrix.nbytes / 1e6
+
+
+def _run(variant, n_rows, batch_size, n_jobs, min_seconds, results):
+    from scoring import predict_churn
+    from telco_features import generate_customers
+    from train import build_pipeline, build_preprocessor, split_feature_types
+
+    X, y = generate_customers(n_rows, seed=42, with_labels=True)
+    numeric_features, categorical_features = split_feature_types(X)
+    preprocessor = build_preprocessor(numeric_features, categorical_features, sparse=variant == 'sparse')
+    model = build_pipeline(preprocessor, PARAMS, n_jobs=n_jobs)
+
+    start = time.perf_counter()
+    model.fit(X, y)
+    fit_seconds = time.perf_counter() - start
+    matrix_mb = _matrix_mb(model[:-1].transform(X))
+
+    batch = generate_customers(batch_size, seed=7)
+    probabilities, _ = predict_churn(model, batch)  # warm-up + hasil untuk dibandingkan
+    n_calls, elapsed = 0, 0.0
+    while elapsed < min_seconds:
+        t = time.perf_counter()
+        predict_churn(model, batch)
+        elapsed += time.perf_counter() - t
+        n_calls += 1
+
+    results.put({
+        'fit_seconds': fit_seconds,
+        'matrix_mb': matrix_mb,
+        'peak_rss_mb': _peak_rss_mb(),
+        'rows_per_second': batch_size * n_calls / elapsed,
+        'probabilities': probabilities,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark one-hot dense vs sparse")
+    parser.add_argument('--rows', type=int, default=50_000, help="Jumlah baris training (sintetis)")
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--n-jobs', type=int, default=1, help="n_jobs Random Forest")
+    parser.add_argument('--min-seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    ctx = mp.get_context('spawn')
+    measured = {}
+    print(f"Training {args.rows:,} baris, {PARAMS['n_estimators']} pohon, n_jobs={args.n_jobs}\n")
+    print(f"{'varian':>8} | {'fit (s)':>8} | {'matriks (MB)':>12} | {'peak RSS (MB)':>13} | {'scoring (baris/s)':>17}")
+    print("-" * 72)
+    for variant in VARIANTS:
+        results = ctx.Queue()
+        process = ctx.Process(target=_run, args=(variant, args.rows, args.batch_size,
+                                                  args.n_jobs, args.min_seconds, results))
+        process.start()
+        measured[variant] = results.get()
+        process.join()
+        r = measured[variant]
+        print(f"{variant:>8} | {r['fit_seconds']:>8.2f} | {r['matrix_mb']:>12.1f} | "
+              f"{r['peak_rss_mb']:>13.1f} | {r['rows_per_second']:>17,.0f}")
+
+    diff = np.abs(measured['dense']['probabilities'] - measured['sparse']['probabilities']).max()
+    status = '✅' if diff == 0 else '❌'
+    print(f"\n{status} Selisih maksimum probabilitas dense vs sparse: {diff:.2e}")
+
+
+if __name__ == '__main__':
+    main()
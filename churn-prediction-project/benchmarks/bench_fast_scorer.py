@@ -0,0 +1,57 @@
+"""
+Benchmark: pipeline sklearn vs compiled fast scorer (fast_scorer.py).
+
+Mengukur latency rata-rata per panggilan `predict_proba` untuk beberapa
+ukuran batch, dan memastikan hasilnya identik bit-per-bit.
+
+    python benchmarks/bench_fast_scorer.py --model best_churn_model.pkl
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fast_scorer import CompiledPipeline  # noqa: E402
+from telco_features import generate_customers  # noqa: E402
+
+
+def time_call(fn, repeat):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sklearn pipeline vs compiled scorer")
+    parser.add_argument('--model', default='best_churn_model.pkl')
+    parser.add_argument('--batch-sizes', default='1,10,100,1000,10000')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    pipeline.steps[-1][1].set_params(n_jobs=1)
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+
+    print(f"{'batch':>7} | {'sklearn (ms)':>13} | {'compiled (ms)':>13} | {'speedup':>8} | identik")
+    print("-" * 62)
+    for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+        X = generate_customers(batch_size, seed=batch_size)
+        records = X.to_dict('records')
+        repeat = max(1, args.repeat if batch_size <= 1000 else args.repeat // 10)
+
+        sklearn_time = time_call(lambda: pipeline.predict_proba(X), repeat)
+        compiled_time = time_call(lambda: compiled.predict_proba(records), repeat)
+        identical = np.array_equal(pipeline.predict_proba(X), compiled.predict_proba(records))
+
+        print(f"{batch_size:>7} | {sklearn_time * 1e3:>13.3f} | {compiled_time * 1e3:>13.3f} | "
+              f"{sklearn_time / compiled_time:>7.1f}x | {'✅' if identical else '❌'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark inference yang reproducible, dengan baseline JSON dan regression gate.
+
+Data pelanggan dibuat sintetis dari kategori & rentang di telco_features.py,
+jadi benchmark bisa jalan offline tanpa dataset asli. Jika --model tidak
+diberikan (atau filenya tidak ada), model referensi dilatih dari data sintetis
+dengan parameter hasil tuning notebook 04.
+
+Yang diukur:
+- waktu load model
+- latency single-row (p50 / p95 / p99)
+- throughput batch (baris/detik) untuk beberapa ukuran batch
+- peak RSS proses (model referensi dilatih di proses terpisah, jadi tidak ikut terhitung)
+
+Contoh:
+    python benchmarks/bench_inference.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_inference.py --compare benchmarks/baseline.json --max-regression 10
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from model_artifact import is_artifact, load_artifact  # noqa: E402
+from scoring import predict_churn  # noqa: E402
+from telco_features import generate_customers  # noqa: E402
+
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000]
+REFERENCE_PARAMS = {'n_estimators': 200, 'max_depth': 20, 'min_samples_split': 2, 'min_samples_leaf': 2}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def train_reference_model(path, n_rows=7043, seed=42):
+    """
+    Latih pipeline referensi dari data sintetis dan simpan ke `path`
+    """
+    import joblib
+
+    from train import build_pipeline, build_preprocessor, split_feature_types
+
+    X, y = generate_customers(n_rows, seed=seed, with_labels=True)
+    numeric_features, categorical_features = split_feature_types(X)
+    model = build_pipeline(build_preprocessor(numeric_features, categorical_features), REFERENCE_PARAMS)
+    model.fit(X, y)
+    joblib.dump(model, path)
+
+
+def load_model(path):
+    if is_artifact(path):
+        return load_artifact(path, mmap_mode='r')
+    import joblib
+    return joblib.load(path)
+
+
+def run_benchmark(model_path, batch_sizes=DEFAULT_BATCH_SIZES, n_single=500, min_seconds=1.0, seed=42):
+    start = time.perf_counter()
+    model = load_model(model_path)
+    load_seconds = time.perf_counter() - start
+
+    # Single row: setiap panggilan memakai pelanggan berbeda
+    rows = generate_customers(n_single, seed=seed)
+    predict_churn(model, rows.iloc[:1])  # warm-up
+    latencies = []
+    for i in range(n_single):
+        row = rows.iloc[i:i + 1]
+        t = time.perf_counter()
+        predict_churn(model, row)
+        latencies.append(time.perf_counter() - t)
+    latencies_ms = np.array(latencies) * 1e3
+
+    throughput = {}
+    for batch_size in batch_sizes:
+        batch = generate_customers(batch_size, seed=seed + batch_size)
+        predict_churn(model, batch)  # warm-up
+        n_calls, elapsed = 0, 0.0
+        while elapsed < min_seconds:
+            t = time.perf_counter()
+            predict_churn(model, batch)
+            elapsed += time.perf_counter() - t
+            n_calls += 1
+        throughput[str(batch_size)] = batch_size * n_calls / elapsed
+
+    return {
+        'meta': {
+            'model': os.path.basename(os.path.normpath(model_path)),
+            'model_type': type(model).__name__,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+        },
+        'load_seconds': load_seconds,
+        'single_row_ms': {
+            'p50': float(np.percentile(latencies_ms, 50)),
+            'p95': float(np.percentile(latencies_ms, 95)),
+            'p99': float(np.percentile(latencies_ms, 99)),
+        },
+        'throughput_rows_per_second': throughput,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def compare(results, baseline, max_regression_pct):
+    """
+    Return list pesan regresi: throughput turun lebih dari max_regression_pct persen
+    """
+    failures = []
+    for batch_size, base_value in baseline['throughput_rows_per_second'].items():
+        value = results['throughput_rows_per_second'].get(batch_size)
+        if value is None:
+            continue
+        change = (value - base_value) / base_value * 100
+        status = '❌' if change < -max_regression_pct else '✅'
+        print(f"   {status} batch {batch_size:>6}: {base_value:>12,.0f} -> {value:>12,.0f} baris/detik ({change:+.1f}%)")
+        if change < -max_regression_pct:
+            failures.append(f"throughput batch {batch_size} turun {-change:.1f}%")
+
+    for key, base_value in baseline['single_row_ms'].items():
+        value = results['single_row_ms'][key]
+        print(f"      single-row {key}: {base_value:.3f} -> {value:.3f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference model churn")
+    parser.add_argument('--model', default=None, help="best_churn_model.pkl atau folder artifact")
+    parser.add_argument('--batch-sizes', default=','.join(str(b) for b in DEFAULT_BATCH_SIZES))
+    parser.add_argument('--n-single', type=int, default=500)
+    parser.add_argument('--min-seconds', type=float, default=1.0, help="Durasi minimum per ukuran batch")
+    parser.add_argument('--output', default=None, help="Simpan hasil ke file JSON")
+    parser.add_argument('--save-baseline', default=None, help="Simpan hasil sebagai baseline")
+    parser.add_argument('--compare', default=None, help="Bandingkan dengan baseline JSON")
+    parser.add_argument('--max-regression', type=float, default=10.0,
+                        help="Gagal jika throughput turun lebih dari persen ini")
+    args = parser.parse_args()
+
+    model_path = args.model
+    tmp_dir = None
+    if model_path is None or not os.path.exists(model_path):
+        tmp_dir = tempfile.TemporaryDirectory()
+        model_path = os.path.join(tmp_dir.name, 'reference_model.pkl')
+        print("Model tidak diberikan, melatih model referensi dari data sintetis...")
+        # Proses terpisah: memori training tidak ikut peak RSS (ru_maxrss) proses benchmark
+        process = mp.get_context('spawn').Process(target=train_reference_model, args=(model_path,))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("❌ Training model referensi gagal")
+            sys.exit(1)
+
+    # Baseline dibaca sebelum hasil disimpan: --save-baseline X --compare X membandingkan dengan isi lama X
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+    results = run_benchmark(model_path, batch_sizes, n_single=args.n_single, min_seconds=args.min_seconds)
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+    print(f"\nLoad model      : {results['load_seconds']:.3f} detik")
+    latency = results['single_row_ms']
+    print(f"Single-row (ms) : p50 {latency['p50']:.3f} | p95 {latency['p95']:.3f} | p99 {latency['p99']:.3f}")
+    for batch_size, value in results['throughput_rows_per_second'].items():
+        print(f"Batch {batch_size:>6}    : {value:>12,.0f} baris/detik")
+    if results['peak_rss_mb'] is not None:
+        print(f"Peak RSS        : {results['peak_rss_mb']:.1f} MB")
+
+    for path in [args.output, args.save_baseline]:
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=4)
+            print(f"✓ Hasil disimpan ke {path}")
+
+    if baseline is not None:
+        print(f"\nPerbandingan dengan baseline {args.compare} (batas regresi {args.max_regression}%):")
+        failures = compare(results, baseline, args.max_regression)
+        if failures:
+            print("\n❌ Regresi performa: " + "; ".join(failures))
+            sys.exit(1)
+        print("\n✅ Tidak ada regresi throughput")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+Compaction model hasil tuning (notebook 04 / train.py) untuk inference lebih cepat.
+
+Random Forest hasil tuning bisa berisi 200 pohon tanpa batas kedalaman;
+biaya inference dan ukuran artifact sebanding dengan jumlah node. Kandidat
+yang dicoba:
+
+1. Subset pohon: k pohon pertama dari forest yang sama (tanpa training ulang)
+2. Batas kedalaman: forest dilatih ulang dengan parameter terbaik + max_depth kecil,
+   masing-masing juga dengan subset pohon
+3. Logistic Regression dengan preprocessor yang sama (tanpa node sama sekali)
+
+Semua kandidat dievaluasi di test set yang sama dengan notebook 04 (split 80/20,
+random_state=42, stratify). Model terkecil (jumlah node, lalu ukuran file) yang
+accuracy, F1 dan recall-nya tidak turun lebih dari `--tolerance` dibanding
+`best_model_info.json` diekspor.
+
+    python compact_model.py --model notebooks/best_churn_model.pkl \\
+        --info notebooks/best_model_info.json --data ../data/telco_customer_churn.csv \\
+        --tolerance 0.01 --output-dir notebooks
+"""
+import argparse
+import copy
+import io
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from scoring import predict_churn
+from train import (DEFAULT_DATA_PATH, PARAM_GRID, RANDOM_STATE, build_pipeline, build_preprocessor,
+                   evaluate, load_training_data, split_feature_types)
+
+DEFAULT_TOLERANCE = 0.01
+GUARDED_METRICS = ['accuracy', 'f1_score', 'recall']
+DEFAULT_TREE_COUNTS = [10, 25, 50, 100]
+DEFAULT_DEPTHS = [6, 8, 10, 12, 15]
+
+
+# ==================== KANDIDAT ====================
+def forest_of(model):
+    """
+    Classifier forest dari pipeline, atau None jika bukan forest
+    """
+    classifier = model.steps[-1][1]
+    return classifier if hasattr(classifier, 'estimators_') else None
+
+
+def count_nodes(model):
+    forest = forest_of(model)
+    if forest is None:
+        return 0
+    return int(sum(tree.tree_.node_count for tree in forest.estimators_))
+
+
+def subset_trees(model, n_trees):
+    """
+    Pipeline baru dengan n_trees pohon pertama (pohon dibagi, tidak disalin)
+    """
+    forest = copy.copy(forest_of(model))
+    forest.estimators_ = forest.estimators_[:n_trees]
+    forest.n_estimators = n_trees
+    return Pipeline(model.steps[:-1] + [(model.steps[-1][0], forest)])
+
+
+def best_params_of(model, info):
+    """
+    Parameter tuning dari best_model_info.json (train.py), atau dari classifier
+    """
+    if info and info.get('best_params'):
+        return dict(info['best_params'])
+    params = forest_of(model).get_params()
+    return {name: params[name] for name in PARAM_GRID}
+
+
+def generate_candidates(model, X_train, y_train, params, depths=DEFAULT_DEPTHS,
+                        tree_counts=DEFAULT_TREE_COUNTS):
+    """
+    Yield (nama, pipeline) untuk semua kandidat compaction
+    """
+    n_trees = len(forest_of(model).estimators_)
+    tree_counts = [k for k in tree_counts if k < n_trees]
+    numeric_features, categorical_features = split_feature_types(X_train)
+
+    yield 'original', model
+    for k in tree_counts:
+        yield f'{k} pohon', subset_trees(model, k)
+
+    deepest = max(tree.tree_.max_depth for tree in forest_of(model).estimators_)
+    for depth in [d for d in depths if d < deepest]:
+        refit = build_pipeline(build_preprocessor(numeric_features, categorical_features),
+                               {**params, 'max_depth': depth})
+        refit.fit(X_train, y_train)
+        yield f'depth {depth}, {n_trees} pohon', refit
+        for k in tree_counts:
+            yield f'depth {depth}, {k} pohon', subset_trees(refit, k)
+
+    logistic = Pipeline([
+        ('preprocessor', build_preprocessor(numeric_features, categorical_features)),
+        ('classifier', LogisticRegression(max_iter=1000))
+    ])
+    logistic.fit(X_train, y_train)
+    yield 'logistic regression', logistic
+
+
+# ==================== PENGUKURAN ====================
+def serialized_size(model):
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer, compress=0)
+    return buffer.getbuffer().nbytes
+
+
+def single_row_latency_ms(model, X, n_calls=200):
+    """
+    Median latency predict satu baris (n_jobs=1, seperti di service.py)
+    """
+    forest = forest_of(model)
+    if forest is not None:
+        model = subset_trees(model, len(forest.estimators_))
+        model.steps[-1][1].n_jobs = 1
+    predict_churn(model, X.iloc[:1])  # warm-up
+    latencies = []
+    for i in range(n_calls):
+        row = X.iloc[i % len(X):i % len(X) + 1]
+        start = time.perf_counter()
+        predict_churn(model, row)
+        latencies.append(time.perf_counter() - start)
+    return float(np.median(latencies) * 1e3)
+
+
+def measure(name, model, X_test, y_test, n_latency_calls=200):
+    return {
+        'name': name,
+        'metrics': evaluate(model, X_test, y_test),
+        'n_nodes': count_nodes(model),
+        'size_mb': serialized_size(model) / 1e6,
+        'latency_ms': single_row_latency_ms(model, X_test, n_latency_calls),
+    }
+
+
+def within_tolerance(metrics, reference, tolerance, keys=GUARDED_METRICS):
+    return all(metrics[key] >= reference[key] - tolerance for key in keys)
+
+
+def select_smallest(results, reference, tolerance):
+    """
+    Hasil terkecil (node, lalu ukuran file) yang masih dalam toleransi, atau None
+    """
+    eligible = [r for r in results if within_tolerance(r['metrics'], reference, tolerance)]
+    if not eligible:
+        return None
+    return min(eligible, key=lambda r: (r['n_nodes'], r['size_mb']))
+
+
+# ==================== MAIN ====================
+def main():
+    parser = argparse.ArgumentParser(description="Compaction model churn hasil tuning")
+    parser.add_argument('--model', default='notebooks/best_churn_model.pkl')
+    parser.add_argument('--info', default='notebooks/best_model_info.json',
+                        help="Metrics referensi (jika tidak ada: metrics model asli di test set)")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help="CSV atau Parquet (lihat data_loader.py)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Penurunan maksimum accuracy/F1/recall (absolut)")
+    parser.add_argument('--output-dir', default='notebooks')
+    parser.add_argument('--artifact', default=None, help="Juga export model terpilih sebagai artifact mmap")
+    parser.add_argument('--latency-calls', type=int, default=200)
+    args = parser.parse_args()
+
+    print("1. Loading model & dataset...")
+    model = joblib.load(args.model)
+    if forest_of(model) is None:
+        raise SystemExit("❌ Model harus Pipeline dengan classifier forest")
+    info = None
+    if os.path.exists(args.info):
+        with open(args.info) as f:
+            info = json.load(f)
+    X, y = load_training_data(args.data)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=RANDOM_STATE, stratify=y
+    )
+
+    print("\n2. Evaluasi kandidat compaction...")
+    params = best_params_of(model, info)
+    results = []
+    models = {}
+    header = f"{'kandidat':>26} | {'acc':>6} | {'f1':>6} | {'recall':>6} | {'node':>9} | {'MB':>7} | {'ms/baris':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, candidate in generate_candidates(model, X_train, y_train, params):
+        result = measure(name, candidate, X_test, y_test, args.latency_calls)
+        results.append(result)
+        models[name] = candidate
+        m = result['metrics']
+        print(f"{name:>26} | {m['accuracy']:>6.4f} | {m['f1_score']:>6.4f} | {m['recall']:>6.4f} | "
+              f"{result['n_nodes']:>9,} | {result['size_mb']:>7.2f} | {result['latency_ms']:>8.2f}")
+
+    reference = info['metrics'] if info else results[0]['metrics']
+    source = args.info if info else "model asli di test set"
+    print(f"\n3. Referensi ({source}): " + ", ".join(f"{k} {reference[k]:.4f}" for k in GUARDED_METRICS))
+    chosen = select_smallest(results, reference, args.tolerance)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    report = {'tolerance': args.tolerance, 'reference': reference, 'params': params,
+              'chosen': chosen['name'] if chosen else None, 'candidates': results}
+    with open(os.path.join(args.output_dir, 'compaction_report.json'), 'w') as f:
+        json.dump(report, f, indent=4)
+
+    if chosen is None:
+        print(f"❌ Tidak ada kandidat dalam toleransi {args.tolerance}")
+        return
+
+    original = results[0]
+    print(f"✅ Terpilih: {chosen['name']} — node {original['n_nodes']:,} -> {chosen['n_nodes']:,}, "
+          f"ukuran {original['size_mb']:.2f} -> {chosen['size_mb']:.2f} MB, "
+          f"latency {original['latency_ms']:.2f} -> {chosen['latency_ms']:.2f} ms")
+
+    compact = models[chosen['name']]
+    joblib.dump(compact, os.path.join(args.output_dir, 'compact_churn_model.pkl'))
+    compact_info = {
+        'best_model': f"Compact model ({chosen['name']})",
+        'metrics': chosen['metrics'],
+        'description': f"Compaction dari {os.path.basename(args.model)} (toleransi {args.tolerance})",
+        'features_used': X.shape[1],
+        'dataset_size': f"{X.shape[0]} samples",
+        'n_nodes': chosen['n_nodes'],
+    }
+    with open(os.path.join(args.output_dir, 'compact_model_info.json'), 'w') as f:
+        json.dump(compact_info, f, indent=4)
+    print(f"✓ Model disimpan di {os.path.join(args.output_dir, 'compact_churn_model.pkl')}")
+
+    if args.artifact:
+        if forest_of(compact) is None:
+            print("⚠️ Artifact mmap hanya untuk forest, dilewati")
+        else:
+            from model_artifact import save_artifact
+            save_artifact(compact, args.artifact)
+            print(f"✓ Artifact disimpan di {args.artifact}")
+
+
+if __name__ == '__main__':
+    main()
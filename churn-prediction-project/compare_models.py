@@ -0,0 +1,212 @@
+"""
+Perbandingan model notebook 02 (direct) dan 03 (preprocessed) dalam satu script.
+
+Di notebook, Logistic Regression, Random Forest, dan Voting Classifier
+(LR + KNN + SVC(probability=True)) di-fit berurutan, lalu hasilnya disalin
+manual ke `model_comparison_results.csv`. Di sini:
+
+1. Split 80/20 (random_state=42, stratify) sama dengan notebook
+2. Fitur disiapkan SEKALI per varian, hanya dari data train:
+   - Direct       : label encoding kategori + median TotalCharges (notebook 02)
+   - Preprocessed : ColumnTransformer dari train.py (notebook 03), di-fit sekali
+3. Semua kandidat di-fit paralel di process pool (Voting/SVC yang paling
+   lama dijalankan lebih dulu)
+4. Estimator hasil fit di-cache ke disk dengan key hash(data, parameter,
+   versi sklearn): run berikutnya hanya mengevaluasi model yang tidak berubah
+5. Metrics + waktu fit ditulis otomatis ke CSV; baris lain di file itu
+   (mis. hasil tuning notebook 04) dipertahankan
+
+    python compare_models.py --data ../data/telco_customer_churn.csv \\
+        --output notebooks/model_comparison_results.csv --cache-dir .model_cache
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.svm import SVC
+
+from train import (DEFAULT_DATA_PATH, RANDOM_STATE, build_preprocessor, evaluate, load_training_data,
+                   split_feature_types)
+
+DEFAULT_OUTPUT = 'notebooks/model_comparison_results.csv'
+DEFAULT_CACHE_DIR = '.model_cache'
+# Nama kolom sama dengan model_comparison_results.csv yang sudah ada
+CSV_COLUMNS = {'accuracy': 'Accuracy', 'precision': 'Precision', 'recall': 'Recall', 'f1_score': 'F1-Score'}
+
+
+# ==================== FITUR ====================
+def direct_features(X_train, X_test):
+    """
+    Notebook 02: kategori -> kode label (urut alfabet), TotalCharges kosong -> median (dari train)
+    """
+    _, categorical = split_feature_types(X_train)
+    encoded = []
+    for X in (X_train, X_test):
+        X = X.copy()
+        for col in categorical:
+            categories = np.sort(X_train[col].dropna().astype(str).unique())
+            X[col] = pd.Index(categories).get_indexer(X[col].astype(str))
+        X['TotalCharges'] = X['TotalCharges'].fillna(X_train['TotalCharges'].median())
+        encoded.append(X.to_numpy(dtype=np.float64))
+    return encoded
+
+
+def preprocessed_features(X_train, X_test):
+    """
+    Notebook 03: ColumnTransformer (impute + scale + one-hot) di-fit sekali di train
+    """
+    preprocessor = build_preprocessor(*split_feature_types(X_train))
+    return preprocessor.fit_transform(X_train), preprocessor.transform(X_test)
+
+
+def build_candidates():
+    """
+    [(nama, feature_set, estimator)] — parameter sama dengan notebook 02/03.
+
+    SVC diberi random_state agar kalibrasi probabilitasnya deterministik (bisa di-cache).
+    """
+    candidates = []
+    for feature_set, max_iter in [('Direct', 5000), ('Preprocessed', 1000)]:
+        candidates += [
+            ('Voting Classifier', feature_set, VotingClassifier(
+                estimators=[
+                    ('lr', LogisticRegression(max_iter=max_iter)),
+                    ('knn', KNeighborsClassifier()),
+                    ('svm', SVC(probability=True, random_state=RANDOM_STATE)),
+                ],
+                voting='soft',
+            )),
+            ('Random Forest', feature_set, RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=1)),
+            ('Logistic Regression', feature_set, LogisticRegression(max_iter=max_iter, random_state=RANDOM_STATE)),
+        ]
+    return candidates
+
+
+def cache_key(estimator, X_train, y_train):
+    """
+    Hash data train + parameter estimator + versi sklearn
+    """
+    params = sorted((name, repr(value)) for name, value in estimator.get_params(deep=True).items())
+    return joblib.hash((X_train, y_train, type(estimator).__name__, params, sklearn.__version__))
+
+
+# ==================== WORKER PROCESS ====================
+_DATASETS = None
+
+
+def _init_worker(datasets):
+    global _DATASETS
+    _DATASETS = datasets
+
+
+def _fit_candidate(name, feature_set, estimator, cache_path):
+    """
+    Fit (atau load dari cache) satu kandidat, return metrics + waktu fit
+    """
+    X_train, y_train, X_test, y_test = _DATASETS[feature_set]
+    cached = os.path.exists(cache_path)
+    if cached:
+        estimator, fit_seconds = joblib.load(cache_path)
+    else:
+        start = time.perf_counter()
+        estimator.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        joblib.dump((estimator, fit_seconds), cache_path + '.tmp')
+        os.replace(cache_path + '.tmp', cache_path)
+    return {
+        'name': f'{name} ({feature_set})',
+        'metrics': evaluate(estimator, X_test, y_test),
+        'fit_seconds': fit_seconds,
+        'cached': cached,
+    }
+
+
+# ==================== HARNESS ====================
+def compare_models(X, y, candidates=None, cache_dir=DEFAULT_CACHE_DIR, n_workers=None, verbose=True):
+    """
+    Fit & evaluasi semua kandidat paralel. Return list hasil urut sesuai kandidat.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=RANDOM_STATE, stratify=y
+    )
+    y_train, y_test = y_train.to_numpy(), y_test.to_numpy()
+    datasets = {}
+    for feature_set, prepare in [('Direct', direct_features), ('Preprocessed', preprocessed_features)]:
+        train_features, test_features = prepare(X_train, X_test)
+        datasets[feature_set] = (train_features, y_train, test_features, y_test)
+
+    candidates = candidates if candidates is not None else build_candidates()
+    os.makedirs(cache_dir, exist_ok=True)
+    results = {}
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(datasets,)) as pool:
+        futures = {}
+        for i, (name, feature_set, estimator) in enumerate(candidates):
+            key = cache_key(estimator, datasets[feature_set][0], y_train)
+            cache_path = os.path.join(cache_dir, f"{name.lower().replace(' ', '_')}-{key}.joblib")
+            futures[pool.submit(_fit_candidate, name, feature_set, estimator, cache_path)] = i
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if verbose:
+                m = result['metrics']
+                source = 'cache' if result['cached'] else f"{result['fit_seconds']:.1f} detik"
+                print(f"   ✓ {result['name']:<36} F1 {m['f1_score']:.4f} ({source})")
+    return [results[i] for i in range(len(candidates))]
+
+
+def write_results(results, path):
+    """
+    Tulis/update CSV perbandingan: baris model yang sama diganti, baris lain dipertahankan
+    """
+    rows = pd.DataFrame([
+        {'Model': r['name'], **{CSV_COLUMNS[k]: round(r['metrics'][k], 4) for k in CSV_COLUMNS},
+         'Fit Seconds': round(r['fit_seconds'], 2), 'Cached': r['cached']}
+        for r in results
+    ])
+    if os.path.exists(path):
+        existing = pd.read_csv(path)
+        kept = existing[~existing['Model'].isin(rows['Model'])]
+        # Baris hasil script di urutan awal, baris lain (mis. Tuned) setelahnya seperti file asli
+        rows = pd.concat([rows, kept], ignore_index=True)
+    rows.to_csv(path, index=False)
+    return rows
+
+
+# ==================== MAIN ====================
+def main():
+    parser = argparse.ArgumentParser(description="Perbandingan model notebook 02/03 secara paralel")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help="CSV atau Parquet (lihat data_loader.py)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Cache estimator hasil fit")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: semua core)")
+    args = parser.parse_args()
+
+    print("1. Loading dataset...")
+    X, y = load_training_data(args.data)
+
+    print(f"\n2. Fit {len(build_candidates())} kandidat ({args.workers or os.cpu_count()} worker)...")
+    start = time.perf_counter()
+    results = compare_models(X, y, cache_dir=args.cache_dir, n_workers=args.workers)
+    elapsed = time.perf_counter() - start
+    fitted = [r for r in results if not r['cached']]
+    print(f"   Wall time {elapsed:.1f} detik | total waktu fit {sum(r['fit_seconds'] for r in fitted):.1f} detik "
+          f"| {len(results) - len(fitted)} dari cache")
+
+    table = write_results(results, args.output)
+    print(f"\n3. Hasil ({args.output}):")
+    print(table.to_string(index=False))
+    best = max(results, key=lambda r: r['metrics']['f1_score'])
+    print(f"\n✅ F1 terbaik: {best['name']} ({best['metrics']['f1_score']:.4f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Loading data Telco: konversi sekali dari CSV ke Parquet bertipe, lalu baca kolumnar.
+
+Semua notebook membaca `../data/telco_customer_churn.csv` lalu mengulang
+pembersihan yang sama (`TotalCharges` -> numerik). Di sini pembersihan itu
+dilakukan SEKALI saat konversi:
+
+- kolom kategorikal disimpan sebagai dictionary (pandas: dtype `category`)
+- `SeniorCitizen` Int8, `tenure` Int16 (nullable), charges float64 (nilai identik dengan CSV)
+- `TotalCharges` kosong (' ') jadi null, `Churn` jadi label 0/1 (int8)
+
+Training dan batch scoring bisa membaca hanya kolom yang dibutuhkan
+(column projection) dan per row group (streaming).
+
+    python data_loader.py ../data/telco_customer_churn.csv ../data/telco_customer_churn.parquet
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from telco_features import CATEGORY_VALUES
+
+DEFAULT_CSV_PATH = '../data/telco_customer_churn.csv'
+DEFAULT_PARQUET_PATH = '../data/telco_customer_churn.parquet'
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+CATEGORICAL_COLUMNS = list(CATEGORY_VALUES)
+INTEGER_COLUMNS = {'SeniorCitizen': 'Int8', 'tenure': 'Int16'}
+FLOAT_COLUMNS = ['MonthlyCharges', 'TotalCharges']
+LABEL_COLUMN = 'Churn'
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("pyarrow dibutuhkan untuk format Parquet: pip install pyarrow") from e
+
+
+def is_parquet(source):
+    """
+    True jika source (path atau file upload dengan atribut `name`) adalah Parquet
+    """
+    name = source if isinstance(source, str) else getattr(source, 'name', '')
+    return isinstance(name, str) and name.endswith(('.parquet', '.pq'))
+
+
+def _to_integer(values, dtype):
+    """
+    Kolom integer nullable; nilai kosong / non-numerik jadi NA (dikarantina schema.py),
+    bukan membuat seluruh chunk gagal. Pecahan / di luar jangkauan dtype tetap float64.
+    """
+    numbers = pd.to_numeric(values, errors='coerce')
+    present = numbers.dropna()
+    info = np.iinfo(dtype.lower())
+    if ((present % 1 == 0) & (present >= info.min) & (present <= info.max)).all():
+        return numbers.astype(dtype)
+    return numbers.astype('float64')
+
+
+def clean_frame(df):
+    """
+    Pembersihan yang dulu diulang di setiap notebook, plus dtype yang ringkas
+    """
+    df = df.copy()
+    if 'TotalCharges' in df.columns:
+        df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('float64')
+    for col, dtype in INTEGER_COLUMNS.items():
+        if col in df.columns:
+            df[col] = _to_integer(df[col], dtype)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if LABEL_COLUMN in df.columns and not pd.api.types.is_numeric_dtype(df[LABEL_COLUMN]):
+        df[LABEL_COLUMN] = df[LABEL_COLUMN].map({'Yes': 1, 'No': 0}).astype('int8')
+    return df
+
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+
+    fields = []
+    for col in columns:
+        if col in CATEGORICAL_COLUMNS:
+            fields.append(pa.field(col, pa.dictionary(pa.int8(), pa.string())))
+        elif col in INTEGER_COLUMNS:
+            fields.append(pa.field(col, pa.from_numpy_dtype(np.dtype(INTEGER_COLUMNS[col].lower()))))
+        elif col in FLOAT_COLUMNS:
+            fields.append(pa.field(col, pa.float64()))
+        elif col == LABEL_COLUMN:
+            fields.append(pa.field(col, pa.int8()))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    return pa.schema(fields)
+
+
+def convert_csv_to_parquet(csv_path=DEFAULT_CSV_PATH, parquet_path=DEFAULT_PARQUET_PATH,
+                           row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Konversi CSV ke Parquet per chunk (memori tetap sebesar satu row group).
+    Return jumlah baris yang ditulis.
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=row_group_size):
+            chunk = clean_frame(chunk)
+            if writer is None:
+                schema = _arrow_schema(chunk.columns)
+                writer = pq.ParquetWriter(parquet_path, schema)
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            writer.write_table(table, row_group_size=row_group_size)
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
+
+
+def load_dataset(path=DEFAULT_CSV_PATH, columns=None):
+    """
+    Load dataset yang sudah bersih. Parquet: hanya `columns` yang dibaca dari disk.
+    """
+    if is_parquet(path):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    df = pd.read_csv(path, usecols=columns)
+    return clean_frame(df)
+
+
+def iter_batches(path, columns=None, batch_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Yield DataFrame per batch; Parquet dibaca per row group dengan column projection
+    """
+    if is_parquet(path):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    for chunk in pd.read_csv(path, chunksize=batch_size, usecols=columns):
+        yield clean_frame(chunk)
+
+
+def available_columns(path):
+    """
+    Daftar kolom di file tanpa membaca isinya
+    """
+    if is_parquet(path):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Konversi dataset Telco CSV ke Parquet")
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV_PATH)
+    parser.add_argument('parquet', nargs='?', default=DEFAULT_PARQUET_PATH)
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args()
+
+    rows = convert_csv_to_parquet(args.csv, args.parquet, args.row_group_size)
+    print(f"✓ {rows:,} baris dikonversi ke {args.parquet}")
@@ -0,0 +1,371 @@
+"""
+Monitor drift fitur dan distribusi skor dengan memori konstan.
+
+Baseline (`drift_baseline.json`) diambil saat training (train.py) dari data
+training 7043 baris:
+
+- numerik (tenure, MonthlyCharges, TotalCharges): batas bin dari kuantil
+  data training + bucket terpisah untuk nilai kosong (NaN)
+- kategorikal (16 kolom lain): frekuensi per kategori + bucket `other`
+  untuk kategori yang tidak dikenal
+- probabilitas churn: 20 bin tetap di [0, 1], dari prediksi model di test set
+
+`DriftMonitor` hanya menyimpan hitungan per bin (array kecil, ukurannya
+tetap berapa pun jumlah baris yang masuk). Update per batch = satu
+`searchsorted` + `bincount` per kolom, jadi murah dipanggil di setiap jalur
+scoring (app.py, batch_scoring.py, service.py). Drift dihitung terhadap
+baseline:
+
+- PSI (Population Stability Index): < 0.1 stabil, 0.1-0.25 waspada, > 0.25 drift
+  (status baru dinilai setelah minimal MIN_ROWS baris)
+- KS: selisih maksimum CDF per bin (hanya numerik & skor)
+
+Baseline untuk model yang sudah ada (tanpa training ulang):
+    python drift_monitor.py baseline --data ../data/telco_customer_churn.csv \\
+        --model notebooks/best_churn_model.pkl --output notebooks/drift_baseline.json
+
+Laporan drift satu file input:
+    python drift_monitor.py report pelanggan.csv --baseline notebooks/drift_baseline.json
+"""
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+BASELINE_PATH_ENV = 'CHURN_DRIFT_BASELINE'
+BASELINE_PATHS = [
+    'drift_baseline.json',
+    'notebooks/drift_baseline.json',
+]
+MONITORED_NUMERIC = ['tenure', 'MonthlyCharges', 'TotalCharges']
+SCORE_COLUMN = 'churn_probability'
+DEFAULT_NUMERIC_BINS = 20
+DEFAULT_SCORE_BINS = 20
+PSI_WARNING = 0.1
+PSI_DRIFT = 0.25
+MIN_ROWS = 100  # di bawah ini PSI belum bermakna, status = 'data kurang'
+_PSI_EPSILON = 1e-4
+
+
+# ==================== BASELINE ====================
+def _quantile_edges(values, n_bins):
+    """
+    Batas dalam bin dari kuantil (unik; kolom diskrit seperti tenure bisa punya bin lebih sedikit)
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return []
+    quantiles = np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])
+    return [float(q) for q in np.unique(quantiles)]
+
+
+def build_baseline(X, probabilities=None, numeric_columns=MONITORED_NUMERIC,
+                   n_bins=DEFAULT_NUMERIC_BINS, score_bins=DEFAULT_SCORE_BINS):
+    """
+    Baseline dari data training (19 kolom) dan probabilitas churn (opsional)
+    """
+    baseline = baseline_bins(X, numeric_columns, n_bins, score_bins)
+    # Hitungan baseline dihitung dengan kode yang sama dengan monitor produksi
+    monitor = DriftMonitor(baseline)
+    monitor.update(X, probabilities)
+    return fill_baseline_counts(baseline, monitor, with_scores=probabilities is not None)
+
+
+def baseline_bins(X, numeric_columns=MONITORED_NUMERIC, n_bins=DEFAULT_NUMERIC_BINS,
+                  score_bins=DEFAULT_SCORE_BINS):
+    """
+    Batas bin & daftar kategori saja (tanpa hitungan), mis. dari sampel data yang besar
+    """
+    numeric = {}
+    categorical = {}
+    for col in X.columns:
+        if col in numeric_columns:
+            values = pd.to_numeric(X[col], errors='coerce').to_numpy(dtype=np.float64)
+            numeric[col] = {'edges': _quantile_edges(values, n_bins)}
+        else:
+            counts = X[col].value_counts(dropna=True)
+            categorical[col] = {'categories': [_to_native(v) for v in counts.index]}
+    return {
+        'numeric': numeric,
+        'categorical': categorical,
+        'score': {'edges': [float(e) for e in np.linspace(0, 1, score_bins + 1)[1:-1]]},
+        'rows': int(len(X)),
+    }
+
+
+def fill_baseline_counts(baseline, monitor, with_scores=True):
+    """
+    Isi hitungan baseline dari `DriftMonitor` yang sudah di-update dengan data training
+    """
+    state = monitor.state()
+    for section in ('numeric', 'categorical'):
+        for col in baseline[section]:
+            baseline[section][col]['counts'] = state[section][col]
+    baseline['score']['counts'] = state['score'] if with_scores else None
+    baseline['rows'] = state['rows']
+    return baseline
+
+
+def _to_native(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+def save_baseline(baseline, path):
+    with open(path, 'w') as f:
+        json.dump(baseline, f)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def find_baseline_path():
+    """
+    Path dari env CHURN_DRIFT_BASELINE atau BASELINE_PATHS, atau None
+    """
+    env_path = os.environ.get(BASELINE_PATH_ENV)
+    for path in ([env_path] if env_path else []) + BASELINE_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# ==================== METRIK ====================
+def psi(expected_counts, actual_counts):
+    """
+    Population Stability Index antara dua histogram dengan bin yang sama
+    """
+    expected = np.asarray(expected_counts, dtype=np.float64)
+    actual = np.asarray(actual_counts, dtype=np.float64)
+    if expected.sum() == 0 or actual.sum() == 0:
+        return None
+    p = np.clip(expected / expected.sum(), _PSI_EPSILON, None)
+    q = np.clip(actual / actual.sum(), _PSI_EPSILON, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks_statistic(expected_counts, actual_counts):
+    """
+    Statistik KS dari histogram ber-urutan (resolusi = lebar bin)
+    """
+    expected = np.asarray(expected_counts, dtype=np.float64)
+    actual = np.asarray(actual_counts, dtype=np.float64)
+    if expected.sum() == 0 or actual.sum() == 0:
+        return None
+    return float(np.max(np.abs(np.cumsum(expected) / expected.sum() - np.cumsum(actual) / actual.sum())))
+
+
+def drift_status(value, rows=MIN_ROWS):
+    if value is None:
+        return 'n/a'
+    if rows < MIN_ROWS:
+        return 'data kurang'
+    if value > PSI_DRIFT:
+        return 'drift'
+    if value > PSI_WARNING:
+        return 'waspada'
+    return 'stabil'
+
+
+# ==================== MONITOR ====================
+class DriftMonitor:
+    """
+    Hitungan streaming per bin terhadap satu baseline. Thread-safe; bisa digabung (`merge`).
+    """
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self._numeric_edges = {col: np.asarray(spec['edges']) for col, spec in baseline['numeric'].items()}
+        self._categories = {col: pd.Index(spec['categories']) for col, spec in baseline['categorical'].items()}
+        self._score_edges = np.asarray(baseline['score']['edges'])
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # numerik: len(edges) + 1 bin + 1 bucket NaN; kategorikal: kategori + 1 bucket other
+            self.numeric_counts = {col: np.zeros(len(edges) + 2, dtype=np.int64)
+                                   for col, edges in self._numeric_edges.items()}
+            self.categorical_counts = {col: np.zeros(len(categories) + 1, dtype=np.int64)
+                                       for col, categories in self._categories.items()}
+            self.score_counts = np.zeros(len(self._score_edges) + 1, dtype=np.int64)
+            self.rows = 0
+
+    def _bin_numeric(self, col, values):
+        edges = self._numeric_edges[col]
+        values = pd.to_numeric(values, errors='coerce')
+        values = np.asarray(values, dtype=np.float64)
+        index = np.searchsorted(edges, values, side='left')
+        index[np.isnan(values)] = len(edges) + 1
+        return np.bincount(index, minlength=len(edges) + 2)
+
+    def _bin_categorical(self, col, values):
+        categories = self._categories[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Kolom hasil schema.validate: cukup petakan kategori, bukan setiap baris
+            mapping = categories.get_indexer(values.cat.categories)
+            codes = np.append(mapping, -1)[values.cat.codes.to_numpy()]
+        else:
+            codes = categories.get_indexer(values)
+        codes[codes < 0] = len(categories)
+        return np.bincount(codes, minlength=len(categories) + 1)
+
+    def update(self, X=None, probabilities=None):
+        """
+        Tambahkan satu batch: DataFrame fitur dan/atau array probabilitas churn
+        """
+        numeric, categorical, score = {}, {}, None
+        if X is not None:
+            if isinstance(X, dict):
+                X = pd.DataFrame([X])
+            for col in self._numeric_edges:
+                if col in X.columns:
+                    numeric[col] = self._bin_numeric(col, X[col])
+            for col in self._categories:
+                if col in X.columns:
+                    categorical[col] = self._bin_categorical(col, X[col])
+        if probabilities is not None:
+            probabilities = np.asarray(probabilities, dtype=np.float64)
+            probabilities = probabilities[~np.isnan(probabilities)]
+            score = np.bincount(np.searchsorted(self._score_edges, probabilities, side='left'),
+                                minlength=len(self._score_edges) + 1)
+
+        with self._lock:
+            for col, counts in numeric.items():
+                self.numeric_counts[col] += counts
+            for col, counts in categorical.items():
+                self.categorical_counts[col] += counts
+            if score is not None:
+                self.score_counts += score
+            if X is not None:
+                self.rows += len(X)
+
+    # ---------- state (untuk worker batch / persistensi) ----------
+    def state(self):
+        with self._lock:
+            return {
+                'rows': self.rows,
+                'numeric': {col: counts.tolist() for col, counts in self.numeric_counts.items()},
+                'categorical': {col: counts.tolist() for col, counts in self.categorical_counts.items()},
+                'score': self.score_counts.tolist(),
+            }
+
+    def merge(self, state):
+        """
+        Tambahkan hitungan dari `state()` monitor lain (mis. worker process)
+        """
+        with self._lock:
+            self.rows += state['rows']
+            for col, counts in state['numeric'].items():
+                self.numeric_counts[col] += np.asarray(counts, dtype=np.int64)
+            for col, counts in state['categorical'].items():
+                self.categorical_counts[col] += np.asarray(counts, dtype=np.int64)
+            self.score_counts += np.asarray(state['score'], dtype=np.int64)
+
+    # ---------- laporan ----------
+    def report(self):
+        """
+        {'rows', 'features': {kolom: {psi, ks, status, ...}}, 'score': {...}} terhadap baseline
+        """
+        state = self.state()
+        features = {}
+        for col, counts in state['numeric'].items():
+            expected = self.baseline['numeric'][col]['counts']
+            features[col] = {
+                'psi': psi(expected, counts),
+                # KS hanya atas bin berurutan (tanpa bucket NaN)
+                'ks': ks_statistic(expected[:-1], counts[:-1]),
+                'missing_rate': counts[-1] / sum(counts) if sum(counts) else None,
+            }
+        for col, counts in state['categorical'].items():
+            expected = self.baseline['categorical'][col]['counts']
+            features[col] = {
+                'psi': psi(expected, counts),
+                'ks': None,
+                'unknown_rate': counts[-1] / sum(counts) if sum(counts) else None,
+            }
+        for result in features.values():
+            result['status'] = drift_status(result['psi'], state['rows'])
+
+        score = None
+        expected_score = self.baseline['score'].get('counts')
+        if expected_score is not None:
+            score = {'psi': psi(expected_score, state['score']),
+                     'ks': ks_statistic(expected_score, state['score']),
+                     'rows': int(sum(state['score']))}
+            score['status'] = drift_status(score['psi'], score['rows'])
+        return {'rows': state['rows'], 'features': features, 'score': score}
+
+
+def report_frame(report):
+    """
+    Laporan sebagai DataFrame per fitur (+ baris skor), urut dari PSI terbesar
+    """
+    rows = {col: result for col, result in report['features'].items()}
+    if report['score'] is not None:
+        rows[SCORE_COLUMN] = report['score']
+    frame = pd.DataFrame.from_dict(rows, orient='index').drop(columns='rows', errors='ignore')
+    return frame.sort_values('psi', ascending=False, na_position='last')
+
+
+# ==================== MAIN ====================
+def main():
+    from data_loader import iter_batches
+
+    parser = argparse.ArgumentParser(description="Baseline & laporan drift fitur/skor model churn")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    create = subparsers.add_parser('baseline', help="Buat baseline dari data training")
+    create.add_argument('--data', default='../data/telco_customer_churn.csv')
+    create.add_argument('--model', default='notebooks/best_churn_model.pkl',
+                        help="Model untuk distribusi skor (test set 20%% seperti train.py)")
+    create.add_argument('--output', default='notebooks/drift_baseline.json')
+
+    check = subparsers.add_parser('report', help="Bandingkan file input dengan baseline")
+    check.add_argument('input', help="CSV/Parquet pelanggan (opsional berisi kolom churn_probability)")
+    check.add_argument('--baseline', default=None)
+    check.add_argument('--chunk-size', type=int, default=50_000)
+    args = parser.parse_args()
+
+    if args.command == 'baseline':
+        import joblib
+        from sklearn.model_selection import train_test_split
+
+        from scoring import predict_churn
+        from train import RANDOM_STATE, load_training_data
+
+        X, y = load_training_data(args.data)
+        # Split sama dengan train.py: fitur dari data train, skor dari test set
+        X_train, X_test, _, _ = train_test_split(X, y, test_size=0.2, random_state=RANDOM_STATE, stratify=y)
+        probabilities = None
+        if os.path.exists(args.model):
+            probabilities = predict_churn(joblib.load(args.model), X_test)[0]
+        else:
+            print(f"⚠️ Model {args.model} tidak ada, baseline tanpa distribusi skor")
+        save_baseline(build_baseline(X_train, probabilities), args.output)
+        print(f"✓ Baseline {len(X_train):,} baris (data train) disimpan di {args.output}")
+        return
+
+    baseline_path = args.baseline or find_baseline_path()
+    if baseline_path is None:
+        raise SystemExit("❌ Baseline tidak ditemukan, gunakan --baseline")
+    monitor = DriftMonitor(load_baseline(baseline_path))
+    for chunk in iter_batches(args.input, batch_size=args.chunk_size):
+        monitor.update(chunk, chunk[SCORE_COLUMN] if SCORE_COLUMN in chunk.columns else None)
+
+    frame = report_frame(monitor.report())
+    print(f"Drift {args.input} ({monitor.rows:,} baris) terhadap {baseline_path}:")
+    print(frame.to_string(float_format=lambda v: f"{v:.4f}"))
+    drifted = frame.index[frame['status'] == 'drift'].tolist()
+    if drifted:
+        print(f"⚠️ Drift (PSI > {PSI_DRIFT}): {', '.join(drifted)}")
+    else:
+        print("✅ Tidak ada drift signifikan")
+
+
+if __name__ == '__main__':
+    main()
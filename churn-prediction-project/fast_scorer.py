@@ -0,0 +1,345 @@
+"""
+Fast path scorer: pipeline sklearn yang sudah di-"compile" jadi array NumPy.
+
+Untuk request 1 atau beberapa baris, sebagian besar waktu habis untuk membuat
+`pd.DataFrame` dan dispatch lewat Pipeline -> ColumnTransformer -> SimpleImputer
+-> StandardScaler -> OneHotEncoder, bukan untuk menghitung pohon. Di sini semua
+itu diganti dengan:
+
+- konstanta imputer dan scaler yang sudah dihitung (num_fill, num_mean, num_scale)
+- tabel lookup kategori -> index kolom one-hot
+- seluruh node forest dalam array kontigu (left, right, feature, threshold, value)
+
+Hasil `predict_proba` identik bit-per-bit dengan pipeline sklearn (dengan
+n_jobs=1, karena dengan banyak thread urutan penjumlahan antar pohon di sklearn
+tidak tetap).
+
+Export dari model notebook 04:
+    python fast_scorer.py export best_churn_model.pkl compiled_model/
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+ARRAY_NAMES = [
+    'num_fill', 'num_mean', 'num_scale',
+    'node_left', 'node_right', 'node_feature', 'node_threshold', 'node_value',
+    'roots', 'classes',
+]
+META_FILE = 'compiled.json'
+
+
+def _numeric_constants(transformer, n_columns):
+    """
+    Ambil nilai imputasi, mean, dan scale dari Pipeline(imputer, scaler)
+    """
+    fill = np.full(n_columns, np.nan)
+    mean = np.zeros(n_columns)
+    scale = np.ones(n_columns)
+
+    steps = transformer.steps if hasattr(transformer, 'steps') else [('step', transformer)]
+    for name, step in steps:
+        kind = type(step).__name__
+        if kind == 'SimpleImputer':
+            fill = np.asarray(step.statistics_, dtype=np.float64)
+        elif kind == 'StandardScaler':
+            if step.with_mean:
+                mean = np.asarray(step.mean_, dtype=np.float64)
+            if step.with_std:
+                scale = np.asarray(step.scale_, dtype=np.float64)
+        else:
+            raise ValueError(f"Step numerik '{name}' ({kind}) belum didukung fast scorer")
+    return fill, mean, scale
+
+
+def _categorical_constants(transformer):
+    """
+    Ambil fill value imputer dan daftar kategori dari Pipeline(imputer, onehot)
+    """
+    fill_value = None
+    categories = None
+
+    steps = transformer.steps if hasattr(transformer, 'steps') else [('step', transformer)]
+    for name, step in steps:
+        kind = type(step).__name__
+        if kind == 'SimpleImputer' and step.strategy == 'constant':
+            fill_value = step.fill_value if step.fill_value is not None else 'missing_value'
+        elif kind == 'OneHotEncoder':
+            if step.drop is not None or getattr(step, 'infrequent_categories_', None):
+                raise ValueError("OneHotEncoder dengan drop/infrequent categories belum didukung")
+            categories = [list(c) for c in step.categories_]
+        else:
+            raise ValueError(f"Step kategorikal '{name}' ({kind}) belum didukung fast scorer")
+
+    if categories is None:
+        raise ValueError("Transformer kategorikal harus punya OneHotEncoder")
+    return fill_value, categories
+
+
+class CompiledPipeline:
+    """
+    Pipeline (ColumnTransformer + forest) dalam bentuk array NumPy datar.
+
+    Punya `classes_`, `feature_names_in_`, dan `predict_proba` sehingga bisa
+    dipakai langsung oleh `scoring.predict_churn` dan batch scoring.
+    """
+
+    def __init__(self, arrays, meta):
+        for name in ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self.numeric_columns = meta['numeric_columns']
+        self.categorical_columns = meta['categorical_columns']
+        self.categorical_fill = meta['categorical_fill']
+        self.n_features = meta['n_features']
+        self.max_depth = meta['max_depth']
+        self.feature_names_in_ = np.array(meta['feature_names_in'], dtype=object)
+        self.classes_ = self.classes
+
+        # Tabel lookup: per kolom kategorikal, kategori -> index kolom output
+        self.category_lookup = []
+        offset = len(self.numeric_columns)
+        for categories in meta['categories']:
+            self.category_lookup.append({c: offset + i for i, c in enumerate(categories)})
+            offset += len(categories)
+
+    # ---------- compile dari sklearn ----------
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """
+        Compile Pipeline([('preprocessor', ColumnTransformer), ('classifier', forest)])
+        """
+        if not hasattr(pipeline, 'steps') or len(pipeline.steps) != 2:
+            raise ValueError("Model harus Pipeline dengan 2 step: preprocessor dan classifier")
+        preprocessor = pipeline.steps[0][1]
+        forest = pipeline.steps[-1][1]
+
+        if not hasattr(preprocessor, 'transformers_'):
+            raise ValueError("Preprocessor harus ColumnTransformer yang sudah di-fit")
+        if not hasattr(forest, 'estimators_') or getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Classifier harus forest (RandomForest/ExtraTrees) dengan 1 output")
+
+        numeric_columns, categorical_columns = [], []
+        num_fill, num_mean, num_scale = [], [], []
+        categorical_fill, categories = None, []
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if isinstance(transformer, str):
+                if transformer == 'drop' or len(columns) == 0:
+                    continue
+                raise ValueError(f"Transformer '{name}' ({transformer}) belum didukung fast scorer")
+
+            last_step = transformer.steps[-1][1] if hasattr(transformer, 'steps') else transformer
+            if type(last_step).__name__ == 'OneHotEncoder':
+                if categorical_columns:
+                    raise ValueError("Hanya mendukung satu blok kategorikal")
+                categorical_fill, categories = _categorical_constants(transformer)
+                categorical_columns = list(columns)
+            else:
+                if numeric_columns or categorical_columns:
+                    raise ValueError("Blok numerik harus satu dan berada sebelum blok kategorikal")
+                num_fill, num_mean, num_scale = _numeric_constants(transformer, len(columns))
+                numeric_columns = list(columns)
+
+        # Forest: semua node dari semua pohon digabung dalam satu array kontigu
+        n_classes = len(forest.classes_)
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            # Leaf menunjuk ke dirinya sendiri, jadi traversal bisa jalan
+            # max_depth langkah tanpa masking
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+            feature = np.where(is_leaf, 0, tree.feature)
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+
+            # Normalisasi sama persis dengan DecisionTreeClassifier.predict_proba
+            value = np.array(tree.value[:, 0, :n_classes], dtype=np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value /= normalizer
+
+            lefts.append(left)
+            rights.append(right)
+            features.append(feature)
+            thresholds.append(threshold)
+            values.append(value)
+            roots.append(offset)
+            offset += tree.node_count
+
+        arrays = {
+            'num_fill': np.asarray(num_fill, dtype=np.float64),
+            'num_mean': np.asarray(num_mean, dtype=np.float64),
+            'num_scale': np.asarray(num_scale, dtype=np.float64),
+            'node_left': np.concatenate(lefts).astype(np.int32),
+            'node_right': np.concatenate(rights).astype(np.int32),
+            'node_feature': np.concatenate(features).astype(np.int32),
+            'node_threshold': np.concatenate(thresholds).astype(np.float64),
+            'node_value': np.concatenate(values),
+            'roots': np.asarray(roots, dtype=np.int32),
+            'classes': np.asarray(forest.classes_),
+        }
+        meta = {
+            'numeric_columns': numeric_columns,
+            'categorical_columns': categorical_columns,
+            'categorical_fill': categorical_fill,
+            'categories': [[str(c) for c in cats] for cats in categories],
+            'n_features': len(numeric_columns) + sum(len(c) for c in categories),
+            'max_depth': int(max(e.tree_.max_depth for e in forest.estimators_)),
+            'feature_names_in': [str(c) for c in getattr(pipeline, 'feature_names_in_',
+                                                        numeric_columns + categorical_columns)],
+        }
+        return cls(arrays, meta)
+
+    # ---------- simpan / load ----------
+    def save(self, directory):
+        """
+        Simpan setiap array sebagai file .npy (tanpa kompresi) + metadata JSON
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(directory, META_FILE), 'w') as f:
+            json.dump(self.meta, f, indent=4)
+
+    @classmethod
+    def load(cls, directory, mmap_mode=None):
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+            for name in ARRAY_NAMES
+        }
+        return cls(arrays, meta)
+
+    # ---------- inference ----------
+    def _columns(self, X):
+        """
+        Ubah input (dict, list of dict, DataFrame, atau array 2D) jadi dict kolom -> nilai
+        """
+        if isinstance(X, dict):
+            return {col: [X[col]] for col in self.feature_names_in_}, 1
+        if isinstance(X, list):
+            return {col: [row[col] for row in X] for col in self.feature_names_in_}, len(X)
+        if hasattr(X, 'columns'):
+            return {col: X[col].to_numpy() for col in self.feature_names_in_}, len(X)
+
+        X = np.asarray(X, dtype=object)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        return {col: X[:, j] for j, col in enumerate(self.feature_names_in_)}, X.shape[0]
+
+    def transform(self, X):
+        """
+        Setara dengan `preprocessor.transform(X)`: hasil float64 (n_rows, n_features)
+        """
+        columns, n_rows = self._columns(X)
+        out = np.zeros((n_rows, self.n_features), dtype=np.float64)
+
+        for j, col in enumerate(self.numeric_columns):
+            values = columns[col]
+            try:
+                numeric = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                # Misalnya TotalCharges kosong (' ') -> NaN, sama seperti pd.to_numeric(errors='coerce')
+                numeric = np.array([_to_float(v) for v in values], dtype=np.float64)
+            numeric[np.isnan(numeric)] = self.num_fill[j]
+            out[:, j] = numeric
+
+        n_numeric = len(self.numeric_columns)
+        out[:, :n_numeric] -= self.num_mean
+        out[:, :n_numeric] /= self.num_scale
+
+        fill = self.categorical_fill
+        for lookup, col in zip(self.category_lookup, self.categorical_columns):
+            for i, value in enumerate(columns[col]):
+                if value != value:  # NaN -> fill value imputer
+                    value = fill
+                index = lookup.get(value)
+                if index is not None:
+                    out[i, index] = 1.0
+        return out
+
+    def apply(self, X_transformed):
+        """
+        Index node leaf (global) untuk setiap baris dan setiap pohon: (n_rows, n_trees)
+        """
+        # Pohon sklearn membandingkan fitur dalam float32
+        X32 = np.ascontiguousarray(X_transformed, dtype=np.float32)
+        n_rows, n_trees = X32.shape[0], len(self.roots)
+        flat_X = X32.ravel()
+
+        # Semua pasangan (baris, pohon) dalam satu array datar; yang sudah
+        # sampai leaf dikeluarkan dari `active` supaya kerja tiap level mengecil
+        node = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows) * X32.shape[1], n_trees)
+        active = np.arange(node.size)
+        for _ in range(self.max_depth):
+            current = node[active]
+            go_left = flat_X[row_offset[active] + self.node_feature[current]] <= self.node_threshold[current]
+            nxt = np.where(go_left, self.node_left[current], self.node_right[current])
+            node[active] = nxt
+            active = active[nxt != current]
+            if active.size == 0:
+                break
+        return node.reshape(n_rows, n_trees)
+
+    def leaf_proba(self, leaves):
+        """
+        Rata-rata nilai leaf semua pohon -> probabilitas per kelas
+        """
+        # Penjumlahan berurutan per pohon (bukan pairwise) agar sama dengan sklearn
+        proba = np.add.accumulate(self.node_value[leaves], axis=1)[:, -1, :]
+        proba /= len(self.roots)
+        return proba
+
+    def predict_proba(self, X):
+        return self.leaf_proba(self.apply(self.transform(X)))
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def verify(pipeline, compiled, X):
+    """
+    Bandingkan hasil compiled scorer dengan pipeline sklearn (n_jobs=1).
+    Return True jika predict_proba identik bit-per-bit.
+    """
+    classifier = pipeline.steps[-1][1]
+    n_jobs = classifier.n_jobs
+    classifier.set_params(n_jobs=1)
+    try:
+        expected = pipeline.predict_proba(X)
+    finally:
+        classifier.set_params(n_jobs=n_jobs)
+    return np.array_equal(expected, compiled.predict_proba(X))
+
+
+if __name__ == '__main__':
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Compile pipeline churn ke representasi NumPy")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="Compile dan simpan model")
+    export_parser.add_argument('model', help="Path ke best_churn_model.pkl")
+    export_parser.add_argument('output', help="Folder output")
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    compiled.save(args.output)
+    print(f"✓ Model compiled: {len(compiled.roots)} pohon, {len(compiled.node_left)} node, "
+          f"{compiled.n_features} fitur -> {args.output}")
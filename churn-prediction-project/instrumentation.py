@@ -0,0 +1,257 @@
+"""
+Instrumentasi latency per tahap untuk pipeline inference.
+
+Model di-wrap (`instrument()`) hanya saat instrumentasi diaktifkan; model
+yang tidak di-wrap berjalan persis seperti biasa, jadi saat nonaktif tidak
+ada overhead sama sekali. Tahap yang diukur:
+
+- sklearn Pipeline : tiap step di dalam ColumnTransformer (mis.
+  `preprocessor/num/imputer`, `preprocessor/cat/onehot`), penggabungan
+  kolom (`preprocessor/hstack`), lalu `classifier`
+- CompiledPipeline : `transform`, `forest` (traversal pohon), `aggregate`
+- tahap di luar model (mis. `schema` di app.py) lewat `timed()`
+
+Tiap tahap punya histogram latency (bucket tetap) dan jumlah baris, dapat
+di-export sebagai teks Prometheus (`/metrics` di service.py) atau JSON.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.pipeline import Pipeline
+
+from fast_scorer import CompiledPipeline
+
+METRIC_PREFIX = 'churn_inference'
+# Batas atas bucket (detik), sama gaya dengan default client Prometheus tapi mulai dari 100 µs
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ==================== HISTOGRAM ====================
+class StageHistogram:
+    """
+    Histogram latency satu tahap (tidak thread-safe sendiri; dikunci oleh PipelineInstrumentation)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # elemen terakhir = +Inf
+        self.count = 0
+        self.total_seconds = 0.0
+        self.rows = 0
+
+    def observe(self, seconds, rows=0):
+        self.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.rows += rows
+
+    def quantile(self, q):
+        """
+        Perkiraan kuantil: batas atas bucket tempat kuantil jatuh (seperti histogram_quantile)
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for upper, n in zip(self.buckets, self.bucket_counts):
+            cumulative += n
+            if cumulative >= target:
+                return upper
+        return float('inf')
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'rows': self.rows,
+            'total_seconds': self.total_seconds,
+            'mean_ms': self.total_seconds / self.count * 1e3 if self.count else None,
+            'p50_ms_le': _to_ms(self.quantile(0.5)),
+            'p95_ms_le': _to_ms(self.quantile(0.95)),
+        }
+
+
+def _to_ms(seconds):
+    if seconds is None or seconds == float('inf'):
+        return seconds
+    return seconds * 1e3
+
+
+# ==================== REGISTRY ====================
+class PipelineInstrumentation:
+    """
+    Kumpulan histogram per tahap, thread-safe (dipakai bersama oleh semua session / request)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, rows=0):
+        with self._lock:
+            histogram = self._stages.get(name)
+            if histogram is None:
+                histogram = self._stages[name] = StageHistogram(self.buckets)
+            histogram.observe(seconds, rows)
+
+    @contextmanager
+    def stage(self, name, rows=0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, rows)
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+
+    def summary(self):
+        """
+        {tahap: {count, rows, total_seconds, mean_ms, p50_ms_le, p95_ms_le}} urut sesuai pertama kali terlihat
+        """
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in self._stages.items()}
+
+    def to_json(self, indent=2):
+        return json.dumps({'buckets_seconds': list(self.buckets), 'stages': self.summary()}, indent=indent)
+
+    def to_prometheus(self, prefix=METRIC_PREFIX):
+        """
+        Teks exposition format Prometheus (histogram + counter baris)
+        """
+        seconds_metric = f'{prefix}_stage_seconds'
+        rows_metric = f'{prefix}_stage_rows_total'
+        lines = [
+            f'# HELP {seconds_metric} Latency per tahap pipeline inference.',
+            f'# TYPE {seconds_metric} histogram',
+        ]
+        rows_lines = [
+            f'# HELP {rows_metric} Jumlah baris yang diproses per tahap.',
+            f'# TYPE {rows_metric} counter',
+        ]
+        with self._lock:
+            for name, histogram in self._stages.items():
+                label = f'stage="{name}"'
+                cumulative = 0
+                for upper, n in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += n
+                    lines.append(f'{seconds_metric}_bucket{{{label},le="{upper:g}"}} {cumulative}')
+                lines.append(f'{seconds_metric}_bucket{{{label},le="+Inf"}} {histogram.count}')
+                lines.append(f'{seconds_metric}_sum{{{label}}} {histogram.total_seconds!r}')
+                lines.append(f'{seconds_metric}_count{{{label}}} {histogram.count}')
+                rows_lines.append(f'{rows_metric}{{{label}}} {histogram.rows}')
+        return '\n'.join(lines + rows_lines) + '\n'
+
+
+def timed(instrumentation, name, rows=0):
+    """
+    Context manager pengukur tahap; no-op jika instrumentation None
+    """
+    if instrumentation is None:
+        return nullcontext()
+    return instrumentation.stage(name, rows)
+
+
+# ==================== WRAPPER MODEL ====================
+def _n_rows(X):
+    return X.shape[0] if hasattr(X, 'shape') else len(X)
+
+
+class InstrumentedPipeline(Pipeline):
+    """
+    Pipeline sklearn dengan step yang sama (sudah di-fit), predict_proba diukur per tahap.
+
+    ColumnTransformer dijalankan transformer per transformer agar tiap step
+    (imputer, scaler, onehot) punya histogram sendiri; hasilnya identik dengan
+    `ColumnTransformer.transform`.
+
+    Constructor tidak di-override (signature Pipeline berbeda antar versi sklearn);
+    `instrumentation` di-set setelah dibuat, lihat `instrument()`.
+    """
+
+    instrumentation = None
+
+    def _transform_columns(self, name, transformer, X, rows):
+        inst = self.instrumentation
+        parts = []
+        for sub_name, sub, columns in transformer.transformers_:
+            if sub == 'drop' or len(columns) == 0:
+                continue
+            part = X[columns]
+            if sub == 'passthrough':
+                parts.append(part.to_numpy())
+                continue
+            for step_name, step in (sub.steps if hasattr(sub, 'steps') else [(None, sub)]):
+                stage = f'{name}/{sub_name}' + (f'/{step_name}' if step_name else '')
+                with inst.stage(stage, rows):
+                    part = step.transform(part)
+            parts.append(part)
+
+        with inst.stage(f'{name}/hstack', rows):
+            if getattr(transformer, 'sparse_output_', False):
+                return sp.hstack(parts).tocsr()
+            return np.hstack([p.toarray() if sp.issparse(p) else np.asarray(p) for p in parts])
+
+    def predict_proba(self, X, **params):
+        inst = self.instrumentation
+        if inst is None:  # mis. hasil clone(): tanpa pengukuran
+            return super().predict_proba(X, **params)
+        rows = _n_rows(X)
+        Xt = X
+        for name, step in self.steps[:-1]:
+            if hasattr(step, 'transformers_') and isinstance(Xt, pd.DataFrame):
+                Xt = self._transform_columns(name, step, Xt, rows)
+            else:
+                with inst.stage(name, rows):
+                    Xt = step.transform(Xt)
+        name, classifier = self.steps[-1]
+        with inst.stage(name, rows):
+            return classifier.predict_proba(Xt, **params)
+
+    def predict(self, X, **params):
+        proba = self.predict_proba(X, **params)
+        return self.classes_[np.argmax(proba, axis=1)]
+
+
+class InstrumentedCompiledPipeline(CompiledPipeline):
+    """
+    CompiledPipeline yang sama (array dibagi, tidak disalin), predict_proba diukur per tahap
+    """
+
+    def predict_proba(self, X):
+        inst = self.instrumentation
+        rows = _n_rows(X)
+        with inst.stage('transform', rows):
+            X_transformed = self.transform(X)
+        with inst.stage('forest', rows):
+            leaves = self.apply(X_transformed)
+        with inst.stage('aggregate', rows):
+            return self.leaf_proba(leaves)
+
+
+def instrument(model, instrumentation):
+    """
+    Versi terinstrumentasi dari model; model asli tidak diubah.
+
+    Model selain sklearn Pipeline / CompiledPipeline dikembalikan apa adanya.
+    """
+    if instrumentation is None:
+        return model
+    if isinstance(model, CompiledPipeline):
+        wrapped = InstrumentedCompiledPipeline.__new__(InstrumentedCompiledPipeline)
+        wrapped.__dict__.update(model.__dict__)
+        wrapped.instrumentation = instrumentation
+        return wrapped
+    if isinstance(model, Pipeline) and not isinstance(model, InstrumentedPipeline):
+        wrapped = InstrumentedPipeline(model.steps, memory=model.memory, verbose=model.verbose)
+        wrapped.instrumentation = instrumentation
+        return wrapped
+    return model
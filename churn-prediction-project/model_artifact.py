@@ -0,0 +1,204 @@
+"""
+Format artifact model yang versioned dan bisa di-memory-map.
+
+Struktur folder artifact:
+
+    model_artifact/
+        manifest.json        # versi format, schema, versi library, checksum
+        compiled/*.npy       # array forest + konstanta preprocessing (tanpa kompresi)
+        compiled/compiled.json
+        pipeline.joblib      # pipeline sklearn asli (opsional, tanpa kompresi)
+
+Array di `compiled/` di-load dengan `np.load(mmap_mode='r')`, jadi cold start
+hanya membuka file dan page-nya dibagi read-only oleh semua worker lewat page
+cache OS (tidak ada salinan model per proses). Pohon sklearn di dalam
+`pipeline.joblib` selalu disalin ke memori sendiri saat unpickle, walaupun
+di-load dengan `mmap_mode='r'`, sehingga file itu hanya untuk fallback.
+
+Export dari model notebook 04:
+    python model_artifact.py export best_churn_model.pkl model_artifact/
+    python model_artifact.py verify model_artifact/
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+from datetime import datetime, timezone
+
+import numpy as np
+
+from fast_scorer import CompiledPipeline
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+COMPILED_DIR = 'compiled'
+PIPELINE_FILE = 'pipeline.joblib'
+
+
+def file_checksum(path, chunk_size=1024 * 1024):
+    """
+    SHA-256 dari isi file, dibaca per chunk
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _artifact_files(directory):
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, directory).replace(os.sep, '/')
+            if rel != MANIFEST_FILE:
+                files.append(rel)
+    return sorted(files)
+
+
+def _combined_checksum(file_checksums):
+    digest = hashlib.sha256()
+    for rel in sorted(file_checksums):
+        digest.update(f"{rel}:{file_checksums[rel]}\n".encode())
+    return digest.hexdigest()
+
+
+def model_checksum(path):
+    """
+    Checksum model: dari manifest untuk artifact, atau SHA-256 file .pkl
+    """
+    if is_artifact(path):
+        return read_manifest(path)['checksum']
+    return file_checksum(path)
+
+
+def is_artifact(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST_FILE))
+
+
+def save_artifact(pipeline, directory, include_pipeline=True):
+    """
+    Compile pipeline dan simpan sebagai artifact + manifest. Return manifest (dict).
+    """
+    import joblib
+    import sklearn
+
+    os.makedirs(directory, exist_ok=True)
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    compiled.save(os.path.join(directory, COMPILED_DIR))
+
+    if include_pipeline:
+        # compress=0 supaya array numpy di dalamnya bisa di-mmap oleh joblib
+        joblib.dump(pipeline, os.path.join(directory, PIPELINE_FILE), compress=0)
+
+    file_checksums = {rel: file_checksum(os.path.join(directory, rel))
+                      for rel in _artifact_files(directory)}
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'sklearn_version': sklearn.__version__,
+        'numpy_version': np.__version__,
+        'python_version': platform.python_version(),
+        'schema': {
+            'feature_names_in': compiled.meta['feature_names_in'],
+            'numeric_columns': compiled.numeric_columns,
+            'categorical_columns': compiled.categorical_columns,
+            'categories': compiled.meta['categories'],
+            'classes': [int(c) for c in compiled.classes_],
+        },
+        'model': {
+            'type': type(pipeline.steps[-1][1]).__name__,
+            'n_trees': int(len(compiled.roots)),
+            'n_nodes': int(len(compiled.node_left)),
+            'max_depth': compiled.max_depth,
+        },
+        'files': file_checksums,
+        'checksum': _combined_checksum(file_checksums),
+    }
+    with open(os.path.join(directory, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Versi format artifact {manifest.get('format_version')} tidak didukung "
+                         f"(versi saat ini: {FORMAT_VERSION})")
+    return manifest
+
+
+def verify_artifact(directory):
+    """
+    Cek checksum semua file terhadap manifest. Return list file yang tidak cocok.
+    """
+    manifest = read_manifest(directory)
+    mismatched = []
+    for rel, expected in manifest['files'].items():
+        path = os.path.join(directory, rel)
+        if not os.path.exists(path) or file_checksum(path) != expected:
+            mismatched.append(rel)
+    return mismatched
+
+
+def load_artifact(directory, mmap_mode='r', verify=False):
+    """
+    Load compiled scorer dari artifact. Array di-memory-map (read-only) secara default.
+
+    `verify=True` menghitung ulang checksum semua file (membaca seluruh isi file,
+    jadi cold start lebih lambat).
+    """
+    manifest = read_manifest(directory)
+    if verify:
+        mismatched = verify_artifact(directory)
+        if mismatched:
+            raise ValueError(f"Checksum artifact tidak cocok: {mismatched}")
+
+    model = CompiledPipeline.load(os.path.join(directory, COMPILED_DIR), mmap_mode=mmap_mode)
+    model.manifest = manifest
+    return model
+
+
+def load_pipeline(directory, mmap_mode='r'):
+    """
+    Load pipeline sklearn asli dari artifact (fallback jika butuh objek sklearn)
+    """
+    import joblib
+    import sklearn
+
+    manifest = read_manifest(directory)
+    if manifest['sklearn_version'] != sklearn.__version__:
+        raise ValueError(f"Artifact dibuat dengan scikit-learn {manifest['sklearn_version']}, "
+                         f"terinstall {sklearn.__version__}")
+    return joblib.load(os.path.join(directory, PIPELINE_FILE), mmap_mode=mmap_mode)
+
+
+if __name__ == '__main__':
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Export / verifikasi artifact model churn")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="Buat artifact dari best_churn_model.pkl")
+    export_parser.add_argument('model')
+    export_parser.add_argument('output')
+    export_parser.add_argument('--no-pipeline', action='store_true',
+                               help="Jangan sertakan pipeline sklearn asli")
+    verify_parser = subparsers.add_parser('verify', help="Cek checksum artifact")
+    verify_parser.add_argument('artifact')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        manifest = save_artifact(joblib.load(args.model), args.output,
+                                 include_pipeline=not args.no_pipeline)
+        print(f"✓ Artifact disimpan di {args.output} "
+              f"({manifest['model']['n_trees']} pohon, {manifest['model']['n_nodes']} node)")
+        print(f"  checksum: {manifest['checksum']}")
+    else:
+        mismatched = verify_artifact(args.artifact)
+        if mismatched:
+            print(f"❌ Checksum tidak cocok: {mismatched}")
+            raise SystemExit(1)
+        print("✅ Artifact valid")
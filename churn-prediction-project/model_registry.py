@@ -0,0 +1,212 @@
+"""
+Registry model untuk app Streamlit: load di background thread + hot swap.
+
+Sebelumnya `load_model_and_preprocessor()` dijalankan di script run pertama,
+jadi halaman kosong selama probing path dan load model. Registry ini:
+
+- mulai load model di thread background saat dibuat (`start()`), halaman
+  langsung di-render dan menampilkan status "memuat"
+- dibuat sekali via `@st.cache_resource`, jadi model dibagi semua session
+- memantau file model (mtime/ukuran, atau manifest artifact) dan me-load
+  versi baru di background; snapshot diganti dengan satu assignment,
+  sehingga prediksi yang sedang berjalan tetap memakai snapshot lamanya
+- jika load versi baru gagal (misalnya file masih ditulis atau korup),
+  kandidat path berikutnya dicoba; snapshot lama tetap dipakai jika semua
+  gagal, dan file yang gagal dicoba lagi setelah berubah
+
+Artifact di-mmap: publish versi baru ke folder baru lalu ganti symlink
+(`ln -sfn model_artifact_v2 model_artifact`), jangan menimpa file .npy
+di folder yang sedang dipakai.
+"""
+import os
+import pickle
+import threading
+import time
+from collections import namedtuple
+
+import joblib
+
+from model_artifact import MANIFEST_FILE, is_artifact, load_artifact, model_checksum
+
+MODEL_PATH_ENV = 'CHURN_MODEL_PATH'
+DEFAULT_POLL_SECONDS = 2.0
+
+# Urutan pencarian sama dengan app.py sebelumnya
+MODEL_PATHS = [
+    'model_artifact',                          # Artifact mmap (lihat model_artifact.py)
+    'notebooks/model_artifact',
+    'best_churn_model.pkl',                    # Root folder
+    'notebooks/best_churn_model.pkl',          # Notebooks folder
+    './best_churn_model.pkl',                  # Current directory
+    '../best_churn_model.pkl',                 # Parent directory
+    'churn-prediction-project/best_churn_model.pkl',  # Project folder structure
+]
+
+PREPROCESSOR_PATHS = [
+    'preprocessor.pkl',
+    'notebooks/preprocessor.pkl',
+    './preprocessor.pkl',
+    'feature_names.pkl',
+    'notebooks/feature_names.pkl'
+]
+
+ModelSnapshot = namedtuple('ModelSnapshot', [
+    'model', 'location', 'checksum', 'preprocessor', 'preprocessor_location',
+    'version', 'loaded_at', 'load_seconds',
+])
+
+
+def model_search_paths():
+    """
+    Path dari env CHURN_MODEL_PATH (jika ada) diikuti MODEL_PATHS
+    """
+    env_path = os.environ.get(MODEL_PATH_ENV)
+    return ([env_path] if env_path else []) + MODEL_PATHS
+
+
+def file_signature(path):
+    """
+    Penanda versi file model yang murah dihitung (tanpa membaca isi file)
+    """
+    target = os.path.join(path, MANIFEST_FILE) if is_artifact(path) else path
+    stat = os.stat(target)
+    return os.path.realpath(path), stat.st_mtime_ns, stat.st_size
+
+
+def load_model_file(path):
+    if is_artifact(path):
+        return load_artifact(path, mmap_mode='r')
+    return joblib.load(path)
+
+
+def load_preprocessor_file(path):
+    if path.endswith('feature_names.pkl'):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    return joblib.load(path)
+
+
+class ModelRegistry:
+    """
+    Pemegang model aktif yang thread-safe. Baca model lewat `current()` sekali
+    per request/rerun dan pakai snapshot itu sampai selesai.
+    """
+
+    def __init__(self, model_paths=None, preprocessor_paths=PREPROCESSOR_PATHS,
+                 poll_seconds=DEFAULT_POLL_SECONDS):
+        self.model_paths = model_paths
+        self.preprocessor_paths = preprocessor_paths
+        self.poll_seconds = poll_seconds
+        self.messages = []
+        self.last_error = None
+        self._snapshot = None
+        self._signature = None
+        self._failed = {}  # path -> (signature, pesan error) file yang gagal di-load
+        self._version = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- status ----------
+    def current(self):
+        return self._snapshot
+
+    def is_ready(self):
+        """
+        True setelah percobaan load pertama selesai (berhasil atau tidak)
+        """
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Tunggu load pertama selesai, return snapshot (None jika model tidak ada)
+        """
+        self._ready.wait(timeout)
+        return self._snapshot
+
+    # ---------- background thread ----------
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='model-registry', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        self.refresh()
+        self._ready.set()
+        while self.poll_seconds and not self._stop.wait(self.poll_seconds):
+            self.refresh()
+
+    def _candidate_paths(self):
+        return [path for path in self.model_paths or model_search_paths() if os.path.exists(path)]
+
+    def _load_preprocessor(self):
+        for path in self.preprocessor_paths:
+            if os.path.exists(path):
+                try:
+                    return load_preprocessor_file(path), path
+                except Exception as e:
+                    self.messages.append(f"Gagal load preprocessor dari {path}: {str(e)[:50]}...")
+        return None, ""
+
+    def refresh(self):
+        """
+        Load model jika file berubah sejak load terakhir. Return True jika snapshot diganti.
+
+        Kandidat dicoba berurutan sampai ada yang berhasil di-load; file yang
+        gagal (mis. korup) dilewati dan baru dicoba lagi setelah berubah.
+        """
+        errors = []
+        for path in self._candidate_paths():
+            try:
+                signature = file_signature(path)
+            except OSError:
+                continue  # file sedang diganti
+            if signature == self._signature:
+                return False  # kandidat prioritas tertinggi yang valid sudah aktif
+            failed_signature, message = self._failed.get(path, (None, None))
+            if failed_signature == signature:
+                errors.append(message)
+                continue
+
+            start = time.perf_counter()
+            try:
+                model = load_model_file(path)
+                checksum = model_checksum(path)
+            except Exception as e:
+                message = f"Gagal load dari {path}: {str(e)[:50] or type(e).__name__}..."
+                self._failed[path] = (signature, message)
+                errors.append(message)
+                continue
+            self._failed.pop(path, None)
+            break
+        else:
+            # Versi lama (jika ada) tetap dipakai
+            self.last_error = ' | '.join(errors) or None
+            return False
+
+        if self._snapshot is None:
+            preprocessor, preprocessor_location = self._load_preprocessor()
+        else:
+            preprocessor, preprocessor_location = (self._snapshot.preprocessor,
+                                                   self._snapshot.preprocessor_location)
+
+        with self._lock:
+            self._version += 1
+            self._signature = signature
+            # Kandidat prioritas lebih tinggi yang gagal tetap dilaporkan
+            self.last_error = ' | '.join(errors) or None
+            # Swap atomik: pembaca melihat snapshot lama atau baru, tidak pernah campuran
+            self._snapshot = ModelSnapshot(
+                model=model, location=path, checksum=checksum,
+                preprocessor=preprocessor, preprocessor_location=preprocessor_location,
+                version=self._version, loaded_at=time.time(),
+                load_seconds=time.perf_counter() - start,
+            )
+        return True
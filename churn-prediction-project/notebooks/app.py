@@ -3,6 +3,11 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
+import sys
+
+# scoring.py ada di folder project (satu level di atas notebooks/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from scoring import predict_churn
 
 # Set page config
 st.set_page_config(
@@ -95,9 +100,10 @@ st.write(input_df)
 if st.button("Prediksi Churn"):
     if model:
         try:
-            # Predict
-            prediction = model.predict(input_df)[0]
-            probabilities = model.predict_proba(input_df)[0]
+            # Predict (satu kali predict_proba)
+            churn_proba, labels = predict_churn(model, input_df)
+            prediction = labels[0]
+            probabilities = [1 - churn_proba[0], churn_proba[0]]
             
             # Display results
             st.subheader("Hasil Prediksi")
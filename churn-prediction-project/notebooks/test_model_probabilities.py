@@ -1,8 +1,15 @@
 # test_model_probabilities.py
+import os
+import sys
+
 import joblib
 import pandas as pd
 import numpy as np
 
+# scoring.py ada di folder project (satu level di atas notebooks/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from scoring import split_probabilities
+
 # Load model
 model = joblib.load('best_churn_model.pkl')
 
@@ -29,9 +36,9 @@ test_input = pd.DataFrame({
     'TotalCharges': [1680.0]
 })
 
-# Predict
-prediction = model.predict(test_input)
+# Predict (satu kali predict_proba, label dari threshold)
 probabilities = model.predict_proba(test_input)
+churn_proba, prediction = split_probabilities(model, probabilities)
 
 print("="*50)
 print("MODEL TEST RESULTS")
@@ -0,0 +1,147 @@
+"""
+Cache prediksi (LRU + TTL) di depan model.
+
+Ruang input aplikasi kecil dan diskrit (selectbox, tenure 0-72, slider charges),
+jadi profil yang sama sering diprediksi berulang kali. Cache ini menyimpan
+probabilitas churn per baris input, dengan key berupa tuple 19 kolom yang
+sudah dinormalisasi (angka jadi float, NaN/None jadi None).
+
+Cache otomatis dikosongkan jika checksum artifact model berubah, dan
+ukurannya dibatasi `max_size` entri sehingga memori tetap kecil. Hasil
+prediksi yang selesai setelah model berganti (dimulai dari snapshot lama)
+tidak ditulis ke cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_SIZE = 10_000
+DEFAULT_TTL_SECONDS = 3600
+
+
+def _canonical_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (bool, int, float, np.number)):
+        value = float(value)
+        return None if value != value else value
+    return str(value)
+
+
+def row_key(values):
+    """
+    Key kanonik untuk satu baris (urutan kolom harus sama dengan feature_names_in_)
+    """
+    return tuple(_canonical_value(v) for v in values)
+
+
+def _rows(X, feature_columns):
+    if isinstance(X, dict):
+        return [[X[col] for col in feature_columns]]
+    if isinstance(X, list):
+        return [[row[col] for col in feature_columns] for row in X]
+    return X[feature_columns].itertuples(index=False, name=None)
+
+
+class PredictionCache:
+    """
+    Cache LRU dengan TTL, thread-safe (dipakai bersama oleh semua session Streamlit).
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.model_checksum = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def bind_model(self, checksum):
+        """
+        Kosongkan cache jika model yang dipakai berganti (checksum berbeda)
+        """
+        with self._lock:
+            if checksum != self.model_checksum:
+                self._entries.clear()
+                self.model_checksum = checksum
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, checksum=None):
+        """
+        Simpan satu probabilitas; dengan `checksum`, dibuang jika model sudah berganti
+        """
+        with self._lock:
+            if checksum is not None and checksum != self.model_checksum:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def cached_churn_probabilities(cache, model, X, feature_columns, predict_fn, checksum=None):
+    """
+    Probabilitas churn untuk X (DataFrame, dict, atau list of dict).
+
+    Baris yang ada di cache tidak dikirim ke model sama sekali; sisanya
+    diprediksi dalam satu panggilan `predict_fn(model, X_subset)` yang harus
+    mengembalikan array probabilitas churn. `checksum` = checksum `model`,
+    agar hasil model lama tidak masuk cache setelah hot swap.
+    """
+    keys = [row_key(values) for values in _rows(X, feature_columns)]
+    churn_proba = np.empty(len(keys), dtype=np.float64)
+
+    missing = []
+    for i, key in enumerate(keys):
+        value = cache.get(key)
+        if value is None:
+            missing.append(i)
+        else:
+            churn_proba[i] = value
+
+    if missing:
+        if isinstance(X, dict):
+            subset = X
+        elif isinstance(X, list):
+            subset = [X[i] for i in missing]
+        else:
+            subset = X.iloc[missing]
+        predicted = predict_fn(model, subset)
+        for i, value in zip(missing, predicted):
+            churn_proba[i] = value
+            cache.put(keys[i], float(value), checksum)
+    return churn_proba
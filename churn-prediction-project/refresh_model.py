@@ -0,0 +1,200 @@
+"""
+Refresh model mingguan dari batch label baru, tanpa training ulang penuh.
+
+Alur (hanya data batch baru yang diproses, jadi waktunya sebanding dengan
+ukuran batch baru, bukan seluruh histori):
+
+1. Batch label baru (CSV/Parquet, 19 fitur + Churn) diarsipkan ke folder
+   histori sebagai Parquet (untuk training penuh berikutnya dengan train.py)
+2. Preprocessor yang sudah di-fit dipakai ulang. Jika ada kategori baru yang
+   tidak dikenal OneHotEncoder, refresh dibatalkan: ruang fitur berubah dan
+   semua pohon harus dilatih ulang (jalankan train.py)
+3. Forest ditambah `--trees` pohon yang dilatih di batch baru (warm start);
+   dengan `--replace-oldest` pohon tertua dibuang sehingga ukuran forest tetap
+4. Model lama dan baru dibandingkan di holdout; model baru hanya dipromosikan
+   jika accuracy/F1/recall tidak turun lebih dari `--tolerance`. File model
+   diganti atomik (app.py akan hot swap lewat model_registry.py), versi lama
+   disimpan sebagai `*.prev.pkl`
+
+    python refresh_model.py labels_minggu_ini.csv --model notebooks/best_churn_model.pkl \\
+        --trees 50 --replace-oldest --holdout ../data/holdout.csv
+"""
+import argparse
+import copy
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from compact_model import GUARDED_METRICS, within_tolerance
+from train import RANDOM_STATE, evaluate, load_training_data
+
+DEFAULT_NEW_TREES = 50
+DEFAULT_TOLERANCE = 0.01
+DEFAULT_HOLDOUT_FRACTION = 0.2
+DEFAULT_HISTORY_DIR = '../data/labeled_batches'
+
+
+# ==================== DATA ====================
+def archive_batch(X, y, history_dir=DEFAULT_HISTORY_DIR):
+    """
+    Simpan batch label baru sebagai Parquet di folder histori. Return path file.
+    """
+    from data_loader import LABEL_COLUMN
+
+    os.makedirs(history_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    path = os.path.join(history_dir, f'batch-{stamp}.parquet')
+    X.assign(**{LABEL_COLUMN: y.astype('int8')}).to_parquet(path, index=False)
+    return path
+
+
+def unknown_categories(model, X):
+    """
+    Kategori di X yang tidak dikenal OneHotEncoder pipeline: {kolom: [nilai, ...]}
+    """
+    preprocessor = model.steps[0][1]
+    unknown = {}
+    for _, transformer, columns in preprocessor.transformers_:
+        steps = transformer.steps if hasattr(transformer, 'steps') else [('step', transformer)]
+        encoder = steps[-1][1]
+        if type(encoder).__name__ != 'OneHotEncoder':
+            continue
+        for col, categories in zip(columns, encoder.categories_):
+            values = X[col].dropna().astype(str).unique()
+            new_values = sorted(set(values) - set(categories))
+            if new_values:
+                unknown[col] = new_values
+    return unknown
+
+
+# ==================== REFRESH ====================
+def grow_forest(model, X_new, y_new, n_trees=DEFAULT_NEW_TREES, replace_oldest=False):
+    """
+    Pipeline baru: preprocessor yang sama + forest dengan n_trees pohon baru dari batch ini.
+
+    Model asli tidak diubah (pohon lama dibagi, tidak disalin).
+    """
+    if y_new.nunique() < 2:
+        raise ValueError("Batch baru harus berisi kedua kelas (churn dan tidak churn)")
+
+    preprocessor = model.steps[0][1]
+    forest = copy.copy(model.steps[-1][1])
+    forest.estimators_ = list(forest.estimators_)
+    n_old = len(forest.estimators_)
+
+    # Forest selalu bekerja dengan float32, sama seperti train.fit_fold
+    X_transformed = np.asarray(preprocessor.transform(X_new), dtype=np.float32)
+    forest.set_params(warm_start=True, n_estimators=n_old + n_trees)
+    forest.fit(X_transformed, y_new.to_numpy())
+    forest.set_params(warm_start=False)
+
+    if replace_oldest:
+        forest.estimators_ = forest.estimators_[n_trees:]
+        forest.n_estimators = len(forest.estimators_)
+    return Pipeline(model.steps[:-1] + [(model.steps[-1][0], forest)])
+
+
+def promote(model, model_path):
+    """
+    Ganti file model secara atomik, simpan versi sebelumnya sebagai *.prev.pkl
+    """
+    root, ext = os.path.splitext(model_path)
+    tmp_path = f'{root}.tmp{ext}'
+    joblib.dump(model, tmp_path)
+    if os.path.exists(model_path):
+        os.replace(model_path, f'{root}.prev{ext}')
+    os.replace(tmp_path, model_path)
+
+
+def update_info(info_path, metrics, refresh):
+    """
+    Update metrics di best_model_info.json dan catat refresh di `refreshes`
+    """
+    info = {}
+    if os.path.exists(info_path):
+        with open(info_path) as f:
+            info = json.load(f)
+    info['metrics'] = metrics
+    info.setdefault('refreshes', []).append(refresh)
+    with open(info_path, 'w') as f:
+        json.dump(info, f, indent=4)
+
+
+# ==================== MAIN ====================
+def main():
+    parser = argparse.ArgumentParser(description="Refresh inkremental model churn dari label baru")
+    parser.add_argument('new_data', help="CSV/Parquet batch label baru (19 fitur + Churn)")
+    parser.add_argument('--model', default='notebooks/best_churn_model.pkl')
+    parser.add_argument('--info', default='notebooks/best_model_info.json')
+    parser.add_argument('--trees', type=int, default=DEFAULT_NEW_TREES, help="Jumlah pohon baru")
+    parser.add_argument('--replace-oldest', action='store_true', help="Buang pohon tertua (ukuran forest tetap)")
+    parser.add_argument('--holdout', default=None, help="CSV/Parquet holdout (default: sebagian batch baru)")
+    parser.add_argument('--holdout-fraction', type=float, default=DEFAULT_HOLDOUT_FRACTION)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Penurunan maksimum accuracy/F1/recall di holdout (absolut)")
+    parser.add_argument('--history-dir', default=DEFAULT_HISTORY_DIR)
+    parser.add_argument('--dry-run', action='store_true', help="Evaluasi saja, jangan simpan apa pun")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    print("1. Loading model & batch baru...")
+    model = joblib.load(args.model)
+    X_new, y_new = load_training_data(args.new_data)
+    print(f"   Batch baru: {len(X_new):,} baris | forest: {len(model.steps[-1][1].estimators_)} pohon")
+
+    unknown = unknown_categories(model, X_new)
+    if unknown:
+        print(f"❌ Kategori baru ditemukan: {unknown}")
+        print("   Preprocessor harus di-fit ulang; jalankan training penuh dengan train.py")
+        raise SystemExit(1)
+
+    if args.holdout:
+        X_train, y_train = X_new, y_new
+        X_holdout, y_holdout = load_training_data(args.holdout)
+    else:
+        X_train, X_holdout, y_train, y_holdout = train_test_split(
+            X_new, y_new, test_size=args.holdout_fraction, random_state=RANDOM_STATE, stratify=y_new
+        )
+    print(f"   Train: {len(X_train):,} baris | Holdout: {len(X_holdout):,} baris")
+
+    print(f"\n2. Menambah {args.trees} pohon dari batch baru"
+          f"{' (pohon tertua dibuang)' if args.replace_oldest else ''}...")
+    refreshed = grow_forest(model, X_train, y_train, args.trees, args.replace_oldest)
+    refresh_seconds = time.perf_counter() - start
+    print(f"   Forest baru: {len(refreshed.steps[-1][1].estimators_)} pohon ({refresh_seconds:.1f} detik)")
+
+    print("\n3. Evaluasi di holdout...")
+    old_metrics = evaluate(model, X_holdout, y_holdout)
+    new_metrics = evaluate(refreshed, X_holdout, y_holdout)
+    for key in old_metrics:
+        print(f"   {key:>10}: {old_metrics[key]:.4f} -> {new_metrics[key]:.4f}")
+
+    if not within_tolerance(new_metrics, old_metrics, args.tolerance):
+        print(f"\n❌ Model baru tidak dipromosikan ({', '.join(GUARDED_METRICS)} turun > {args.tolerance})")
+        raise SystemExit(1)
+    if args.dry_run:
+        print("\n✅ Model baru lolos holdout (dry run, tidak ada yang disimpan)")
+        return
+
+    batch_path = archive_batch(X_new, y_new, args.history_dir)
+    promote(refreshed, args.model)
+    update_info(args.info, new_metrics, {
+        'refreshed_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'new_rows': int(len(X_new)),
+        'new_trees': args.trees,
+        'replace_oldest': args.replace_oldest,
+        'n_trees': len(refreshed.steps[-1][1].estimators_),
+        'holdout_metrics_before': old_metrics,
+        'batch_file': batch_path,
+    })
+    print(f"\n✅ Model baru dipromosikan ke {args.model} (batch diarsipkan di {batch_path})")
+
+
+if __name__ == '__main__':
+    main()
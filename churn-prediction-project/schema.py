@@ -0,0 +1,157 @@
+"""
+Schema input model: validasi + coercion DataFrame (atau batch Arrow) secara vectorized.
+
+Schema diturunkan dari pipeline yang sudah di-fit (sklearn Pipeline atau
+CompiledPipeline): urutan `feature_names_in_`, kolom numerik, dan kategori
+yang dikenal OneHotEncoder. Satu kali pass per kolom menghasilkan:
+
+- `data`   : DataFrame dengan urutan kolom model, numerik float64, kategori Categorical
+- `errors` : mask boolean per baris x kolom (True = nilai tidak valid)
+- `valid`  : mask baris yang boleh diprediksi
+
+Baris tidak valid dikarantina (tidak diprediksi), bukan membuat seluruh batch gagal.
+
+Aturan:
+- numerik: harus bisa di-parse dan berada dalam rentang VALID_RANGES: hanya nilai
+  yang mustahil (negatif, SeniorCitizen selain 0/1) yang ditolak. Batas slider di
+  app.py (NUMERIC_RANGES) bukan batas validitas; pelanggan > 72 bulan tetap diskor.
+- `TotalCharges` kosong (' ') boleh: jadi NaN lalu di-impute, sama seperti notebook
+- kategorikal: harus salah satu kategori yang dikenal encoder (tanpa spasi di tepi)
+- kolom yang tidak ada sama sekali -> ValueError (masalah schema, bukan per baris)
+"""
+import numpy as np
+import pandas as pd
+
+ERROR_COLUMN = 'validation_error'
+# (min, max) nilai yang mungkin secara fisik; bisa diganti lewat FeatureSchema(numeric_ranges=...)
+VALID_RANGES = {
+    'SeniorCitizen': (0, 1),
+    'tenure': (0, np.inf),
+    'MonthlyCharges': (0.0, np.inf),
+    'TotalCharges': (0.0, np.inf),
+}
+NULLABLE_COLUMNS = ['TotalCharges']
+
+
+def _is_arrow(data):
+    return type(data).__module__.startswith('pyarrow')
+
+
+class ValidationResult:
+    """
+    Hasil FeatureSchema.validate()
+    """
+
+    def __init__(self, data, errors):
+        self.data = data
+        self.errors = errors
+        self.valid = ~errors.any(axis=1).to_numpy()
+
+    @property
+    def n_invalid(self):
+        return int((~self.valid).sum())
+
+    def reasons(self):
+        """
+        Series teks alasan per baris ('' untuk baris valid), mis. 'tenure; Contract'
+        """
+        text = pd.Series('', index=self.errors.index, dtype=object)
+        if self.n_invalid:
+            labels = np.array([f'{col}; ' for col in self.errors.columns], dtype=object)
+            invalid_rows = self.errors.to_numpy(dtype=object)[~self.valid]
+            text[~self.valid] = [t.rstrip('; ') for t in invalid_rows @ labels]
+        return text
+
+
+class FeatureSchema:
+    """
+    Kolom, tipe, kategori, dan rentang yang diterima model
+    """
+
+    def __init__(self, feature_names, numeric_columns, categories, numeric_ranges=VALID_RANGES,
+                 nullable_columns=NULLABLE_COLUMNS):
+        self.feature_names = list(feature_names)
+        self.numeric_columns = list(numeric_columns)
+        self.categories = {col: list(values) for col, values in categories.items()}
+        self.numeric_ranges = dict(numeric_ranges or {})
+        self.nullable_columns = list(nullable_columns)
+
+    @classmethod
+    def from_model(cls, model, **kwargs):
+        """
+        Schema dari pipeline yang sudah di-fit, atau None jika tidak bisa diturunkan
+        """
+        if hasattr(model, 'numeric_columns') and hasattr(model, 'meta'):
+            # CompiledPipeline (fast_scorer.py)
+            categories = dict(zip(model.categorical_columns, model.meta['categories']))
+            return cls(model.feature_names_in_, model.numeric_columns, categories, **kwargs)
+
+        steps = getattr(model, 'steps', None)
+        preprocessor = steps[0][1] if steps else None
+        if not hasattr(preprocessor, 'transformers_') or not hasattr(model, 'feature_names_in_'):
+            return None
+
+        numeric_columns, categories = [], {}
+        for _, transformer, columns in preprocessor.transformers_:
+            if isinstance(transformer, str):
+                continue  # 'drop' / 'passthrough'
+            last_step = transformer.steps[-1][1] if hasattr(transformer, 'steps') else transformer
+            if hasattr(last_step, 'categories_'):
+                categories.update(zip(columns, last_step.categories_))
+            else:
+                numeric_columns.extend(columns)
+        return cls(model.feature_names_in_, numeric_columns, categories, **kwargs)
+
+    def missing_columns(self, data):
+        return [col for col in self.feature_names if col not in data.columns]
+
+    def validate(self, data):
+        """
+        Validasi + coercion seluruh DataFrame / pyarrow Table / RecordBatch sekaligus
+        """
+        if _is_arrow(data):
+            data = data.to_pandas()
+        missing_cols = self.missing_columns(data)
+        if missing_cols:
+            raise ValueError(f"Kolom hilang di input: {missing_cols}")
+
+        coerced = {}
+        errors = {}
+        for col in self.feature_names:
+            values = data[col]
+            if col in self.categories:
+                allowed = self.categories[col]
+                if all(isinstance(v, str) for v in allowed):
+                    # Cek hanya nilai unik (beberapa per kolom), lalu sebarkan lewat kode;
+                    # hasilnya Categorical dengan kategori encoder (kode -1 = tidak valid/NaN)
+                    codes, uniques = pd.factorize(values)
+                    positions = pd.Index(allowed).get_indexer(pd.Index(uniques.astype(str)).str.strip())
+                    category_codes = np.append(positions, -1)[codes]
+                    errors[col] = category_codes < 0
+                    coerced[col] = pd.Categorical.from_codes(category_codes, categories=allowed)
+                else:
+                    errors[col] = ~values.isin(allowed).to_numpy(dtype=bool)
+                    coerced[col] = values.where(~errors[col], None)
+                continue
+
+            if pd.api.types.is_numeric_dtype(values):
+                numbers = values.astype('float64')
+                unparseable = np.zeros(len(values), dtype=bool)
+            else:
+                text = values.astype('string').str.strip()
+                blank = text.isna() | (text == '')
+                numbers = pd.to_numeric(text.where(~blank), errors='coerce').astype('float64')
+                unparseable = (numbers.isna() & ~blank).to_numpy(dtype=bool)
+
+            invalid = unparseable | np.isinf(numbers.to_numpy())
+            if col not in self.nullable_columns:
+                invalid = invalid | numbers.isna().to_numpy()
+            if col in self.numeric_ranges:
+                low, high = self.numeric_ranges[col]
+                invalid = invalid | ((numbers < low) | (numbers > high)).to_numpy()
+            errors[col] = invalid
+            coerced[col] = numbers
+
+        index = data.index
+        return ValidationResult(pd.DataFrame(coerced, index=index)[self.feature_names],
+                                pd.DataFrame(errors, index=index)[self.feature_names])
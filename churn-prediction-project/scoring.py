@@ -0,0 +1,48 @@
+"""
+Fungsi scoring bersama untuk semua entry point (Streamlit, batch, script test).
+
+Pipeline (ColumnTransformer + RandomForest) cukup dijalankan SEKALI lewat
+`predict_proba`; label diturunkan dari probabilitas tersebut dengan threshold
+yang bisa diatur, jadi tidak perlu memanggil `predict` lagi.
+"""
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.5
+
+
+def churn_class_index(model):
+    """
+    Index kolom probabilitas untuk kelas churn (label 1)
+    """
+    classes = list(getattr(model, 'classes_', [0, 1]))
+    return classes.index(1) if 1 in classes else len(classes) - 1
+
+
+def predict_churn(model, X, threshold=DEFAULT_THRESHOLD):
+    """
+    Hitung probabilitas churn dan label sekaligus dalam satu kali predict_proba.
+
+    Label = 1 jika probabilitas churn > threshold. Dengan threshold 0.5
+    hasilnya sama dengan `model.predict(X)`. Turunkan threshold untuk
+    menaikkan recall, naikkan untuk menaikkan precision.
+
+    Return tuple (churn_probabilities, labels), keduanya numpy array 1D.
+    """
+    return split_probabilities(model, model.predict_proba(X), threshold)
+
+
+def split_probabilities(model, probabilities, threshold=DEFAULT_THRESHOLD):
+    """
+    Ubah matrix hasil `predict_proba` jadi (churn_probabilities, labels)
+    """
+    churn_probabilities = probabilities[:, churn_class_index(model)]
+    return churn_probabilities, apply_threshold(churn_probabilities, threshold)
+
+
+def apply_threshold(churn_probabilities, threshold=DEFAULT_THRESHOLD):
+    """
+    Label 1 jika probabilitas churn > threshold
+    """
+    if not 0.0 <= threshold <= 1.0:
+        raise ValueError(f"Threshold harus di antara 0 dan 1, bukan {threshold}")
+    return (np.asarray(churn_probabilities) > threshold).astype(np.int64)
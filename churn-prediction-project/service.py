@@ -0,0 +1,358 @@
+"""
+HTTP scoring service (ASGI) untuk sistem lain, misalnya CRM.
+
+Model `best_churn_model.pkl` di-load sekali saat startup. Request yang datang
+bersamaan dikumpulkan oleh `MicroBatcher` lalu diprediksi dalam SATU kali
+`predict_proba` (vectorized), kemudian hasilnya dibagi lagi per request.
+
+Menjalankan server (beberapa worker):
+    python service.py --model best_churn_model.pkl --workers 4
+    python service.py --model model_artifact/ --workers 4   # artifact mmap, lebih cepat
+
+atau langsung dengan uvicorn:
+    CHURN_MODEL_PATH=best_churn_model.pkl uvicorn service:app --workers 4
+
+Latency per tahap (imputer, scaler, onehot, classifier) bisa diaktifkan dengan
+`CHURN_INSTRUMENTATION=1` (atau `--instrument`), lalu dibaca di `/metrics`
+(format Prometheus, `?format=json` untuk JSON). Lihat instrumentation.py.
+
+Jika ada baseline drift (`CHURN_DRIFT_BASELINE` atau notebooks/drift_baseline.json),
+semua record yang diprediksi ikut dihitung oleh DriftMonitor; laporannya di `/drift`.
+
+Test lokal tanpa server (in-process):
+    from starlette.testclient import TestClient
+    with TestClient(create_app('best_churn_model.pkl')) as client:
+        client.post('/predict', json={'records': [customer]})
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from batch_scoring import get_feature_columns, prepare_features
+from drift_monitor import DriftMonitor, find_baseline_path, load_baseline
+from fast_scorer import CompiledPipeline
+from instrumentation import PipelineInstrumentation, instrument, timed
+from model_artifact import is_artifact, load_artifact, model_checksum
+from prediction_cache import DEFAULT_MAX_SIZE, PredictionCache, row_key
+from scoring import DEFAULT_THRESHOLD, apply_threshold, split_probabilities
+
+DEFAULT_MODEL_PATH = 'best_churn_model.pkl'
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS = 2.0
+INSTRUMENTATION_ENV = 'CHURN_INSTRUMENTATION'
+
+logger = logging.getLogger(__name__)
+
+
+def load_model_for_serving(path):
+    """
+    Load model untuk serving.
+
+    Jika `path` adalah folder artifact (lihat model_artifact.py), yang dipakai
+    adalah compiled scorer dengan array di-mmap: cold start cepat, memori
+    dibagi antar worker, dan latency per request kecil.
+
+    Jika `path` adalah file .pkl, pipeline di-load dan n_jobs=1 di-set pada classifier.
+
+    Model dari notebook 04 memakai n_jobs=-1, sehingga setiap worker akan
+    membuat thread sebanyak jumlah core. Dengan beberapa worker, core jadi
+    rebutan. Paralelisme didapat dari jumlah worker server, bukan dari
+    thread di dalam satu request.
+    """
+    if is_artifact(path):
+        return load_artifact(path, mmap_mode='r')
+
+    model = joblib.load(path)
+    estimator = model.steps[-1][1] if hasattr(model, 'steps') else model
+    if 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=1)
+    return model
+
+
+class MicroBatcher:
+    """
+    Gabungkan record dari banyak request menjadi satu batch prediksi.
+
+    Batch diproses ketika sudah berisi `max_batch_size` baris atau setelah
+    menunggu `max_wait_ms` milidetik sejak record pertama masuk.
+    """
+
+    def __init__(self, model, feature_columns, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, instrumentation=None):
+        self.model = instrument(model, instrumentation)
+        self.feature_columns = feature_columns
+        self.instrumentation = instrumentation
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def submit(self, records):
+        """
+        Masukkan list record ke antrian, return matrix probabilitas untuk record tsb
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        return await future
+
+    async def _collect(self):
+        items = [await self._queue.get()]
+        rows = len(items[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while rows < self.max_batch_size:
+            # Ambil semua yang sudah ada di antrian tanpa menunggu
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            items.append(item)
+            rows += len(item[0])
+        return items
+
+    def _predict(self, records):
+        if isinstance(self.model, CompiledPipeline):
+            # Compiled scorer menerima list of dict langsung, tanpa DataFrame
+            return self.model.predict_proba(records)
+        with timed(self.instrumentation, 'dataframe', len(records)):
+            features = prepare_features(pd.DataFrame.from_records(records), self.feature_columns)
+        return self.model.predict_proba(features)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            records = [record for batch, _ in items for record in batch]
+            try:
+                # predict_proba di thread terpisah supaya event loop tetap menerima request
+                probabilities = await loop.run_in_executor(None, self._predict, records)
+            except Exception as e:
+                if len(items) == 1:
+                    if not items[0][1].done():
+                        items[0][1].set_exception(e)
+                    continue
+                # Satu request yang rusak tidak boleh menggagalkan request lain di batch:
+                # prediksi ulang per request, hanya request yang gagal yang dapat error
+                await self._predict_separately(items)
+                continue
+
+            offset = 0
+            for batch, future in items:
+                if not future.done():
+                    future.set_result(probabilities[offset:offset + len(batch)])
+                offset += len(batch)
+
+    async def _predict_separately(self, items):
+        loop = asyncio.get_running_loop()
+        for batch, future in items:
+            try:
+                probabilities = await loop.run_in_executor(None, self._predict, batch)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(probabilities)
+
+
+def _parse_records(payload):
+    """
+    Terima {"records": [...]}, list record, atau satu record (dict)
+    """
+    if isinstance(payload, dict):
+        payload = payload.get('records', [payload])
+    if not isinstance(payload, list) or not all(isinstance(r, dict) for r in payload):
+        raise ValueError("Body harus berupa {'records': [ {...}, ... ]}")
+    return payload
+
+
+async def _churn_probabilities(state, records):
+    """
+    Ambil probabilitas dari cache; hanya record yang belum ada dikirim ke batcher
+    """
+    cache = state.cache
+    if cache is None or state.feature_columns is None:
+        probabilities = await state.batcher.submit(records)
+        return split_probabilities(state.model, probabilities)[0]
+
+    keys = [row_key([record[col] for col in state.feature_columns]) for record in records]
+    churn_proba = np.empty(len(records), dtype=np.float64)
+    missing = []
+    for i, key in enumerate(keys):
+        value = cache.get(key)
+        if value is None:
+            missing.append(i)
+        else:
+            churn_proba[i] = value
+
+    if missing:
+        probabilities = await state.batcher.submit([records[i] for i in missing])
+        predicted = split_probabilities(state.model, probabilities)[0]
+        for i, value in zip(missing, predicted):
+            churn_proba[i] = value
+            cache.put(keys[i], float(value))
+    return churn_proba
+
+
+async def predict(request):
+    state = request.app.state
+    try:
+        records = _parse_records(await request.json())
+        threshold = float(request.query_params.get('threshold', DEFAULT_THRESHOLD))
+        # Dicek sebelum scoring: threshold salah tidak perlu memakai slot micro-batch
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError(f"Threshold harus di antara 0 dan 1, bukan {threshold}")
+    except ValueError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+    if not records:
+        return JSONResponse({'predictions': []})
+
+    if state.feature_columns is not None:
+        required = set(state.feature_columns)
+        for i, record in enumerate(records):
+            missing_cols = required.difference(record)
+            if missing_cols:
+                return JSONResponse(
+                    {'error': f"Record {i}: kolom hilang {sorted(missing_cols)}"},
+                    status_code=422,
+                )
+
+    try:
+        churn_proba = await _churn_probabilities(state, records)
+        labels = apply_threshold(churn_proba, threshold)
+    except Exception as e:
+        return JSONResponse({'error': f"Error saat prediksi: {str(e)}"}, status_code=422)
+    if state.drift is not None:
+        # Monitoring saja: prediksi yang sudah berhasil tetap dikembalikan
+        try:
+            state.drift.update(pd.DataFrame.from_records(records), churn_proba)
+        except Exception:
+            logger.exception("Gagal update drift monitor")
+
+    return JSONResponse({
+        'predictions': [
+            {'churn_probability': float(p), 'churn_prediction': int(label)}
+            for p, label in zip(churn_proba, labels)
+        ],
+        'threshold': threshold,
+    })
+
+
+async def health(request):
+    state = request.app.state
+    return JSONResponse({
+        'status': 'ok',
+        'model_path': state.model_path,
+        'features': len(state.feature_columns) if state.feature_columns is not None else None,
+        'cache': state.cache.stats() if state.cache is not None else None,
+    })
+
+
+async def drift(request):
+    monitor = request.app.state.drift
+    if monitor is None:
+        return JSONResponse({'error': "Baseline drift tidak ditemukan (lihat drift_monitor.py)"},
+                            status_code=404)
+    return JSONResponse(monitor.report())
+
+
+async def metrics(request):
+    instrumentation = request.app.state.instrumentation
+    if instrumentation is None:
+        return JSONResponse({'error': f"Instrumentasi nonaktif (set {INSTRUMENTATION_ENV}=1)"},
+                            status_code=404)
+    if request.query_params.get('format') == 'json':
+        return PlainTextResponse(instrumentation.to_json(), media_type='application/json')
+    return PlainTextResponse(instrumentation.to_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+def create_app(model_path=None, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+               cache_size=DEFAULT_MAX_SIZE, instrumentation=None):
+    """
+    Buat aplikasi ASGI. Model di-load sekali di lifespan startup.
+
+    `cache_size=0` mematikan cache prediksi. `instrumentation=True` (atau env
+    CHURN_INSTRUMENTATION=1) mengukur latency per tahap untuk `/metrics`.
+    """
+    model_path = model_path or os.environ.get('CHURN_MODEL_PATH', DEFAULT_MODEL_PATH)
+    if instrumentation is None:
+        instrumentation = os.environ.get(INSTRUMENTATION_ENV, '') not in ('', '0')
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        model = load_model_for_serving(model_path)
+        app.state.model = model
+        app.state.model_path = model_path
+        app.state.feature_columns = get_feature_columns(model)
+        app.state.instrumentation = PipelineInstrumentation() if instrumentation else None
+        baseline_path = find_baseline_path()
+        app.state.drift = DriftMonitor(load_baseline(baseline_path)) if baseline_path else None
+        app.state.cache = None
+        if cache_size:
+            app.state.cache = PredictionCache(max_size=cache_size)
+            app.state.cache.bind_model(model_checksum(model_path))
+        app.state.batcher = MicroBatcher(model, app.state.feature_columns,
+                                         max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                                         instrumentation=app.state.instrumentation)
+        await app.state.batcher.start()
+        yield
+        await app.state.batcher.stop()
+
+    return Starlette(
+        routes=[
+            Route('/health', health, methods=['GET']),
+            Route('/predict', predict, methods=['POST']),
+            Route('/metrics', metrics, methods=['GET']),
+            Route('/drift', drift, methods=['GET']),
+        ],
+        lifespan=lifespan,
+    )
+
+
+app = create_app()
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="HTTP scoring service untuk model churn")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="Path ke best_churn_model.pkl atau folder artifact")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--instrument', action='store_true', help="Ukur latency per tahap (lihat /metrics)")
+    args = parser.parse_args()
+
+    # Worker uvicorn mengimport `service:app`, jadi path model dikirim lewat env
+    os.environ['CHURN_MODEL_PATH'] = args.model
+    if args.instrument:
+        os.environ[INSTRUMENTATION_ENV] = '1'
+    uvicorn.run('service:app', host=args.host, port=args.port, workers=args.workers)
@@ -0,0 +1,472 @@
+"""
+Training Random Forest dari data yang lebih besar dari RAM (streaming + memmap).
+
+train.py memuat seluruh dataset ke satu DataFrame, lalu ColumnTransformer
+membuat matrix one-hot dense float64 di memori. Di sini data dibaca per chunk
+(`data_loader.iter_batches`, CSV atau Parquet) dalam dua pass:
+
+1. Pass statistik: jumlah baris, vocabulary kategori, mean/varians numerik
+   (eksak, digabung per chunk) dan sampel acak SAMPLE_ROWS baris train untuk
+   median imputer (eksak jika data train <= SAMPLE_ROWS) dan bin baseline drift
+2. Pass encoding: tiap chunk di-transform dengan preprocessor hasil pass 1 lalu
+   ditulis ke file .npy memmap: fitur float32 (dtype yang dipakai forest, jadi
+   tidak disalin saat fit) dan label uint8
+
+Forest di-fit langsung dari memmap secara bertahap (warm start, hasilnya identik
+dengan fit sekaligus) sambil memori dipantau. Model akhir tetap Pipeline
+(preprocessor + classifier) yang sama dengan train.py, jadi app.py,
+batch_scoring.py, dst. tidak perlu diubah.
+
+Budget memori (--memory-budget-mb) menentukan ukuran chunk, jumlah thread
+forest, dan jika perlu `max_samples` (bootstrap per pohon lebih kecil). Memori
+diukur sebagai RssAnon (/proc/self/status): halaman memmap tidak dihitung
+karena bisa dibuang kernel kapan saja. Peak di atas budget -> MemoryError.
+
+    python stream_train.py --data ../data/customer_history.parquet --output-dir notebooks \\
+        --memory-budget-mb 2048 --params '{"n_estimators": 200, "max_depth": 20}'
+"""
+import argparse
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+
+from data_loader import DEFAULT_ROW_GROUP_SIZE, LABEL_COLUMN, clean_frame, iter_batches
+from drift_monitor import DriftMonitor, baseline_bins, fill_baseline_counts, save_baseline
+from scoring import predict_churn
+from telco_features import FEATURE_COLUMNS
+from train import (DEFAULT_DATA_PATH, RANDOM_STATE, build_preprocessor, classification_metrics, save_outputs,
+                   split_feature_types)
+
+MB = 1024 * 1024
+DEFAULT_MEMORY_BUDGET_MB = 2048
+DEFAULT_TEST_SIZE = 0.2
+SAMPLE_ROWS = 50_000
+TREE_BATCH = 10  # pohon per langkah warm start (memori dicek di antaranya)
+
+# Estimasi memori (byte), sengaja konservatif
+CHUNK_BYTES_PER_ROW = 4096     # parsing CSV + kolom kategori + hasil transform float64
+CHUNK_BUDGET_FRACTION = 0.25
+MIN_CHUNK_ROWS = 1_000
+MIN_MAX_SAMPLES = 1_000
+SHARED_BYTES_PER_ROW = 16      # label float64 + kode kelas, dipakai bersama semua pohon
+JOB_BYTES_PER_ROW = 24         # per pohon yang sedang di-fit: sample_weight + bincount bootstrap (semua baris)
+JOB_BYTES_PER_SAMPLE = 24      # per pohon: indeks sampel + buffer nilai fitur
+NODE_BYTES = 80                # struct node (64) + value 2 kelas float64 (16)
+
+
+# ==================== MEMORI ====================
+def anon_memory():
+    """
+    Memori anonim proses (byte): RssAnon di Linux, fallback peak RSS
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryTracker:
+    """
+    Sampling memori di background thread: peak total & per stage, dicek terhadap budget
+    """
+
+    def __init__(self, budget_bytes, interval=0.01):
+        self.budget_bytes = budget_bytes
+        self.interval = interval
+        self.start_bytes = anon_memory()
+        self.peak_bytes = self.start_bytes
+        self.stage_peaks = {}
+        self._stage = 'start'
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        current = anon_memory()
+        self.peak_bytes = max(self.peak_bytes, current)
+        self.stage_peaks[self._stage] = max(self.stage_peaks.get(self._stage, 0), current)
+        return current
+
+    def stage(self, name):
+        self._sample()
+        self._stage = name
+
+    def available(self):
+        return self.budget_bytes - self._sample()
+
+    def check(self):
+        """
+        MemoryError jika peak sudah melewati budget
+        """
+        self._sample()
+        if self.peak_bytes > self.budget_bytes:
+            raise MemoryError(f"Peak memori {self.peak_bytes / MB:.0f} MB melewati budget "
+                              f"{self.budget_bytes / MB:.0f} MB (stage {self._stage})")
+
+    def report(self):
+        return {
+            'budget_mb': round(self.budget_bytes / MB, 1),
+            'start_mb': round(self.start_bytes / MB, 1),
+            'peak_mb': round(self.peak_bytes / MB, 1),
+            'stages_peak_mb': {stage: round(value / MB, 1) for stage, value in self.stage_peaks.items()},
+        }
+
+
+def plan_chunk_rows(available_bytes):
+    """
+    Baris per chunk agar satu chunk memakai <= CHUNK_BUDGET_FRACTION dari sisa budget
+    """
+    rows = int(available_bytes * CHUNK_BUDGET_FRACTION / CHUNK_BYTES_PER_ROW)
+    if rows < MIN_CHUNK_ROWS:
+        raise MemoryError(f"Budget memori terlalu kecil untuk chunk {MIN_CHUNK_ROWS:,} baris")
+    return min(rows, DEFAULT_ROW_GROUP_SIZE)
+
+
+def forest_memory(n_rows, n_samples, params, n_jobs):
+    """
+    Estimasi memori (byte) fit forest: `n_samples` bootstrap per pohon, `n_jobs` pohon paralel
+    """
+    leaf = params.get('min_samples_leaf', 1)
+    if isinstance(leaf, float):
+        leaf = max(1, math.ceil(leaf * n_samples))
+    nodes = 2 * n_samples / leaf
+    if params.get('max_depth'):
+        nodes = min(nodes, 2 ** (params['max_depth'] + 1))
+    n_estimators = params.get('n_estimators', 100)
+    return (n_rows * SHARED_BYTES_PER_ROW
+            + n_jobs * (n_rows * JOB_BYTES_PER_ROW + n_samples * JOB_BYTES_PER_SAMPLE)
+            + (n_estimators + n_jobs) * nodes * NODE_BYTES)
+
+
+def plan_forest(n_rows, params, available_bytes, n_jobs):
+    """
+    (n_jobs, max_samples) terbesar yang muat di budget; max_samples None = semua baris
+    """
+    n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    while n_jobs > 1 and forest_memory(n_rows, MIN_MAX_SAMPLES, params, n_jobs) > available_bytes:
+        n_jobs -= 1
+    if forest_memory(n_rows, n_rows, params, n_jobs) <= available_bytes:
+        return n_jobs, None
+    if forest_memory(n_rows, MIN_MAX_SAMPLES, params, n_jobs) > available_bytes:
+        raise MemoryError(f"Budget memori terlalu kecil untuk forest dari {n_rows:,} baris")
+    if not params.get('bootstrap', True):
+        raise MemoryError("Forest penuh tidak muat di budget dan max_samples butuh bootstrap=True")
+    low, high = MIN_MAX_SAMPLES, n_rows
+    while low < high:
+        mid = (low + high + 1) // 2
+        if forest_memory(n_rows, mid, params, n_jobs) <= available_bytes:
+            low = mid
+        else:
+            high = mid - 1
+    return n_jobs, low
+
+
+# ==================== PASS 1: STATISTIK ====================
+def _iter_split(path, chunk_rows, test_size):
+    """
+    Yield (chunk, is_test); pembagian train/test deterministik, sama di setiap pass
+    """
+    rng = np.random.default_rng(RANDOM_STATE)
+    for chunk in iter_batches(path, columns=FEATURE_COLUMNS + [LABEL_COLUMN], batch_size=chunk_rows):
+        yield chunk, rng.random(len(chunk)) < test_size
+
+
+def _merge_moments(moments, values):
+    """
+    Gabungkan (n, mean, M2) dengan satu batch nilai (rumus paralel Chan et al.)
+    """
+    if values.size == 0:
+        return
+    n_a, mean_a, m2_a = moments
+    n_b, mean_b = values.size, float(values.mean())
+    m2_b = float(((values - mean_b) ** 2).sum())
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    moments[:] = [n, mean_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n]
+
+
+def collect_statistics(path, chunk_rows, test_size=DEFAULT_TEST_SIZE, sample_rows=SAMPLE_ROWS, tracker=None):
+    """
+    Pass 1: jumlah baris, vocabulary, momen numerik, dan sampel acak baris train
+    """
+    rng = np.random.default_rng(RANDOM_STATE + 1)
+    stats = {'n_train': 0, 'n_test': 0, 'vocab': {}, 'has_missing': {}, 'moments': {}, 'missing': {}}
+    numeric = categorical = None
+    sample, sample_keys = None, None
+    for chunk, is_test in _iter_split(path, chunk_rows, test_size):
+        train = chunk.loc[~is_test, FEATURE_COLUMNS]
+        stats['n_train'] += len(train)
+        stats['n_test'] += int(is_test.sum())
+        if numeric is None:
+            numeric, categorical = split_feature_types(train)
+        for col in categorical:
+            stats['vocab'].setdefault(col, set()).update(train[col].dropna().unique())
+            stats['has_missing'][col] = stats['has_missing'].get(col, False) or bool(train[col].isna().any())
+        for col in numeric:
+            values = train[col].to_numpy(dtype=np.float64)
+            present = values[~np.isnan(values)]
+            _merge_moments(stats['moments'].setdefault(col, [0, 0.0, 0.0]), present)
+            stats['missing'][col] = stats['missing'].get(col, 0) + values.size - present.size
+
+        # Sampel = sample_rows baris dengan key acak terkecil (sampel seragam tanpa pengembalian);
+        # setelah sampel penuh hanya baris dengan key di bawah key terbesar sampel yang ikut dibandingkan
+        keys = rng.random(len(train))
+        if sample is not None and len(sample) >= sample_rows:
+            keep = keys < sample_keys[-1]
+            train, keys = train[keep], keys[keep]
+        if sample is not None:
+            train = pd.concat([sample, train])
+            keys = np.concatenate([sample_keys, keys])
+        order = np.argsort(keys, kind='stable')[:sample_rows]
+        # concat kategori dengan kategori berbeda jadi object; kembalikan ke dtype ringkas
+        sample, sample_keys = clean_frame(train.iloc[order]), keys[order]
+        if tracker is not None:
+            tracker.check()
+
+    stats['numeric'], stats['categorical'] = numeric, categorical
+    stats['vocab'] = {col: sorted(values) for col, values in stats['vocab'].items()}
+    stats['sample'] = sample
+    return stats
+
+
+def build_streamed_preprocessor(stats):
+    """
+    ColumnTransformer train.py dengan statistik pass 1, tanpa fit ke seluruh data
+    """
+    numeric, categorical, sample = stats['numeric'], stats['categorical'], stats['sample']
+    # Frame kecil berisi seluruh vocabulary (+ NaN jika ada nilai kosong): fit di sini
+    # menghasilkan categories_ one-hot yang sama dengan fit di seluruh data train
+    levels = {col: stats['vocab'][col] + ([np.nan] if stats['has_missing'][col] else []) for col in categorical}
+    n_levels = max(len(values) for values in levels.values())
+    frame = sample.iloc[np.zeros(n_levels, dtype=int)].reset_index(drop=True)
+    for col, values in levels.items():
+        frame[col] = pd.Series(np.resize(np.array(values, dtype=object), n_levels), dtype='category')
+    preprocessor = build_preprocessor(numeric, categorical).fit(frame)
+
+    medians = sample[numeric].median().to_numpy(dtype=np.float64)
+    means, variances = [], []
+    for col, median in zip(numeric, medians):
+        n_present, mean, m2 = stats['moments'][col]
+        n_missing = stats['missing'][col]
+        # Scaler melihat data setelah imputasi: nilai kosong = kelompok bernilai median (varians 0)
+        n = n_present + n_missing
+        delta = median - mean
+        means.append(mean + delta * n_missing / n)
+        variances.append((m2 + delta ** 2 * n_present * n_missing / n) / n)
+
+    numeric_steps = preprocessor.named_transformers_['num'].named_steps
+    numeric_steps['imputer'].statistics_ = medians
+    scaler = numeric_steps['scaler']
+    scaler.mean_ = np.array(means)
+    scaler.var_ = np.array(variances)
+    scaler.scale_ = np.where(scaler.var_ == 0, 1.0, np.sqrt(scaler.var_))
+    scaler.n_samples_seen_ = stats['n_train']
+    return preprocessor
+
+
+# ==================== PASS 2: ENCODING ====================
+def encode_to_memmap(path, preprocessor, stats, work_dir, chunk_rows, test_size=DEFAULT_TEST_SIZE,
+                     monitor=None, tracker=None):
+    """
+    Pass 2: transform per chunk ke .npy memmap. Return {'train': (X, y), 'test': (X, y)}
+    """
+    n_features = len(preprocessor.get_feature_names_out())
+    arrays = {}
+    for split in ('train', 'test'):
+        n_rows = stats[f'n_{split}']
+        arrays[split] = (
+            np.lib.format.open_memmap(os.path.join(work_dir, f'X_{split}.npy'), mode='w+',
+                                      dtype=np.float32, shape=(n_rows, n_features)),
+            np.lib.format.open_memmap(os.path.join(work_dir, f'y_{split}.npy'), mode='w+',
+                                      dtype=np.uint8, shape=(n_rows,)),
+        )
+
+    offsets = {'train': 0, 'test': 0}
+    for chunk, is_test in _iter_split(path, chunk_rows, test_size):
+        for split, mask in (('train', ~is_test), ('test', is_test)):
+            part = chunk[mask]
+            if part.empty:
+                continue
+            X, y = arrays[split]
+            start, end = offsets[split], offsets[split] + len(part)
+            X[start:end] = preprocessor.transform(part[FEATURE_COLUMNS])
+            y[start:end] = part[LABEL_COLUMN].to_numpy()
+            offsets[split] = end
+            if split == 'train' and monitor is not None:
+                monitor.update(part[FEATURE_COLUMNS])
+        if tracker is not None:
+            tracker.check()
+
+    for X, y in arrays.values():
+        X.flush()
+        y.flush()
+    return arrays
+
+
+# ==================== FOREST ====================
+def fit_forest(X, y, params, n_jobs, max_samples=None, tracker=None, batch=TREE_BATCH, verbose=True):
+    """
+    Fit forest dari memmap, TREE_BATCH pohon per langkah warm start
+    """
+    params = dict(params)
+    n_estimators = params.pop('n_estimators', 100)
+    if max_samples is not None:
+        params['max_samples'] = max_samples
+    forest = RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=n_jobs, warm_start=True, **params)
+    for n_trees in range(min(batch, n_estimators), n_estimators + batch, batch):
+        forest.set_params(n_estimators=min(n_trees, n_estimators))
+        forest.fit(X, y)
+        if tracker is not None:
+            tracker.check()
+        if verbose:
+            print(f"   {len(forest.estimators_)}/{n_estimators} pohon"
+                  + (f" | peak {tracker.peak_bytes / MB:.0f} MB" if tracker is not None else ""))
+        if len(forest.estimators_) >= n_estimators:
+            break
+    # Sama dengan train.build_pipeline untuk prediksi
+    return forest.set_params(warm_start=False, n_jobs=-1)
+
+
+def evaluate_memmap(forest, X, y, chunk_rows, monitor=None):
+    """
+    Metrics test set per chunk; probabilitas juga masuk ke monitor (baseline skor drift)
+    """
+    y_pred = np.empty(len(y), dtype=np.uint8)
+    for start in range(0, len(y), chunk_rows):
+        probabilities, y_pred[start:start + chunk_rows] = predict_churn(forest, X[start:start + chunk_rows])
+        if monitor is not None:
+            monitor.update(probabilities=probabilities)
+    return classification_metrics(y, y_pred)
+
+
+# ==================== PIPELINE ====================
+def stream_train(path, params=None, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, test_size=DEFAULT_TEST_SIZE,
+                 work_dir=None, keep_work_dir=False, n_jobs=-1, verbose=True):
+    """
+    Dua pass streaming + fit forest dari memmap.
+
+    Return dict: model (Pipeline), metrics, baseline (drift), memory, shape, forest_plan, elapsed.
+    """
+    params = dict(params or {})
+    start_time = time.perf_counter()
+    work_dir = tempfile.mkdtemp(prefix='churn_stream_', dir=work_dir)
+    try:
+        with MemoryTracker(memory_budget_mb * MB) as tracker:
+            chunk_rows = plan_chunk_rows(tracker.available())
+            if verbose:
+                print(f"   Budget {memory_budget_mb} MB | chunk {chunk_rows:,} baris | memmap di {work_dir}")
+
+            tracker.stage('statistik')
+            stats = collect_statistics(path, chunk_rows, test_size, tracker=tracker)
+            preprocessor = build_streamed_preprocessor(stats)
+            baseline = baseline_bins(stats['sample'])
+            monitor = DriftMonitor(baseline)
+            if verbose:
+                print(f"   Pass 1: {stats['n_train']:,} baris train, {stats['n_test']:,} baris test")
+
+            tracker.stage('encoding')
+            arrays = encode_to_memmap(path, preprocessor, stats, work_dir, chunk_rows, test_size,
+                                      monitor=monitor, tracker=tracker)
+            X_train, y_train = arrays['train']
+            if verbose:
+                print(f"   Pass 2: fitur {X_train.shape} float32 "
+                      f"({X_train.nbytes / MB:.0f} MB di disk, bukan di RAM)")
+
+            tracker.stage('forest')
+            n_jobs, max_samples = plan_forest(len(y_train), params, tracker.available(), n_jobs)
+            if verbose:
+                print(f"   Forest: {n_jobs} thread, max_samples={max_samples or 'semua baris'}")
+            forest = fit_forest(X_train, y_train, params, n_jobs, max_samples, tracker, verbose=verbose)
+
+            tracker.stage('evaluasi')
+            metrics = evaluate_memmap(forest, *arrays['test'], chunk_rows, monitor=monitor)
+            del arrays, X_train, y_train
+    finally:
+        if keep_work_dir:
+            print(f"   Memmap disimpan di {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'model': Pipeline([('preprocessor', preprocessor), ('classifier', forest)]),
+        'metrics': metrics,
+        'baseline': fill_baseline_counts(baseline, monitor),
+        'memory': tracker.report(),
+        'shape': (stats['n_train'] + stats['n_test'], len(FEATURE_COLUMNS)),
+        'forest_plan': {'n_jobs': n_jobs, 'max_samples': max_samples, 'chunk_rows': chunk_rows},
+        'elapsed': time.perf_counter() - start_time,
+    }
+
+
+# ==================== MAIN ====================
+def main():
+    parser = argparse.ArgumentParser(description="Training model churn dari data besar (streaming + memmap)")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help="CSV atau Parquet (lihat data_loader.py)")
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--params', default=None,
+                        help="Parameter RandomForest: JSON, atau path best_model_info.json (key best_params)")
+    parser.add_argument('--memory-budget-mb', type=int, default=DEFAULT_MEMORY_BUDGET_MB)
+    parser.add_argument('--test-size', type=float, default=DEFAULT_TEST_SIZE)
+    parser.add_argument('--work-dir', default=None, help="Lokasi file memmap (default: direktori temp)")
+    parser.add_argument('--keep-work-dir', action='store_true', help="Jangan hapus file memmap setelah selesai")
+    parser.add_argument('--workers', type=int, default=-1, help="Thread forest maksimum (dibatasi budget)")
+    args = parser.parse_args()
+
+    params = {}
+    if args.params and os.path.exists(args.params):
+        with open(args.params) as f:
+            params = json.load(f).get('best_params') or {}
+    elif args.params:
+        params = json.loads(args.params)
+
+    print("1. Streaming training...")
+    try:
+        result = stream_train(args.data, params, args.memory_budget_mb, args.test_size, args.work_dir,
+                              args.keep_work_dir, args.workers)
+    except MemoryError as e:
+        raise SystemExit(f"❌ {e}")
+
+    print("\n2. Evaluasi test set:")
+    for key, value in result['metrics'].items():
+        print(f"   {key}: {value:.4f}")
+    memory = result['memory']
+    print(f"\n3. Memori: peak {memory['peak_mb']:.0f} MB dari budget {memory['budget_mb']:.0f} MB "
+          f"(awal {memory['start_mb']:.0f} MB)")
+    for stage, peak in memory['stages_peak_mb'].items():
+        print(f"   {stage:<10} {peak:.0f} MB")
+
+    save_outputs(result['model'], result['metrics'], params, result['shape'], args.output_dir,
+                 description='Random Forest (streaming training, memmap)',
+                 extra={'training': {**result['forest_plan'], 'memory': memory}})
+    save_baseline(result['baseline'], os.path.join(args.output_dir, 'drift_baseline.json'))
+    print(f"\n✅ Model, info, dan baseline drift disimpan di {args.output_dir} ({result['elapsed']:.1f} detik)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Definisi 19 fitur dataset Telco dan generator data pelanggan sintetis.
+
+Kategori dan rentang numerik di sini adalah yang dipakai form input di
+app.py. Generator dipakai untuk benchmark dan pengujian offline, tanpa
+butuh dataset asli.
+"""
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = [
+    'gender', 'SeniorCitizen', 'Partner', 'Dependents', 'tenure', 'PhoneService',
+    'MultipleLines', 'InternetService', 'OnlineSecurity', 'OnlineBackup',
+    'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies',
+    'Contract', 'PaperlessBilling', 'PaymentMethod', 'MonthlyCharges', 'TotalCharges',
+]
+
+INTERNET_ADDONS = [
+    'OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 'TechSupport',
+    'StreamingTV', 'StreamingMovies',
+]
+
+CATEGORY_VALUES = {
+    'gender': ["Male", "Female"],
+    'Partner': ["Yes", "No"],
+    'Dependents': ["Yes", "No"],
+    'PhoneService': ["Yes", "No"],
+    'MultipleLines': ["No", "Yes", "No phone service"],
+    'InternetService': ["DSL", "Fiber optic", "No"],
+    **{col: ["No", "Yes", "No internet service"] for col in INTERNET_ADDONS},
+    'Contract': ["Month-to-month", "One year", "Two year"],
+    'PaperlessBilling': ["Yes", "No"],
+    'PaymentMethod': [
+        "Electronic check", "Mailed check", "Bank transfer (automatic)", "Credit card (automatic)"
+    ],
+}
+
+# (min, max) sesuai selectbox/slider di app.py
+NUMERIC_RANGES = {
+    'SeniorCitizen': (0, 1),
+    'tenure': (0, 72),
+    'MonthlyCharges': (18.0, 120.0),
+    'TotalCharges': (0.0, 9000.0),
+}
+
+
+def generate_customers(n_rows, seed=42, with_labels=False):
+    """
+    Buat DataFrame pelanggan sintetis dengan 19 kolom fitur.
+
+    Kombinasi kolom dibuat konsisten (tanpa PhoneService -> 'No phone service',
+    tanpa internet -> 'No internet service', TotalCharges ~ tenure x MonthlyCharges).
+    Dengan `with_labels=True` juga dikembalikan Series `Churn` (0/1) dari aturan
+    logistik sederhana, cukup untuk melatih model referensi offline.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in ['gender', 'Partner', 'Dependents', 'PaperlessBilling', 'PaymentMethod']:
+        data[col] = rng.choice(CATEGORY_VALUES[col], n_rows)
+    data['SeniorCitizen'] = rng.choice([0, 1], n_rows, p=[0.84, 0.16])
+
+    data['PhoneService'] = rng.choice(["Yes", "No"], n_rows, p=[0.9, 0.1])
+    data['MultipleLines'] = np.where(data['PhoneService'] == "No", "No phone service",
+                                     rng.choice(["No", "Yes"], n_rows))
+    data['InternetService'] = rng.choice(CATEGORY_VALUES['InternetService'], n_rows, p=[0.34, 0.44, 0.22])
+    for col in INTERNET_ADDONS:
+        data[col] = np.where(data['InternetService'] == "No", "No internet service",
+                             rng.choice(["No", "Yes"], n_rows))
+    data['Contract'] = rng.choice(CATEGORY_VALUES['Contract'], n_rows, p=[0.55, 0.21, 0.24])
+
+    low, high = NUMERIC_RANGES['tenure']
+    data['tenure'] = rng.integers(low, high + 1, n_rows)
+    low, high = NUMERIC_RANGES['MonthlyCharges']
+    data['MonthlyCharges'] = np.round(rng.uniform(low, high, n_rows), 2)
+    data['TotalCharges'] = np.round(
+        np.clip(data['tenure'] * data['MonthlyCharges'] * rng.normal(1.0, 0.05, n_rows),
+                *NUMERIC_RANGES['TotalCharges']), 2)
+
+    customers = pd.DataFrame(data)[FEATURE_COLUMNS]
+    if not with_labels:
+        return customers
+
+    logit = (-1.0
+             + 1.5 * (customers['Contract'] == "Month-to-month")
+             - 0.04 * customers['tenure']
+             + 0.8 * (customers['InternetService'] == "Fiber optic")
+             + 0.5 * (customers['PaymentMethod'] == "Electronic check")
+             + 0.3 * customers['SeniorCitizen'])
+    churn = (rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(int)
+    return customers, pd.Series(churn, name='Churn')
@@ -0,0 +1,99 @@
+"""
+Batch scoring: nilai integer kosong / non-numerik dikarantina per baris, bukan menggagalkan file;
+input tanpa baris data tetap menghasilkan CSV dengan header; laporan drift dari
+checkpoint tanpa baseline tetap mencakup seluruh input.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from batch_scoring import (PREDICTION_COLUMN, PROBABILITY_COLUMN, plan_csv_shards, read_shard, score_csv,  # noqa: E402
+                           score_frame, score_sharded)
+from drift_monitor import build_baseline, save_baseline  # noqa: E402
+from schema import ERROR_COLUMN, FeatureSchema  # noqa: E402
+from telco_features import generate_customers  # noqa: E402
+from train import build_pipeline, build_preprocessor, split_feature_types  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def model():
+    X, y = generate_customers(500, seed=0, with_labels=True)
+    pipeline = build_pipeline(build_preprocessor(*split_feature_types(X)), {'n_estimators': 10}, n_jobs=1)
+    return pipeline.fit(X, y)
+
+
+@pytest.fixture
+def customers_csv(tmp_path):
+    customers = generate_customers(6, seed=1).astype(object)
+    customers.insert(0, 'customerID', [f'C{i}' for i in range(len(customers))])
+    customers.loc[1, 'tenure'] = ''
+    customers.loc[2, 'SeniorCitizen'] = np.nan
+    customers.loc[3, 'tenure'] = 'abc'
+    path = tmp_path / 'customers.csv'
+    customers.to_csv(path, index=False)
+    return str(path)
+
+
+def test_score_csv_quarantines_bad_integer_fields(model, customers_csv, tmp_path):
+    output = tmp_path / 'scored.csv'
+    stats = score_csv(model, customers_csv, str(output))
+
+    scored = pd.read_csv(output, keep_default_na=False)
+    assert stats['rows'] == 6
+    assert stats['invalid_rows'] == 3
+    assert list(scored[ERROR_COLUMN]) == ['', 'tenure', 'SeniorCitizen', 'tenure', '', '']
+    assert (scored[PROBABILITY_COLUMN].iloc[[0, 4, 5]] != '').all()
+
+
+def test_read_shard_keeps_bad_integer_rows(model, customers_csv):
+    shards = plan_csv_shards(customers_csv, shard_bytes=1 << 20)
+    chunk = pd.concat([read_shard(customers_csv, shard) for shard in shards], ignore_index=True)
+    assert len(chunk) == 6
+    assert chunk['tenure'].isna().sum() == 2
+
+    scored = score_frame(model, chunk, schema=FeatureSchema.from_model(model))
+    assert scored[PROBABILITY_COLUMN].isna().sum() == 3
+
+
+def test_score_sharded_empty_input_writes_header(model, customers_csv, tmp_path):
+    model_path = tmp_path / 'model.pkl'
+    joblib.dump(model, model_path)
+    source = tmp_path / 'empty.csv'
+    with open(customers_csv) as f:
+        source.write_text(f.readline())
+
+    output = tmp_path / 'scored.csv'
+    stats = score_sharded(str(source), str(output), str(model_path), n_workers=1)
+
+    scored = pd.read_csv(output)
+    assert stats['rows'] == 0 and len(scored) == 0
+    assert list(scored.columns[-3:]) == [PROBABILITY_COLUMN, PREDICTION_COLUMN, ERROR_COLUMN]
+
+
+def test_drift_report_covers_shards_scored_without_baseline(model, tmp_path):
+    model_path = tmp_path / 'model.pkl'
+    joblib.dump(model, model_path)
+    baseline_path = tmp_path / 'baseline.json'
+    X = generate_customers(500, seed=0)
+    save_baseline(build_baseline(X, model.predict_proba(X)[:, 1]), str(baseline_path))
+    source = tmp_path / 'customers.csv'
+    generate_customers(3000, seed=2).to_csv(source, index=False)
+
+    # Run pertama tanpa baseline terhenti (part tersisa), dilanjutkan dengan baseline
+    resumed = str(tmp_path / 'resumed.csv')
+    score_sharded(str(source), resumed, str(model_path), n_workers=1, shard_mb=0.1, partitioned=True)
+    stats = score_sharded(str(source), resumed, str(model_path), n_workers=1, shard_mb=0.1,
+                          drift_baseline_path=str(baseline_path))
+    fresh = score_sharded(str(source), str(tmp_path / 'fresh.csv'), str(model_path), n_workers=1,
+                          shard_mb=0.1, drift_baseline_path=str(baseline_path))
+
+    assert stats['skipped'] == stats['shards'] > 1
+    assert stats['drift'] == fresh['drift']
+    assert stats['drift']['rows'] == 3000
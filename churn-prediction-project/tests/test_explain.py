@@ -0,0 +1,51 @@
+"""
+explain_file: kolom output sama di semua chunk, termasuk chunk tanpa baris valid;
+ForestExplainer juga untuk pipeline dengan one-hot sparse (`train.py --sparse-onehot`).
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from explain import CONTRIBUTION_PREFIX, ForestExplainer, explain_file  # noqa: E402
+from schema import ERROR_COLUMN  # noqa: E402
+from telco_features import generate_customers  # noqa: E402
+from train import build_pipeline, build_preprocessor, split_feature_types  # noqa: E402
+
+
+def test_explain_file_columns_fixed_when_first_chunk_invalid(tmp_path):
+    X, y = generate_customers(500, seed=0, with_labels=True)
+    model = build_pipeline(build_preprocessor(*split_feature_types(X)), {'n_estimators': 10}, n_jobs=1).fit(X, y)
+
+    customers = generate_customers(4, seed=1)
+    customers.insert(0, 'customerID', [f'C{i}' for i in range(len(customers))])
+    customers.loc[[0, 1], 'Contract'] = 'Unknown'  # chunk 0 seluruhnya tidak valid
+    source = tmp_path / 'customers.csv'
+    customers.to_csv(source, index=False)
+
+    output = tmp_path / 'reasons.csv'
+    explain_file(ForestExplainer(model), str(source), str(output), top_k=2, all_columns=True, chunksize=2)
+
+    result = pd.read_csv(output)
+    assert list(result.columns[:5]) == ['customerID', 'churn_probability', 'churn_prediction',
+                                        'reason_1', 'reason_2']
+    assert result.columns[-1] == ERROR_COLUMN
+    assert sum(col.startswith(CONTRIBUTION_PREFIX) for col in result.columns) == len(X.columns)
+    assert list(result[ERROR_COLUMN].fillna('')) == ['Contract', 'Contract', '', '']
+    assert result['reason_1'].iloc[:2].isna().all() and result['reason_1'].iloc[2:].notna().all()
+
+
+def test_explainer_sparse_onehot_pipeline():
+    X, y = generate_customers(500, seed=0, with_labels=True)
+    preprocessor = build_preprocessor(*split_feature_types(X), sparse=True)
+    model = build_pipeline(preprocessor, {'n_estimators': 10}, n_jobs=1).fit(X, y)
+
+    customers = generate_customers(20, seed=1)
+    explainer = ForestExplainer(model)
+    probabilities, contributions = explainer.explain(customers)
+    assert np.allclose(probabilities, model.predict_proba(customers)[:, 1])
+    assert np.allclose(explainer.bias + contributions.sum(axis=1), probabilities)
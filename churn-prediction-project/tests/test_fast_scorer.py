@@ -0,0 +1,29 @@
+"""
+CompiledPipeline: predict_proba identik bit-per-bit dengan pipeline sklearn,
+untuk one-hot dense maupun sparse (`train.py --sparse-onehot`).
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fast_scorer import CompiledPipeline  # noqa: E402
+from telco_features import generate_customers  # noqa: E402
+from train import build_pipeline, build_preprocessor, split_feature_types  # noqa: E402
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_compiled_predict_proba_identical(sparse):
+    X, y = generate_customers(500, seed=0, with_labels=True)
+    preprocessor = build_preprocessor(*split_feature_types(X), sparse=sparse)
+    model = build_pipeline(preprocessor, {'n_estimators': 20}, n_jobs=1).fit(X, y)
+
+    customers = generate_customers(200, seed=1)
+    customers.loc[:4, 'TotalCharges'] = np.nan  # lewat imputer
+    compiled = CompiledPipeline.from_pipeline(model)
+    assert np.array_equal(compiled.predict_proba(customers), model.predict_proba(customers))
+    assert np.array_equal(compiled.predict(customers), model.predict(customers))
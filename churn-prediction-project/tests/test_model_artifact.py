@@ -0,0 +1,45 @@
+"""
+Artifact model: round trip save -> load (mmap) memberi prediksi yang sama, dan
+file .npy yang diubah terdeteksi oleh verifikasi checksum.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from model_artifact import COMPILED_DIR, load_artifact, load_pipeline, save_artifact, verify_artifact  # noqa: E402
+from telco_features import generate_customers  # noqa: E402
+from train import build_pipeline, build_preprocessor, split_feature_types  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def model():
+    X, y = generate_customers(500, seed=0, with_labels=True)
+    return build_pipeline(build_preprocessor(*split_feature_types(X)), {'n_estimators': 10}, n_jobs=1).fit(X, y)
+
+
+def test_round_trip_mmap_predictions_equal(model, tmp_path):
+    save_artifact(model, str(tmp_path))
+    loaded = load_artifact(str(tmp_path), mmap_mode='r', verify=True)
+
+    assert isinstance(loaded.node_value, np.memmap)
+    customers = generate_customers(100, seed=1)
+    expected = model.predict_proba(customers)
+    assert np.array_equal(loaded.predict_proba(customers), expected)
+    assert np.array_equal(load_pipeline(str(tmp_path)).predict_proba(customers), expected)
+
+
+def test_tampered_array_fails_checksum(model, tmp_path):
+    save_artifact(model, str(tmp_path))
+    path = os.path.join(str(tmp_path), COMPILED_DIR, 'node_threshold.npy')
+    threshold = np.load(path)
+    threshold[0] += 1.0
+    np.save(path, threshold)
+
+    assert verify_artifact(str(tmp_path)) == [f'{COMPILED_DIR}/node_threshold.npy']
+    with pytest.raises(ValueError, match='Checksum'):
+        load_artifact(str(tmp_path), verify=True)
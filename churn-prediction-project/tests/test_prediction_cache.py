@@ -0,0 +1,33 @@
+"""
+PredictionCache: prediksi model lama yang selesai setelah hot swap tidak masuk cache.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from prediction_cache import PredictionCache, cached_churn_probabilities  # noqa: E402
+
+COLUMNS = ['tenure', 'Contract']
+ROW = {'tenure': 12, 'Contract': 'Month-to-month'}
+
+
+def test_result_from_swapped_out_model_is_not_cached():
+    cache = PredictionCache()
+    cache.bind_model('old')
+
+    def predict_while_swapping(model, X):
+        # Session lain melihat model baru selagi prediksi model lama berjalan
+        cache.bind_model('new')
+        return np.array([0.9])
+
+    proba = cached_churn_probabilities(cache, 'old-model', ROW, COLUMNS, predict_while_swapping, 'old')
+    assert proba[0] == 0.9  # request lama tetap dijawab model lamanya
+    assert len(cache) == 0
+
+    proba = cached_churn_probabilities(cache, 'new-model', ROW, COLUMNS, lambda m, X: np.array([0.2]), 'new')
+    assert len(cache) == 1
+    assert cached_churn_probabilities(cache, 'new-model', ROW, COLUMNS, None, 'new')[0] == 0.2
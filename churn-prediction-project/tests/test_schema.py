@@ -0,0 +1,27 @@
+"""
+FeatureSchema: hanya nilai yang mustahil yang dikarantina, bukan nilai di luar batas slider app.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from schema import FeatureSchema  # noqa: E402
+from telco_features import generate_customers  # noqa: E402
+from train import build_pipeline, build_preprocessor, split_feature_types  # noqa: E402
+
+
+def test_only_impossible_numeric_values_are_invalid():
+    X, y = generate_customers(200, seed=0, with_labels=True)
+    model = build_pipeline(build_preprocessor(*split_feature_types(X)), {'n_estimators': 5}, n_jobs=1).fit(X, y)
+
+    customers = generate_customers(6, seed=1).astype(object)
+    customers.loc[0, 'tenure'] = 120           # > 72 bulan: valid
+    customers.loc[1, 'TotalCharges'] = 15000.0  # > batas slider: valid
+    customers.loc[2, 'tenure'] = -1
+    customers.loc[3, 'MonthlyCharges'] = 'inf'
+    customers.loc[4, 'SeniorCitizen'] = 2
+
+    reasons = FeatureSchema.from_model(model).validate(customers).reasons()
+    assert list(reasons) == ['', '', 'tenure', 'MonthlyCharges', 'SeniorCitizen', '']
@@ -0,0 +1,119 @@
+"""
+HTTP service (/predict) lewat Starlette TestClient, model kecil dari data sintetis:
+micro-batching, fallback per request, dan status 400/422.
+
+    python -m pytest tests
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pytest
+from starlette.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from service import create_app  # noqa: E402
+from telco_features import generate_customers  # noqa: E402
+from train import build_pipeline, build_preprocessor, split_feature_types  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def model():
+    X, y = generate_customers(500, seed=0, with_labels=True)
+    return build_pipeline(build_preprocessor(*split_feature_types(X)), {'n_estimators': 10}, n_jobs=1).fit(X, y)
+
+
+@pytest.fixture(scope='module')
+def model_path(model, tmp_path_factory):
+    path = tmp_path_factory.mktemp('model') / 'model.pkl'
+    joblib.dump(model, path)
+    return str(path)
+
+
+def records(n, seed=1):
+    customers = generate_customers(n, seed=seed)
+    return [{col: (value.item() if hasattr(value, 'item') else value) for col, value in row.items()}
+            for row in customers.to_dict('records')]
+
+
+class BrokenDrift:
+    def update(self, X, probabilities):
+        raise RuntimeError("drift rusak")
+
+
+def test_drift_failure_does_not_fail_prediction(model_path):
+    with TestClient(create_app(model_path, cache_size=0)) as client:
+        client.app.state.drift = BrokenDrift()
+        response = client.post('/predict', json=records(2))
+    assert response.status_code == 200
+    assert len(response.json()['predictions']) == 2
+
+
+def count_batches(client):
+    """
+    Bungkus MicroBatcher._predict, return list ukuran batch yang dikirim ke model
+    """
+    batcher = client.app.state.batcher
+    sizes, predict = [], batcher._predict
+
+    def counting_predict(records):
+        sizes.append(len(records))
+        return predict(records)
+
+    batcher._predict = counting_predict
+    return sizes
+
+
+def post_concurrently(client, bodies, **kwargs):
+    with ThreadPoolExecutor(len(bodies)) as pool:
+        return list(pool.map(lambda body: client.post('/predict', json=body, **kwargs), bodies))
+
+
+def test_concurrent_requests_share_one_batch(model, model_path):
+    bodies = [records(1, seed=i) for i in range(3)]
+    with TestClient(create_app(model_path, max_wait_ms=500, cache_size=0)) as client:
+        sizes = count_batches(client)
+        responses = post_concurrently(client, bodies)
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert sizes == [3]
+    for seed, response in enumerate(responses):
+        expected = model.predict_proba(generate_customers(1, seed=seed))[:, 1]
+        assert np.allclose([p['churn_probability'] for p in response.json()['predictions']], expected)
+
+
+def test_failing_request_does_not_fail_its_batch(model_path):
+    bad = records(1, seed=5)
+    bad[0]['MonthlyCharges'] = 'abc'  # lolos cek kolom, gagal di predict_proba
+    with TestClient(create_app(model_path, max_wait_ms=500, cache_size=0)) as client:
+        sizes = count_batches(client)
+        good_response, bad_response = post_concurrently(client, [records(2), bad])
+
+    assert good_response.status_code == 200
+    assert len(good_response.json()['predictions']) == 2
+    assert bad_response.status_code == 422
+    assert sizes[0] == 3 and sorted(sizes[1:]) == [1, 2]  # batch gabungan, lalu per request
+
+
+@pytest.mark.parametrize('query, body', [
+    ({'threshold': '1.5'}, None),
+    ({'threshold': 'abc'}, None),
+    ({}, {'records': 'bukan list'}),
+])
+def test_bad_request_rejected_before_scoring(model_path, query, body):
+    with TestClient(create_app(model_path, cache_size=0)) as client:
+        sizes = count_batches(client)
+        response = client.post('/predict', params=query, json=body if body is not None else records(1))
+    assert response.status_code == 400
+    assert sizes == []
+
+
+def test_missing_column_is_422(model_path):
+    record = records(1)[0]
+    del record['Contract']
+    with TestClient(create_app(model_path, cache_size=0)) as client:
+        response = client.post('/predict', json=[record])
+    assert response.status_code == 422
+    assert 'Contract' in response.json()['error']
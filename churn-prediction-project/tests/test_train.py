@@ -0,0 +1,40 @@
+"""
+successive_halving_search: jumlah kandidat yang bertahan per rung dan best_params
+deterministik (tidak bergantung jumlah worker).
+
+    python -m pytest tests
+"""
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from telco_features import generate_customers  # noqa: E402
+from train import successive_halving_search  # noqa: E402
+
+PARAM_GRID = {
+    'n_estimators': [5, 10, 20],
+    'max_depth': [3, 6, None],
+    'min_samples_leaf': [1, 5],
+}
+
+
+def test_successive_halving_survivors_and_best_params():
+    X, y = generate_customers(300, seed=0, with_labels=True)
+    search = successive_halving_search(X, y, PARAM_GRID, cv=3, factor=2, n_workers=1, verbose=False)
+
+    # 6 kandidat -> ceil(6/2)=3 -> ceil(3/2)=2
+    assert Counter(r['n_estimators'] for r in search['results']) == {5: 6, 10: 3, 20: 2}
+    assert all(r['fit_time'] > 0 for r in search['results'])
+
+    best = max(search['results'], key=lambda r: r['mean_f1'])
+    assert search['best_params'] == {name: best[name] for name in PARAM_GRID}
+    assert search['best_score'] == best['mean_f1']
+    # Kandidat di rung berikutnya adalah yang terbaik di rung sebelumnya
+    rung_1 = sorted((r for r in search['results'] if r['n_estimators'] == 5), key=lambda r: -r['mean_f1'])
+    promoted = [(r['max_depth'], r['min_samples_leaf']) for r in search['results'] if r['n_estimators'] == 10]
+    assert sorted(promoted, key=str) == sorted(((r['max_depth'], r['min_samples_leaf']) for r in rung_1[:3]), key=str)
+
+    again = successive_halving_search(X, y, PARAM_GRID, cv=3, factor=2, n_workers=2, verbose=False)
+    assert again['best_params'] == search['best_params']
+    assert [r['mean_f1'] for r in again['results']] == [r['mean_f1'] for r in search['results']]
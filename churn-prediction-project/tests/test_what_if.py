@@ -0,0 +1,38 @@
+"""
+What-if: baris base di grid diskor persis seperti pelanggan aslinya, dan
+TotalCharges turunan terhitung sebagai perubahan.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from telco_features import generate_customers  # noqa: E402
+from train import build_pipeline, build_preprocessor, split_feature_types  # noqa: E402
+from what_if import PROBABILITY_COLUMN, changes_of, run_sweep  # noqa: E402
+
+
+def test_base_row_scored_with_real_total_charges():
+    X, y = generate_customers(500, seed=0, with_labels=True)
+    model = build_pipeline(build_preprocessor(*split_feature_types(X)), {'n_estimators': 20}, n_jobs=1).fit(X, y)
+
+    base = {col: (value.item() if hasattr(value, 'item') else value)
+            for col, value in generate_customers(1, seed=3).iloc[0].items()}
+    base['TotalCharges'] = round(base['TotalCharges'] * 0.3, 2)  # bukan tenure x MonthlyCharges
+    result = run_sweep(model, base, {'Contract': ['Month-to-month', 'One year', 'Two year'],
+                                     'MonthlyCharges': [base['MonthlyCharges'], base['MonthlyCharges'] + 10]})
+
+    unchanged = [not changes_of(row, base) for _, row in result.iterrows()]
+    assert sum(unchanged) == 1
+    base_row = result[unchanged]
+    assert base_row['TotalCharges'].iloc[0] == base['TotalCharges']
+    expected = model.predict_proba(pd.DataFrame([base]))[:, 1]
+    assert np.array_equal(base_row[PROBABILITY_COLUMN].to_numpy(), expected)
+
+    raised = result[(result['Contract'] == base['Contract'])
+                    & (result['MonthlyCharges'] > base['MonthlyCharges'])].iloc[0]
+    assert set(changes_of(raised, base)) == {'MonthlyCharges', 'TotalCharges'}
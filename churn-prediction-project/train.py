@@ -0,0 +1,325 @@
+"""
+Training & hyperparameter tuning Random Forest (pengganti GridSearchCV di notebook 04).
+
+Dibanding GridSearchCV dengan Pipeline penuh:
+
+1. Preprocessor (ColumnTransformer) di-fit SEKALI per fold, hasil transformasinya
+   dipakai ulang oleh semua kandidat (opsional di-cache ke disk dengan --cache-dir).
+2. Successive halving: semua kombinasi dievaluasi dulu dengan n_estimators terkecil,
+   hanya 1/factor kandidat terbaik yang lanjut ke n_estimators berikutnya.
+3. Warm start: kandidat 200 pohon melanjutkan forest 100 pohon miliknya
+   (random_state sama -> hasilnya identik dengan fit 200 pohon dari awal).
+4. Setiap (kandidat, fold) dijalankan paralel di process pool.
+
+Contoh:
+    python train.py --data ../data/telco_customer_churn.csv --output-dir notebooks
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from data_loader import LABEL_COLUMN, load_dataset
+from drift_monitor import build_baseline, save_baseline
+from scoring import predict_churn
+from telco_features import FEATURE_COLUMNS
+
+DEFAULT_DATA_PATH = '../data/telco_customer_churn.csv'
+RANDOM_STATE = 42
+
+# Grid yang sama dengan notebook 04 (tanpa prefix classifier__)
+PARAM_GRID = {
+    'n_estimators': [100, 200],
+    'max_depth': [10, 20, None],
+    'min_samples_split': [2, 5],
+    'min_samples_leaf': [1, 2],
+}
+
+
+# ==================== DATA & PREPROCESSING ====================
+def load_training_data(path=DEFAULT_DATA_PATH):
+    """
+    Load dataset Telco (CSV atau Parquet dari data_loader.py), pisahkan X dan y.
+    Hanya 19 kolom fitur + label yang dibaca.
+    """
+    df = load_dataset(path, columns=FEATURE_COLUMNS + [LABEL_COLUMN])
+    X = df[FEATURE_COLUMNS]
+    y = df[LABEL_COLUMN].astype('int64')
+    return X, y
+
+
+def split_feature_types(X):
+    # 'number' juga mencakup int8/int16 dari Parquet, bukan hanya int64/float64
+    numeric_features = X.select_dtypes(include='number').columns.tolist()
+    categorical_features = [col for col in X.columns if col not in numeric_features]
+    return numeric_features, categorical_features
+
+
+def build_preprocessor(numeric_features, categorical_features, sparse=False):
+    """
+    ColumnTransformer notebook 03/04. `sparse=True`: hasil one-hot tetap sparse (CSR)
+    sampai ke classifier; pohon yang terbentuk identik dengan versi dense.
+    """
+    numeric_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='median')),
+        ('scaler', StandardScaler())
+    ])
+    categorical_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='constant', fill_value='missing')),
+        ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=sparse))
+    ])
+    # Densitas hasil Telco ~0.4 (> default 0.3), tanpa sparse_threshold=1.0
+    # ColumnTransformer akan mengubahnya kembali ke dense
+    return ColumnTransformer(
+        transformers=[
+            ('num', numeric_transformer, numeric_features),
+            ('cat', categorical_transformer, categorical_features)
+        ],
+        sparse_threshold=1.0 if sparse else 0.3)
+
+
+def build_pipeline(preprocessor, params=None, n_jobs=-1):
+    classifier = RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=n_jobs, **(params or {}))
+    return Pipeline([
+        ('preprocessor', preprocessor),
+        ('classifier', classifier)
+    ])
+
+
+def fit_fold(preprocessor, X, y, train_idx, val_idx):
+    """
+    Fit preprocessor pada bagian train fold, return data fold yang sudah ditransformasi
+    """
+    fold_preprocessor = clone(preprocessor)
+    X_train = fold_preprocessor.fit_transform(X.iloc[train_idx])
+    X_val = fold_preprocessor.transform(X.iloc[val_idx])
+    # Forest selalu bekerja dengan float32, jadi simpan langsung sebagai float32
+    if sp.issparse(X_train):
+        # Format yang dipakai forest: CSC untuk fit, CSR untuk predict
+        return (X_train.astype(np.float32).tocsc(), y.iloc[train_idx].to_numpy(),
+                X_val.astype(np.float32).tocsr(), y.iloc[val_idx].to_numpy())
+    return (np.asarray(X_train, dtype=np.float32), y.iloc[train_idx].to_numpy(),
+            np.asarray(X_val, dtype=np.float32), y.iloc[val_idx].to_numpy())
+
+
+# ==================== WORKER PROCESS ====================
+_FOLDS = None
+
+
+def _init_worker(folds):
+    global _FOLDS
+    _FOLDS = folds
+
+
+def _evaluate_candidate(params, n_estimators, fold_id, forest_path):
+    """
+    Grow forest kandidat sampai n_estimators (warm start dari file jika ada),
+    return (F1 fold, detik fit pohon tambahan di rung ini)
+    """
+    X_train, y_train, X_val, y_val = _FOLDS[fold_id]
+    if os.path.exists(forest_path):
+        forest = joblib.load(forest_path)
+    else:
+        forest = RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=1, warm_start=True, **params)
+
+    forest.set_params(n_estimators=n_estimators)
+    start = time.perf_counter()
+    forest.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    score = f1_score(y_val, forest.predict(X_val))
+    joblib.dump(forest, forest_path, compress=0)
+    return score, fit_time
+
+
+# ==================== SEARCH ====================
+def successive_halving_search(X, y, param_grid=PARAM_GRID, cv=3, factor=2, n_workers=None,
+                              cache_dir=None, sparse_onehot=False, verbose=True):
+    """
+    Successive halving dengan n_estimators sebagai resource.
+
+    Return dict: best_params, best_score, results (list semua evaluasi), elapsed.
+    """
+    start = time.perf_counter()
+    numeric_features, categorical_features = split_feature_types(X)
+    preprocessor = build_preprocessor(numeric_features, categorical_features, sparse=sparse_onehot)
+    folds_idx = list(StratifiedKFold(n_splits=cv).split(X, y))
+
+    fit_fold_cached = fit_fold
+    if cache_dir:
+        fit_fold_cached = joblib.Memory(cache_dir, verbose=0).cache(fit_fold)
+    folds = [fit_fold_cached(preprocessor, X, y, train_idx, val_idx) for train_idx, val_idx in folds_idx]
+
+    resource_ladder = sorted(param_grid['n_estimators'])
+    other_names = [name for name in param_grid if name != 'n_estimators']
+    candidates = [dict(zip(other_names, values))
+                  for values in itertools.product(*(param_grid[name] for name in other_names))]
+    survivors = list(range(len(candidates)))
+    results = []
+    forest_dir = tempfile.mkdtemp(prefix='churn_tuning_')
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(folds,)) as pool:
+            for rung, n_estimators in enumerate(resource_ladder):
+                futures = {
+                    (cid, fold_id): pool.submit(
+                        _evaluate_candidate, candidates[cid], n_estimators, fold_id,
+                        os.path.join(forest_dir, f'c{cid}_f{fold_id}.joblib'))
+                    for cid in survivors for fold_id in range(cv)
+                }
+                rung_scores = {}
+                for cid in survivors:
+                    scores, fit_times = zip(*(futures[(cid, fold_id)].result() for fold_id in range(cv)))
+                    rung_scores[cid] = float(np.mean(scores))
+                    results.append({**candidates[cid], 'n_estimators': n_estimators,
+                                    'mean_f1': rung_scores[cid], 'fold_f1': list(scores),
+                                    'fit_time': float(sum(fit_times))})
+
+                if verbose:
+                    rung_fit_time = sum(r['fit_time'] for r in results[-len(survivors):])
+                    print(f"   Rung {rung + 1}: {len(survivors)} kandidat x {cv} fold "
+                          f"@ {n_estimators} pohon -> best F1 {max(rung_scores.values()):.4f} "
+                          f"(fit {rung_fit_time:.1f}s)")
+
+                # Kandidat yang gugur: hapus forest-nya, sisanya lanjut ke rung berikutnya
+                n_keep = max(1, math.ceil(len(survivors) / factor))
+                ranked = sorted(survivors, key=lambda cid: rung_scores[cid], reverse=True)
+                for cid in ranked[n_keep:]:
+                    for fold_id in range(cv):
+                        os.remove(os.path.join(forest_dir, f'c{cid}_f{fold_id}.joblib'))
+                survivors = ranked[:n_keep]
+    finally:
+        shutil.rmtree(forest_dir, ignore_errors=True)
+
+    best = max(results, key=lambda r: r['mean_f1'])
+    best_params = {name: best[name] for name in list(param_grid)}
+    return {
+        'best_params': best_params,
+        'best_score': best['mean_f1'],
+        'results': results,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def grid_search_baseline(X, y, param_grid=PARAM_GRID, cv=3):
+    """
+    GridSearchCV lama dari notebook 04, untuk perbandingan waktu dan skor
+    """
+    from sklearn.model_selection import GridSearchCV
+
+    start = time.perf_counter()
+    numeric_features, categorical_features = split_feature_types(X)
+    pipeline = build_pipeline(build_preprocessor(numeric_features, categorical_features))
+    grid = {f'classifier__{name}': values for name, values in param_grid.items()}
+    search = GridSearchCV(pipeline, grid, cv=cv, scoring='f1', n_jobs=-1)
+    search.fit(X, y)
+    best_params = {name.replace('classifier__', ''): value for name, value in search.best_params_.items()}
+    return {'best_params': best_params, 'best_score': float(search.best_score_),
+            'elapsed': time.perf_counter() - start}
+
+
+# ==================== EVALUASI & SIMPAN ====================
+def evaluate(model, X_test, y_test):
+    _, y_pred = predict_churn(model, X_test)
+    return classification_metrics(y_test, y_pred)
+
+
+def classification_metrics(y_test, y_pred):
+    return {
+        'accuracy': round(float(accuracy_score(y_test, y_pred)), 4),
+        'precision': round(float(precision_score(y_test, y_pred)), 4),
+        'recall': round(float(recall_score(y_test, y_pred)), 4),
+        'f1_score': round(float(f1_score(y_test, y_pred)), 4),
+    }
+
+
+def save_outputs(model, metrics, best_params, shape, output_dir,
+                 description='Random Forest with Hyperparameter Tuning (FULL PIPELINE)', extra=None):
+    """
+    Simpan best_churn_model.pkl dan best_model_info.json (format sama dengan notebook 04).
+    `shape` = (jumlah baris, jumlah fitur) data training.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    joblib.dump(model, os.path.join(output_dir, 'best_churn_model.pkl'))
+    info = {
+        'best_model': 'Random Forest (Tuned)',
+        'metrics': metrics,
+        'description': description,
+        'features_used': shape[1],
+        'dataset_size': f"{shape[0]} samples",
+        'best_params': best_params,
+        **(extra or {}),
+    }
+    with open(os.path.join(output_dir, 'best_model_info.json'), 'w') as f:
+        json.dump(info, f, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tuning & training model churn (Random Forest)")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help="CSV atau Parquet (lihat data_loader.py)")
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--cv', type=int, default=3)
+    parser.add_argument('--factor', type=int, default=2, help="Successive halving: simpan 1/factor kandidat per rung")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: semua core)")
+    parser.add_argument('--cache-dir', default=None, help="Cache preprocessor per fold di disk")
+    parser.add_argument('--sparse-onehot', action='store_true',
+                        help="One-hot sparse sampai ke classifier (prediksi sama, lihat benchmarks/bench_encoding.py)")
+    parser.add_argument('--compare-grid', action='store_true', help="Jalankan juga GridSearchCV lama untuk perbandingan")
+    args = parser.parse_args()
+
+    print("1. Loading dataset...")
+    X, y = load_training_data(args.data)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=RANDOM_STATE, stratify=y
+    )
+    print(f"   Train set: {X_train.shape} | Test set: {X_test.shape}")
+
+    print("\n2. Successive halving search...")
+    search = successive_halving_search(X_train, y_train, cv=args.cv, factor=args.factor,
+                                       n_workers=args.workers, cache_dir=args.cache_dir,
+                                       sparse_onehot=args.sparse_onehot)
+    print(f"   Best parameters: {search['best_params']}")
+    print(f"   Best CV F1: {search['best_score']:.4f} ({search['elapsed']:.1f} detik)")
+
+    if args.compare_grid:
+        print("\n   GridSearchCV (notebook 04) untuk perbandingan...")
+        baseline = grid_search_baseline(X_train, y_train, cv=args.cv)
+        print(f"   Best parameters: {baseline['best_params']}")
+        print(f"   Best CV F1: {baseline['best_score']:.4f} ({baseline['elapsed']:.1f} detik)")
+        print(f"   Speedup: {baseline['elapsed'] / search['elapsed']:.1f}x")
+
+    print("\n3. Training model final & evaluasi...")
+    numeric_features, categorical_features = split_feature_types(X)
+    preprocessor = build_preprocessor(numeric_features, categorical_features, sparse=args.sparse_onehot)
+    model = build_pipeline(preprocessor, search['best_params'])
+    model.fit(X_train, y_train)
+    metrics = evaluate(model, X_test, y_test)
+    for key, value in metrics.items():
+        print(f"   {key}: {value:.4f}")
+
+    save_outputs(model, metrics, search['best_params'], X.shape, args.output_dir)
+    # Baseline drift: distribusi fitur training + distribusi skor di test set (lihat drift_monitor.py)
+    save_baseline(build_baseline(X_train, predict_churn(model, X_test)[0]),
+                  os.path.join(args.output_dir, 'drift_baseline.json'))
+    print(f"\n✓ Model, info, dan baseline drift disimpan di {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()